@@ -1,13 +1,17 @@
 import json
-from web3 import Web3
+import os
+import sys
 
-RPC_URL = "https://sepolia.base.org"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from rpc_router import endpoints_from_env, routed_web3
+
+RPC_ENDPOINTS = endpoints_from_env()  # USDC_RPC_BASE, comma-separated
 USDC_ADDRESS = "0x036CbD53842c5426634e7929541eC2318f3dCF7e" # Real Base Sepolia USDC
 MY_ADDRESS = "0x4a6a4Db15Ce7C892f62c750fDcC0D34d11572a99"
 
 ABI = [{"inputs":[{"internalType":"address","name":"account","type":"address"}],"name":"balanceOf","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"}]
 
-w3 = Web3(Web3.HTTPProvider(RPC_URL))
+w3 = routed_web3(RPC_ENDPOINTS)
 contract = w3.eth.contract(address=USDC_ADDRESS, abi=ABI)
 balance = contract.functions.balanceOf(MY_ADDRESS).call()
 
@@ -1,9 +1,14 @@
 import json
 from web3 import Web3
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from abi_registry import load_abi
+from rpc_router import endpoints_from_env, routed_web3
 
 # Configuration
-RPC_URL = "https://sepolia.base.org"
+RPC_ENDPOINTS = endpoints_from_env()  # USDC_RPC_BASE, comma-separated
 JUDGEPAY_ADDRESS = Web3.to_checksum_address("0x941bb35BFf8314A20c739EC129d6F38ba73BD4E5")
 PRIVATE_KEY = os.environ.get("PRIVATE_KEY")
 MY_ADDRESS = Web3.to_checksum_address("0x4a6a4Db15Ce7C892f62c750fDcC0D34d11572a99")
@@ -11,20 +16,14 @@ MY_ADDRESS = Web3.to_checksum_address("0x4a6a4Db15Ce7C892f62c750fDcC0D34d11572a9
 # Note: For demo, we need a DIFFERENT address to submit work (worker != requester)
 # We'll use a secondary wallet. For now, let's create one on the fly for demo purposes.
 
-JUDGEPAY_ABI = [
-    {"inputs":[{"internalType":"uint256","name":"_id","type":"uint256"}],"name":"submitWork","outputs":[],"stateMutability":"nonpayable","type":"function"},
-    {"inputs":[{"internalType":"uint256","name":"_id","type":"uint256"}],"name":"approve","outputs":[],"stateMutability":"nonpayable","type":"function"},
-    {"anonymous":False,"inputs":[{"indexed":True,"internalType":"uint256","name":"id","type":"uint256"},{"indexed":True,"internalType":"address","name":"worker","type":"address"}],"name":"WorkSubmitted","type":"event"},
-    {"anonymous":False,"inputs":[{"indexed":True,"internalType":"uint256","name":"id","type":"uint256"},{"indexed":False,"internalType":"uint96","name":"amount","type":"uint96"}],"name":"TaskCompleted","type":"event"},
-    {"inputs":[{"internalType":"uint256","name":"","type":"uint256"}],"name":"tasks","outputs":[{"internalType":"address","name":"requester","type":"address"},{"internalType":"address","name":"worker","type":"address"},{"internalType":"uint96","name":"amount","type":"uint96"},{"internalType":"uint40","name":"deadline","type":"uint40"},{"internalType":"uint8","name":"status","type":"uint8"}],"stateMutability":"view","type":"function"}
-]
+JUDGEPAY_ABI = load_abi("JudgePayLite")
 
 def main():
     if not PRIVATE_KEY:
         print("❌ Error: PRIVATE_KEY env var missing")
         return
 
-    w3 = Web3(Web3.HTTPProvider(RPC_URL))
+    w3 = routed_web3(RPC_ENDPOINTS)
     if not w3.is_connected():
         print("❌ Error: Cannot connect to RPC")
         return
@@ -40,7 +39,7 @@ def main():
     print(f"    Requester: {task[0]}")
     print(f"    Worker: {task[1]}")
     print(f"    Amount: {task[2] / 10**6} USDC")
-    print(f"    Status: {status_map.get(task[4], 'Unknown')}")
+    print(f"    Status: {status_map.get(task[5], 'Unknown')}")
     
     # For demo: We need a worker address (different from requester)
     # Let's generate a random one just for the demo
@@ -103,7 +102,7 @@ def main():
     # Final Status
     task = judgepay.functions.tasks(0).call()
     print(f"\n📋 Task #0 Final Status:")
-    print(f"    Status: {status_map.get(task[4], 'Unknown')}")
+    print(f"    Status: {status_map.get(task[5], 'Unknown')}")
     print(f"    Worker received: 10 USDC 🎉")
 
 if __name__ == "__main__":
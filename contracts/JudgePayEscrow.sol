@@ -79,6 +79,8 @@ contract JudgePayEscrow is ReentrancyGuard, Pausable, AccessControl {
     mapping(uint256 => mapping(address => bool)) public hasOracleVoted;
     
     mapping(uint256 => address[]) public taskJurors;
+    mapping(uint256 => mapping(address => bool)) public isSelectedJuror; // O(1) membership for castVote
+    mapping(uint256 => uint256) public votesCast; // Running count, compared against taskJurors length
     mapping(uint256 => mapping(address => bool)) public hasVoted;
     mapping(uint256 => mapping(address => bool)) public voteChoice; 
     
@@ -95,14 +97,41 @@ contract JudgePayEscrow is ReentrancyGuard, Pausable, AccessControl {
     }
     
     mapping(address => JurorStats) public jurors;
-    address[] public activeJurorPool;
     mapping(address => bool) public isJurorInPool;
 
+    // Jurors past JUROR_MATURITY, the only ones VRF selection draws from.
+    // poolIndex is 1-based so 0 means "not in the active pool"; removal is swap-and-pop.
+    address[] public activeJurorPool;
+    mapping(address => uint256) public poolIndex;
+
+    // Registrations waiting to mature, in registration (and so maturity) order
+    struct PendingJuror {
+        address juror;
+        uint64 maturesAt;
+    }
+    PendingJuror[] public pendingJurors;
+    uint256 public pendingHead;
+
+    uint256 public constant JUROR_MATURITY = 7 days;
+    uint256 public constant PROMOTIONS_PER_REGISTRATION = 2; // Keeps the queue moving faster than it fills
+    uint256 public constant PROMOTIONS_PER_DRAW = 32;
+
     // --- ANTI-COLLUSION MODULE (Cluster Detection) ---
     // Tracks how many times Juror A and Juror B voted on the SAME side in the SAME task
     // mapping(JurorA => mapping(JurorB => correlationCount))
     mapping(address => mapping(address => uint256)) public votingCorrelation;
     uint256 public constant COLLUSION_THRESHOLD = 5; // If they vote identically 5 times, trigger penalty
+
+    // Juror bookkeeping runs after payout, a bounded number of steps at a time.
+    // One step is one juror pair's correlation update or one juror's score update.
+    struct JuryResolution {
+        uint64 row;       // Index of the juror whose pairs are being processed
+        uint64 col;       // Next partner of `row`
+        bool workerWins;
+        bool pending;
+    }
+    mapping(uint256 => JuryResolution) public juryResolutions;
+    uint256 public constant INLINE_RESOLUTION_STEPS = 16; // Done by the final vote itself; covers juries up to 5
     
     uint256 public taskCount;
 
@@ -115,6 +144,9 @@ contract JudgePayEscrow is ReentrancyGuard, Pausable, AccessControl {
     event L3_Voted(uint256 indexed taskId, address indexed juror, bool approve, uint256 votingPower);
     event DisputeResolved(uint256 indexed taskId, bool workerWins);
     event CollusionDetected(address indexed jurorA, address indexed jurorB, uint256 timesCorrelated);
+    event L3_ReputationUpdated(uint256 indexed taskId);
+    event JurorActivated(address indexed juror);
+    event JurorUnregistered(address indexed juror);
 
     modifier checkInvariant() {
         _;
@@ -147,7 +179,6 @@ contract JudgePayEscrow is ReentrancyGuard, Pausable, AccessControl {
 
     function registerAsJuror() external whenNotPaused {
         require(!isJurorInPool[msg.sender], "Already registered");
-        activeJurorPool.push(msg.sender);
         isJurorInPool[msg.sender] = true;
         
         if (jurors[msg.sender].totalVotes == 0) {
@@ -156,6 +187,65 @@ contract JudgePayEscrow is ReentrancyGuard, Pausable, AccessControl {
             jurors[msg.sender].maxTaskValueResolved = 0;
             jurors[msg.sender].registrationTime = block.timestamp;
         }
+
+        uint256 maturesAt = jurors[msg.sender].registrationTime + JUROR_MATURITY;
+        if (block.timestamp >= maturesAt) {
+            _activateJuror(msg.sender); // Returning juror who already served their waiting period
+        } else {
+            pendingJurors.push(PendingJuror({juror: msg.sender, maturesAt: uint64(maturesAt)}));
+        }
+        _promoteMatureJurors(PROMOTIONS_PER_REGISTRATION);
+    }
+
+    function unregisterAsJuror() external whenNotPaused {
+        require(isJurorInPool[msg.sender], "Not registered");
+        isJurorInPool[msg.sender] = false;
+
+        uint256 index = poolIndex[msg.sender];
+        if (index != 0) {
+            address last = activeJurorPool[activeJurorPool.length - 1];
+            activeJurorPool[index - 1] = last;
+            poolIndex[last] = index;
+            activeJurorPool.pop();
+            delete poolIndex[msg.sender];
+        }
+        // A still-pending entry is dropped when it reaches the head of the queue
+        emit JurorUnregistered(msg.sender);
+    }
+
+    /// @notice Move up to `_max` matured registrations into the active pool. Callable by anyone.
+    function promoteMatureJurors(uint256 _max) external returns (uint256) {
+        return _promoteMatureJurors(_max);
+    }
+
+    function _promoteMatureJurors(uint256 _max) internal returns (uint256 promoted) {
+        uint256 head = pendingHead;
+        uint256 end = pendingJurors.length;
+        uint256 scanned = 0;
+
+        while (head < end && scanned < _max) {
+            PendingJuror memory entry = pendingJurors[head];
+            if (block.timestamp < entry.maturesAt) break;
+
+            // Skip entries left behind by unregistering, or by re-registering with a fresh waiting period
+            if (
+                isJurorInPool[entry.juror] && poolIndex[entry.juror] == 0
+                    && block.timestamp >= jurors[entry.juror].registrationTime + JUROR_MATURITY
+            ) {
+                _activateJuror(entry.juror);
+                promoted++;
+            }
+            delete pendingJurors[head];
+            head++;
+            scanned++;
+        }
+        pendingHead = head;
+    }
+
+    function _activateJuror(address _juror) internal {
+        activeJurorPool.push(_juror);
+        poolIndex[_juror] = activeJurorPool.length;
+        emit JurorActivated(_juror);
     }
 
     function createTask(
@@ -321,41 +411,70 @@ contract JudgePayEscrow is ReentrancyGuard, Pausable, AccessControl {
         require(task.status == TaskStatus.L3_VRFPending, "Not pending VRF");
         
         uint256 seed = randomWords[0];
+        _promoteMatureJurors(PROMOTIONS_PER_DRAW);
         uint256 poolSize = activeJurorPool.length;
+        uint256 jurySize = task.jurySize;
         uint256 selectedCount = 0;
-        uint256 attempts = 0;
         
         task.status = TaskStatus.L3_HumanJury;
-        
-        while (selectedCount < task.jurySize && attempts < poolSize * 3) {
-            uint256 index = uint256(keccak256(abi.encodePacked(seed, attempts))) % poolSize;
-            address candidate = activeJurorPool[index];
-            JurorStats storage stats = jurors[candidate];
-            
-            bool isMature = block.timestamp >= stats.registrationTime + 7 days;
-            
-            if (candidate != task.requester && candidate != task.worker && !hasVoted[_taskId][candidate] && isMature) {
+
+        // Partial Fisher-Yates over the active pool: draw t takes a uniform pick from
+        // positions [t, poolSize), so every draw is a distinct juror and there are no
+        // retries. Swaps live in a small in-memory table instead of storage. At most two
+        // draws are wasted, on the requester and the worker.
+        SwapTable memory swaps = _newSwapTable(_min(jurySize, poolSize) + 2);
+        for (uint256 t = 0; t < poolSize && selectedCount < jurySize; t++) {
+            uint256 r = t + uint256(keccak256(abi.encodePacked(seed, t))) % (poolSize - t);
+            address candidate = _swapGet(swaps, r);
+            if (r != t) _swapSet(swaps, r, _swapGet(swaps, t));
+
+            // Positions are distinct, but a juror may only ever hold one seat: votesCast must be
+            // able to reach taskJurors.length for the dispute to resolve
+            if (candidate != task.requester && candidate != task.worker && !isSelectedJuror[_taskId][candidate]) {
                 taskJurors[_taskId].push(candidate);
-                hasVoted[_taskId][candidate] = false;
+                isSelectedJuror[_taskId][candidate] = true;
                 emit L3_JurorSelected(_taskId, candidate);
                 selectedCount++;
             }
-            attempts++;
         }
     }
 
+    // Open-addressing map of pool position => juror for positions moved by the shuffle
+    struct SwapTable {
+        uint256[] keys; // position + 1, 0 = empty
+        address[] values;
+    }
+
+    function _newSwapTable(uint256 _draws) internal pure returns (SwapTable memory table) {
+        uint256 capacity = 8;
+        while (capacity < 2 * _draws) capacity <<= 1;
+        table.keys = new uint256[](capacity);
+        table.values = new address[](capacity);
+    }
+
+    function _swapSlot(SwapTable memory _table, uint256 _position) internal pure returns (uint256 slot) {
+        uint256 mask = _table.keys.length - 1;
+        slot = uint256(keccak256(abi.encodePacked(_position))) & mask;
+        while (_table.keys[slot] != 0 && _table.keys[slot] != _position + 1) {
+            slot = (slot + 1) & mask;
+        }
+    }
+
+    function _swapGet(SwapTable memory _table, uint256 _position) internal view returns (address) {
+        uint256 slot = _swapSlot(_table, _position);
+        return _table.keys[slot] != 0 ? _table.values[slot] : activeJurorPool[_position];
+    }
+
+    function _swapSet(SwapTable memory _table, uint256 _position, address _juror) internal pure {
+        uint256 slot = _swapSlot(_table, _position);
+        _table.keys[slot] = _position + 1;
+        _table.values[slot] = _juror;
+    }
+
     function castVote(uint256 _taskId, bool _approve) external nonReentrant whenNotPaused {
         Task storage task = tasks[_taskId];
         require(task.status == TaskStatus.L3_HumanJury, "Not in L3 phase");
-        
-        bool isSelected = false;
-        for (uint i = 0; i < taskJurors[_taskId].length; i++) {
-            if (taskJurors[_taskId][i] == msg.sender) {
-                isSelected = true;
-                break;
-            }
-        }
-        require(isSelected, "Not selected");
+        require(isSelectedJuror[_taskId][msg.sender], "Not selected");
         require(!hasVoted[_taskId][msg.sender], "Already voted");
 
         hasVoted[_taskId][msg.sender] = true;
@@ -378,12 +497,7 @@ contract JudgePayEscrow is ReentrancyGuard, Pausable, AccessControl {
         
         emit L3_Voted(_taskId, msg.sender, _approve, power);
 
-        uint256 voteCount = 0;
-        for (uint i = 0; i < taskJurors[_taskId].length; i++) {
-            if (hasVoted[_taskId][taskJurors[_taskId][i]]) voteCount++;
-        }
-
-        if (voteCount == taskJurors[_taskId].length) {
+        if (++votesCast[_taskId] == taskJurors[_taskId].length) {
             _resolveJury(_taskId);
         }
     }
@@ -391,45 +505,89 @@ contract JudgePayEscrow is ReentrancyGuard, Pausable, AccessControl {
     function _resolveJury(uint256 _taskId) internal {
         Task storage task = tasks[_taskId];
         bool workerWins = task.acceptPower >= task.rejectPower; 
-        
-        // Track Correlation to detect Collusion Rings
-        address[] memory currentJurors = taskJurors[_taskId];
-        
-        for (uint i = 0; i < currentJurors.length; i++) {
+
+        // Pay out first: the O(n^2) correlation pass must never hold funds hostage
+        juryResolutions[_taskId] = JuryResolution({row: 0, col: 1, workerWins: workerWins, pending: true});
+        _release(_taskId, workerWins);
+        _processResolution(_taskId, INLINE_RESOLUTION_STEPS);
+    }
+
+    /// @notice Advance the juror score and correlation updates of a resolved dispute. Callable by anyone.
+    function processResolution(uint256 _taskId, uint256 _maxSteps) external whenNotPaused returns (bool finished) {
+        require(juryResolutions[_taskId].pending, "Nothing pending");
+        require(_maxSteps > 0, "Invalid steps");
+        return _processResolution(_taskId, _maxSteps);
+    }
+
+    /// @notice Steps `processResolution` still has to do for `_taskId`
+    function resolutionStepsLeft(uint256 _taskId) external view returns (uint256) {
+        JuryResolution memory res = juryResolutions[_taskId];
+        if (!res.pending) return 0;
+        uint256 n = taskJurors[_taskId].length;
+        uint256 rowsAfter = n - res.row - 1;
+        return (n - res.col) + 1 + (rowsAfter * (rowsAfter + 1)) / 2;
+    }
+
+    function _processResolution(uint256 _taskId, uint256 _maxSteps) internal returns (bool) {
+        JuryResolution storage res = juryResolutions[_taskId];
+        address[] storage currentJurors = taskJurors[_taskId];
+        uint256 n = currentJurors.length;
+        uint256 i = res.row;
+        uint256 j = res.col;
+        uint256 steps = 0;
+
+        while (i < n && steps < _maxSteps) {
             address jurorA = currentJurors[i];
-            JurorStats storage statsA = jurors[jurorA];
-            statsA.totalVotes++;
-            
-            // Check correlation with other jurors in this same task
-            for (uint j = i + 1; j < currentJurors.length; j++) {
+            bool choiceA = voteChoice[_taskId][jurorA];
+
+            // Track Correlation to detect Collusion Rings
+            for (; j < n && steps < _maxSteps; j++) {
+                steps++;
                 address jurorB = currentJurors[j];
-                if (voteChoice[_taskId][jurorA] == voteChoice[_taskId][jurorB]) {
-                    votingCorrelation[jurorA][jurorB]++;
-                    votingCorrelation[jurorB][jurorA]++;
-                    
+                if (choiceA == voteChoice[_taskId][jurorB]) {
+                    uint256 correlated = ++votingCorrelation[jurorA][jurorB];
+                    votingCorrelation[jurorB][jurorA] = correlated;
+
                     // If they correlate too often, nuke their reputation
-                    if (votingCorrelation[jurorA][jurorB] >= COLLUSION_THRESHOLD) {
-                        statsA.weightedScore = 0; // Absolute reset
+                    if (correlated >= COLLUSION_THRESHOLD) {
+                        jurors[jurorA].weightedScore = 0; // Absolute reset
                         jurors[jurorB].weightedScore = 0;
-                        emit CollusionDetected(jurorA, jurorB, votingCorrelation[jurorA][jurorB]);
+                        emit CollusionDetected(jurorA, jurorB, correlated);
                     }
                 }
             }
-            
-            if (voteChoice[_taskId][jurorA] == workerWins) {
-                statsA.correctVotes++;
-                uint256 logValue = _log10(task.amount / (10**6)); 
-                if (logValue == 0) logValue = 1;
-                
-                uint256 boost = (statsA.totalVotes * logValue) / statsA.reputationDecay;
-                statsA.weightedScore = _min(statsA.weightedScore + boost, 10000);
-            } else {
-                statsA.reputationDecay += 5; 
-                statsA.weightedScore = statsA.weightedScore / statsA.reputationDecay;
-            }
+            if (j < n || steps == _maxSteps) break;
+
+            steps++;
+            _scoreJuror(_taskId, jurorA, choiceA == res.workerWins);
+            i++;
+            j = i + 1;
         }
 
-        _release(_taskId, workerWins);
+        res.row = uint64(i);
+        res.col = uint64(j);
+        if (i < n) return false;
+
+        res.pending = false;
+        emit L3_ReputationUpdated(_taskId);
+        return true;
+    }
+
+    function _scoreJuror(uint256 _taskId, address _juror, bool _correct) internal {
+        JurorStats storage stats = jurors[_juror];
+        stats.totalVotes++;
+
+        if (_correct) {
+            stats.correctVotes++;
+            uint256 logValue = _log10(tasks[_taskId].amount / (10**6)); 
+            if (logValue == 0) logValue = 1;
+
+            uint256 boost = (stats.totalVotes * logValue) / stats.reputationDecay;
+            stats.weightedScore = _min(stats.weightedScore + boost, 10000);
+        } else {
+            stats.reputationDecay += 5; 
+            stats.weightedScore = stats.weightedScore / stats.reputationDecay;
+        }
     }
     
     function _release(uint256 _taskId, bool _approved) internal checkInvariant {
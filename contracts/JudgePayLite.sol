@@ -107,4 +107,97 @@ contract JudgePayLite {
         require(usdc.transfer(t.worker, t.amount), "Transfer failed");
         emit TaskCompleted(_id, t.amount);
     }
+
+    // --- BATCH OPERATIONS ---
+    // Items that fail a check are skipped instead of reverting the whole
+    // batch, and USDC moves in as few transfers as possible.
+
+    /// @notice Create several tasks funded by one transferFrom of their total
+    /// @dev Zero amounts are skipped; created tasks get consecutive IDs starting at `firstId`
+    function createTasks(uint96[] calldata _amounts, uint40[] calldata _deadlineHours)
+        external
+        returns (uint256 firstId, uint256 created)
+    {
+        require(_amounts.length == _deadlineHours.length, "Length mismatch");
+
+        firstId = taskCount;
+        uint256 id = firstId;
+        uint256 total;
+        for (uint256 i; i < _amounts.length; ++i) {
+            uint96 amount = _amounts[i];
+            if (amount == 0) continue;
+
+            tasks[id] = Task({
+                requester: msg.sender,
+                worker: address(0),
+                amount: amount,
+                deadline: uint40(block.timestamp + _deadlineHours[i] * 1 hours),
+                submitTime: 0,
+                status: Status.Open
+            });
+            emit TaskCreated(id, msg.sender, amount);
+            total += amount;
+            ++id;
+        }
+
+        taskCount = id;
+        created = id - firstId;
+        if (total > 0) {
+            require(usdc.transferFrom(msg.sender, address(this), total), "Transfer failed");
+        }
+    }
+
+    /// @notice Approve several submitted tasks; consecutive tasks of one worker are paid in one transfer
+    function approveMany(uint256[] calldata _ids) external returns (uint256 approved) {
+        address payee;
+        uint256 owed;
+        for (uint256 i; i < _ids.length; ++i) {
+            Task storage t = tasks[_ids[i]];
+            if (t.status != Status.Submitted || t.requester != msg.sender) continue;
+
+            t.status = Status.Completed;
+            emit TaskCompleted(_ids[i], t.amount);
+            ++approved;
+
+            if (t.worker != payee) {
+                if (owed > 0) require(usdc.transfer(payee, owed), "Transfer failed");
+                payee = t.worker;
+                owed = 0;
+            }
+            owed += t.amount;
+        }
+        if (owed > 0) require(usdc.transfer(payee, owed), "Transfer failed");
+    }
+
+    /// @notice Reject several submitted tasks past their review period, refunding in one transfer
+    function rejectMany(uint256[] calldata _ids) external returns (uint256 rejected) {
+        uint256 refund;
+        for (uint256 i; i < _ids.length; ++i) {
+            Task storage t = tasks[_ids[i]];
+            if (t.status != Status.Submitted || t.requester != msg.sender) continue;
+            if (block.timestamp <= t.submitTime + 24 hours) continue;
+
+            t.status = Status.Refunded;
+            emit TaskRefunded(_ids[i], t.amount);
+            refund += t.amount;
+            ++rejected;
+        }
+        if (refund > 0) require(usdc.transfer(msg.sender, refund), "Transfer failed");
+    }
+
+    /// @notice Reclaim several expired open tasks, refunding in one transfer
+    function claimTimeouts(uint256[] calldata _ids) external returns (uint256 claimed) {
+        uint256 refund;
+        for (uint256 i; i < _ids.length; ++i) {
+            Task storage t = tasks[_ids[i]];
+            if (t.status != Status.Open || t.requester != msg.sender) continue;
+            if (block.timestamp <= t.deadline) continue;
+
+            t.status = Status.Refunded;
+            emit TaskRefunded(_ids[i], t.amount);
+            refund += t.amount;
+            ++claimed;
+        }
+        if (refund > 0) require(usdc.transfer(msg.sender, refund), "Transfer failed");
+    }
 }
@@ -0,0 +1,34 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+interface IVRFConsumer {
+    function fulfillRandomWords(uint256 requestId, uint256[] memory randomWords) external;
+}
+
+/**
+ * @title MockVRFCoordinator
+ * @notice Stand-in for the Chainlink VRF coordinator in local tests: requests
+ *         are recorded and fulfilled on demand with a caller-chosen seed.
+ */
+contract MockVRFCoordinator {
+    uint256 public nextRequestId = 1;
+    mapping(uint256 => address) public consumers;
+
+    event RandomWordsRequested(uint256 indexed requestId, address indexed consumer);
+
+    function requestRandomWords(bytes32, uint64, uint16, uint32, uint32) external returns (uint256 requestId) {
+        requestId = nextRequestId++;
+        consumers[requestId] = msg.sender;
+        emit RandomWordsRequested(requestId, msg.sender);
+    }
+
+    function fulfill(uint256 requestId, uint256 seed) external {
+        address consumer = consumers[requestId];
+        require(consumer != address(0), "Unknown request");
+        delete consumers[requestId];
+
+        uint256[] memory words = new uint256[](1);
+        words[0] = seed;
+        IVRFConsumer(consumer).fulfillRandomWords(requestId, words);
+    }
+}
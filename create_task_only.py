@@ -1,30 +1,29 @@
 import json
 from web3 import Web3
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from abi_registry import load_abi
+from rpc_router import endpoints_from_env, routed_web3
 
 # Configuration
-RPC_URL = "https://sepolia.base.org"
+RPC_ENDPOINTS = endpoints_from_env()  # USDC_RPC_BASE, comma-separated
 JUDGEPAY_ADDRESS = Web3.to_checksum_address("0x941bb35BFf8314A20c739EC129d6F38ba73BD4E5")
 USDC_ADDRESS = Web3.to_checksum_address("0x036CbD53842c5426634e7929541eC2318f3dCF7e")
 PRIVATE_KEY = os.environ.get("PRIVATE_KEY")
 MY_ADDRESS = Web3.to_checksum_address("0x4a6a4Db15Ce7C892f62c750fDcC0D34d11572a99")
 
-# ABI
-USDC_ABI = [
-    {"inputs":[{"internalType":"address","name":"account","type":"address"}],"name":"balanceOf","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"}
-]
-
-JUDGEPAY_ABI = [
-    {"inputs":[{"internalType":"uint96","name":"_amount","type":"uint96"},{"internalType":"uint40","name":"_deadlineHours","type":"uint40"}],"name":"createTask","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"nonpayable","type":"function"},
-    {"anonymous":False,"inputs":[{"indexed":True,"internalType":"uint256","name":"id","type":"uint256"},{"indexed":True,"internalType":"address","name":"requester","type":"address"},{"indexed":False,"internalType":"uint96","name":"amount","type":"uint96"}],"name":"TaskCreated","type":"event"}
-]
+# ABIs from the forge artifacts (see scripts/abi_registry.py)
+USDC_ABI = load_abi("MockUSDC")
+JUDGEPAY_ABI = load_abi("JudgePayLite")
 
 def main():
     if not PRIVATE_KEY:
         print("❌ Error: PRIVATE_KEY env var missing")
         return
 
-    w3 = Web3(Web3.HTTPProvider(RPC_URL))
+    w3 = routed_web3(RPC_ENDPOINTS)
     if not w3.is_connected():
         print("❌ Error: Cannot connect to RPC")
         return
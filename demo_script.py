@@ -1,9 +1,13 @@
 import json
 from web3 import Web3
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from rpc_router import endpoints_from_env, routed_web3
 
 # Configuration
-RPC_URL = "https://sepolia.base.org"
+RPC_ENDPOINTS = endpoints_from_env()  # USDC_RPC_BASE, comma-separated
 CONTRACT_ADDRESS = Web3.to_checksum_address("0x42B910005890f2ddDAD9eCe12CB9908c5D81F287")
 PRIVATE_KEY = os.environ.get("PRIVATE_KEY")
 MY_ADDRESS = "0x4a6a4Db15Ce7C892f62c750fDcC0D34d11572a99"
@@ -37,7 +41,7 @@ def main():
         print("Error: PRIVATE_KEY env var missing")
         return
 
-    w3 = Web3(Web3.HTTPProvider(RPC_URL))
+    w3 = routed_web3(RPC_ENDPOINTS)
     if not w3.is_connected():
         print("Error: Cannot connect to RPC")
         return
@@ -1,36 +1,30 @@
 import json
 from web3 import Web3
 import os
+import sys
 import time
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from abi_registry import load_abi
+from rpc_router import endpoints_from_env, routed_web3
+
 # Configuration - V2 Contract
-RPC_URL = "https://sepolia.base.org"
+RPC_ENDPOINTS = endpoints_from_env()  # USDC_RPC_BASE, comma-separated
 JUDGEPAY_ADDRESS = Web3.to_checksum_address("0xA5D4B9dFdFd8EEee1335336B8A5ba766De717e11")
 USDC_ADDRESS = Web3.to_checksum_address("0x036CbD53842c5426634e7929541eC2318f3dCF7e")
 PRIVATE_KEY = os.environ.get("PRIVATE_KEY")
 MY_ADDRESS = Web3.to_checksum_address("0x4a6a4Db15Ce7C892f62c750fDcC0D34d11572a99")
 
-# ABI
-USDC_ABI = [
-    {"inputs":[{"internalType":"address","name":"spender","type":"address"},{"internalType":"uint256","name":"value","type":"uint256"}],"name":"approve","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"nonpayable","type":"function"},
-    {"inputs":[{"internalType":"address","name":"account","type":"address"}],"name":"balanceOf","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"}
-]
-
-JUDGEPAY_ABI = [
-    {"inputs":[{"internalType":"uint96","name":"_amount","type":"uint96"},{"internalType":"uint40","name":"_deadlineHours","type":"uint40"}],"name":"createTask","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"nonpayable","type":"function"},
-    {"inputs":[{"internalType":"uint256","name":"_id","type":"uint256"}],"name":"submitWork","outputs":[],"stateMutability":"nonpayable","type":"function"},
-    {"inputs":[{"internalType":"uint256","name":"_id","type":"uint256"}],"name":"approve","outputs":[],"stateMutability":"nonpayable","type":"function"},
-    {"inputs":[{"internalType":"uint256","name":"","type":"uint256"}],"name":"tasks","outputs":[{"internalType":"address","name":"requester","type":"address"},{"internalType":"address","name":"worker","type":"address"},{"internalType":"uint96","name":"amount","type":"uint96"},{"internalType":"uint40","name":"deadline","type":"uint40"},{"internalType":"uint8","name":"status","type":"uint8"}],"stateMutability":"view","type":"function"},
-    {"inputs":[],"name":"taskCount","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},
-    {"anonymous":False,"inputs":[{"indexed":True,"internalType":"uint256","name":"id","type":"uint256"},{"indexed":True,"internalType":"address","name":"requester","type":"address"},{"indexed":False,"internalType":"uint96","name":"amount","type":"uint96"}],"name":"TaskCreated","type":"event"}
-]
+# ABIs from the forge artifacts (see scripts/abi_registry.py)
+USDC_ABI = load_abi("MockUSDC")
+JUDGEPAY_ABI = load_abi("JudgePayLite")
 
 def main():
     if not PRIVATE_KEY:
         print("❌ Error: PRIVATE_KEY env var missing")
         return
 
-    w3 = Web3(Web3.HTTPProvider(RPC_URL))
+    w3 = routed_web3(RPC_ENDPOINTS)
     print(f"🔗 Connected to Base Sepolia (Block: {w3.eth.block_number})")
     
     usdc = w3.eth.contract(address=USDC_ADDRESS, abi=USDC_ABI)
@@ -102,7 +96,7 @@ def main():
     # Final
     task = judgepay.functions.tasks(task_id).call()
     status_map = {0: "Open", 1: "Submitted", 2: "Completed", 3: "Refunded"}
-    print(f"\n🏆 Task #{task_id} Final Status: {status_map.get(task[4], 'Unknown')}")
+    print(f"\n🏆 Task #{task_id} Final Status: {status_map.get(task[5], 'Unknown')}")
     print(f"💸 Worker received: 2 USDC")
     
     balance = usdc.functions.balanceOf(MY_ADDRESS).call()
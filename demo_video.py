@@ -7,13 +7,18 @@ Run this to see the full flow with beautiful output
 import json
 from web3 import Web3
 import os
+import sys
 import time
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from abi_registry import load_abi
+from rpc_router import endpoints_from_env, routed_web3
+
 # ═══════════════════════════════════════════════════════════════
 # 🎨 CONFIGURATION
 # ═══════════════════════════════════════════════════════════════
 
-RPC_URL = "https://sepolia.base.org"
+RPC_ENDPOINTS = endpoints_from_env()  # USDC_RPC_BASE, comma-separated
 JUDGEPAY_ADDRESS = Web3.to_checksum_address("0x941bb35BFf8314A20c739EC129d6F38ba73BD4E5")
 USDC_ADDRESS = Web3.to_checksum_address("0x036CbD53842c5426634e7929541eC2318f3dCF7e")
 PRIVATE_KEY = os.environ.get("PRIVATE_KEY")
@@ -54,19 +59,8 @@ def tx_link(tx_hash):
 # 🔧 ABI
 # ═══════════════════════════════════════════════════════════════
 
-USDC_ABI = [
-    {"inputs":[{"internalType":"address","name":"account","type":"address"}],"name":"balanceOf","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},
-    {"inputs":[{"internalType":"address","name":"spender","type":"address"},{"internalType":"uint256","name":"value","type":"uint256"}],"name":"approve","outputs":[{"internalType":"bool","name":"","type":"bool"}],"stateMutability":"nonpayable","type":"function"}
-]
-
-JUDGEPAY_ABI = [
-    {"inputs":[{"internalType":"uint96","name":"_amount","type":"uint96"},{"internalType":"uint40","name":"_deadlineHours","type":"uint40"}],"name":"createTask","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"nonpayable","type":"function"},
-    {"inputs":[{"internalType":"uint256","name":"_id","type":"uint256"}],"name":"submitWork","outputs":[],"stateMutability":"nonpayable","type":"function"},
-    {"inputs":[{"internalType":"uint256","name":"_id","type":"uint256"}],"name":"approve","outputs":[],"stateMutability":"nonpayable","type":"function"},
-    {"inputs":[{"internalType":"uint256","name":"","type":"uint256"}],"name":"tasks","outputs":[{"internalType":"address","name":"requester","type":"address"},{"internalType":"address","name":"worker","type":"address"},{"internalType":"uint96","name":"amount","type":"uint96"},{"internalType":"uint40","name":"deadline","type":"uint40"},{"internalType":"uint8","name":"status","type":"uint8"}],"stateMutability":"view","type":"function"},
-    {"inputs":[],"name":"taskCount","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"},
-    {"anonymous":False,"inputs":[{"indexed":True,"internalType":"uint256","name":"id","type":"uint256"},{"indexed":True,"internalType":"address","name":"requester","type":"address"},{"indexed":False,"internalType":"uint96","name":"amount","type":"uint96"}],"name":"TaskCreated","type":"event"}
-]
+USDC_ABI = load_abi("MockUSDC")
+JUDGEPAY_ABI = load_abi("JudgePayLite")
 
 # ═══════════════════════════════════════════════════════════════
 # 🚀 MAIN
@@ -79,12 +73,12 @@ def main():
         print("❌ Error: Set PRIVATE_KEY environment variable")
         return
     
-    w3 = Web3(Web3.HTTPProvider(RPC_URL))
+    w3 = routed_web3(RPC_ENDPOINTS)
     usdc = w3.eth.contract(address=USDC_ADDRESS, abi=USDC_ABI)
     judgepay = w3.eth.contract(address=JUDGEPAY_ADDRESS, abi=JUDGEPAY_ABI)
     
     section("📡 CONNECTING TO BASE SEPOLIA")
-    info(f"RPC: {RPC_URL}")
+    info(f"RPC: {', '.join(RPC_ENDPOINTS)}")
     info(f"Block: {w3.eth.block_number}")
     success("Connected!")
     
@@ -111,7 +105,7 @@ def main():
         print(f"    Requester: {task[0][:10]}...")
         print(f"    Worker:    {task[1][:10]}..." if task[1] != "0x0000000000000000000000000000000000000000" else "    Worker:    (none)")
         print(f"    Amount:    {task[2] / 10**6} USDC")
-        print(f"    Status:    {status_map.get(task[4], 'Unknown')}")
+        print(f"    Status:    {status_map.get(task[5], 'Unknown')}")
     
     section("🎉 DEMO COMPLETE")
     print("""
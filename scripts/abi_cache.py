@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+JudgePay - Cached ABI metadata
+Function selectors, event topics and checksummed addresses without importing
+web3, and calldata codecs that are built once per function.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from eth_hash.auto import keccak
+
+DEFAULT_CACHE = os.getenv(
+    "JUDGEPAY_ABI_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "judgepay", "abi.json")
+)
+
+
+def canonical_type(param: dict) -> str:
+    """ABI type string of one input/output, with tuples expanded."""
+    type_str = param["type"]
+    if type_str.startswith("tuple"):
+        inner = ",".join(canonical_type(c) for c in param["components"])
+        return f"({inner}){type_str[len('tuple'):]}"
+    return type_str
+
+
+def signature(entry: dict) -> str:
+    """Canonical signature, e.g. "submitWork(uint256)"."""
+    return f"{entry['name']}({','.join(canonical_type(p) for p in entry.get('inputs', []))})"
+
+
+def checksum_address(address) -> str:
+    """EIP-55 checksummed form of a 20-byte address (hex string or bytes)."""
+    if isinstance(address, (bytes, bytearray)):
+        address = address.hex()
+    plain = address.lower().removeprefix("0x")
+    if len(plain) != 40:
+        raise ValueError(f"Not a 20-byte address: {address!r}")
+    digest = keccak(plain.encode()).hex()
+    return "0x" + "".join(c.upper() if int(digest[i], 16) >= 8 else c for i, c in enumerate(plain))
+
+
+def _describe(abi: list) -> dict:
+    functions, events = {}, {}
+    for entry in abi:
+        if entry.get("type") == "function":
+            functions[entry["name"]] = {
+                "selector": keccak(signature(entry).encode())[:4].hex(),
+                "inputs": [canonical_type(p) for p in entry.get("inputs", [])],
+                "outputs": [canonical_type(p) for p in entry.get("outputs", [])],
+            }
+        elif entry.get("type") == "event":
+            events[entry["name"]] = {
+                "topic": keccak(signature(entry).encode()).hex(),
+                "inputs": [canonical_type(p) for p in entry.get("inputs", [])],
+                "indexed": [bool(p.get("indexed")) for p in entry.get("inputs", [])],
+            }
+    return {"functions": functions, "events": events}
+
+
+class AbiCache:
+    """
+    Selectors, topics and type lists for ABIs, persisted between runs.
+
+    Entries are keyed by a digest of the ABI JSON, so an edited ABI simply
+    gets a new entry. The cache file is best-effort: if it can't be read or
+    written everything is computed in memory.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE):
+        self.path = path
+        self._entries = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        if self._entries is None:
+            try:
+                with open(self.path) as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self):
+        try:
+            directory = os.path.dirname(self.path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".abi-")
+            with os.fdopen(fd, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def lookup(self, abi: list) -> dict:
+        """{"functions": {name: ...}, "events": {name: ...}} for `abi`."""
+        key = hashlib.sha256(json.dumps(abi, sort_keys=True).encode()).hexdigest()
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key)
+            if entry is None:
+                entry = entries[key] = _describe(abi)
+                self._save()
+        return entry
+
+
+_default_cache = None
+
+
+def default_cache() -> AbiCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = AbiCache()
+    return _default_cache
+
+
+class CallCodec:
+    """
+    Calldata encoder and return-data decoder for one function.
+
+    The eth_abi tuple encoder/decoder is resolved once, on first use, so
+    each call is a selector concatenation plus the bare encoding; none of
+    web3's per-call ABI matching or argument normalisation runs.
+    """
+
+    def __init__(self, selector: str, inputs: list, outputs: list):
+        self.selector = bytes.fromhex(selector)
+        self.inputs = inputs
+        self.outputs = outputs
+        self._encoder = None
+        self._decoder = None
+        self._stream = None
+
+    def _build(self):
+        # eth_abi is only imported once something is actually encoded
+        from eth_abi.decoding import ContextFramesBytesIO
+        from eth_abi.registry import registry
+        self._encoder = registry.get_tuple_encoder(*self.inputs)
+        self._decoder = registry.get_tuple_decoder(*self.outputs)
+        self._stream = ContextFramesBytesIO
+
+    def encode(self, *args) -> bytes:
+        if self._encoder is None:
+            self._build()
+        return self.selector + self._encoder(args)
+
+    def decode(self, data: bytes) -> tuple:
+        if self._decoder is None:
+            self._build()
+        return self._decoder(self._stream(bytes(data)))
+
+
+def codecs(abi: list, cache: AbiCache = None) -> dict:
+    """name -> CallCodec for every function in `abi`."""
+    functions = (cache or default_cache()).lookup(abi)["functions"]
+    return {name: CallCodec(f["selector"], f["inputs"], f["outputs"]) for name, f in functions.items()}
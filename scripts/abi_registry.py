@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+JudgePay - ABI registry
+Contract ABIs from the foundry `out/` artifacts, with precomputed selectors
+and event topics and lean codecs for the hot calls.
+"""
+
+import argparse
+import json
+import os
+
+from abi_cache import CallCodec, default_cache
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ARTIFACTS_DIR = os.getenv("JUDGEPAY_ARTIFACTS", os.path.join(os.path.dirname(SCRIPTS_DIR), "out"))
+# Checked-in copies of the artifact ABIs, used when there is no forge build
+BUNDLED_DIR = os.path.join(SCRIPTS_DIR, "abi")
+
+CONTRACTS = ("JudgePayLite", "JudgePayEscrow", "MockUSDC")
+
+# The parts of an artifact ABI the scripts rely on; internalType and custom
+# errors are dropped so the bundled copies stay small and stable.
+ABI_KEYS = ("type", "name", "inputs", "outputs", "stateMutability", "anonymous", "indexed", "components")
+
+
+def _strip(entry: dict) -> dict:
+    kept = {}
+    for key in ABI_KEYS:
+        if key not in entry:
+            continue
+        value = entry[key]
+        if key in ("inputs", "outputs", "components"):
+            value = [_strip(item) for item in value]
+        kept[key] = value
+    return kept
+
+
+def artifact_path(name: str, artifacts_dir: str = ARTIFACTS_DIR) -> str:
+    return os.path.join(artifacts_dir, f"{name}.sol", f"{name}.json")
+
+
+def load_abi(name: str, artifacts_dir: str = ARTIFACTS_DIR) -> list:
+    """ABI of contract `name`: the forge artifact if built, else the bundled copy."""
+    try:
+        with open(artifact_path(name, artifacts_dir)) as f:
+            abi = json.load(f)["abi"]
+    except FileNotFoundError:
+        with open(os.path.join(BUNDLED_DIR, f"{name}.json")) as f:
+            abi = json.load(f)
+    return [_strip(entry) for entry in abi if entry.get("type") != "error"]
+
+
+class ContractABI:
+    """
+    One contract's ABI with everything derived from it computed once.
+
+    Selectors and topics come from the persistent ABI cache, and `codec`
+    returns a CallCodec per function, so encoding a call never goes
+    through web3's contract objects.
+    """
+
+    def __init__(self, name: str, abi: list):
+        self.name = name
+        self.abi = abi
+        meta = default_cache().lookup(abi)
+        self.selectors = {n: bytes.fromhex(f["selector"]) for n, f in meta["functions"].items()}
+        self.topics = {n: bytes.fromhex(e["topic"]) for n, e in meta["events"].items()}
+        self._codecs = {n: CallCodec(f["selector"], f["inputs"], f["outputs"]) for n, f in meta["functions"].items()}
+
+    def function(self, name: str) -> dict:
+        return next(e for e in self.abi if e.get("type") == "function" and e["name"] == name)
+
+    def event(self, name: str) -> dict:
+        return next(e for e in self.abi if e.get("type") == "event" and e["name"] == name)
+
+    def events(self, names=None) -> list:
+        """Event ABIs, optionally limited to `names` (in that order)."""
+        if names is None:
+            return [e for e in self.abi if e.get("type") == "event"]
+        return [self.event(n) for n in names]
+
+    def codec(self, name: str) -> CallCodec:
+        return self._codecs[name]
+
+    def encode(self, name: str, *args) -> bytes:
+        """Calldata for `name(args)`."""
+        return self._codecs[name].encode(*args)
+
+    def decode(self, name: str, data: bytes) -> tuple:
+        """Decode the return data of `name`."""
+        return self._codecs[name].decode(data)
+
+
+_contracts = {}
+
+
+def contract(name: str) -> ContractABI:
+    """Registry entry for `name` (one of CONTRACTS), loaded on first use."""
+    if name not in _contracts:
+        _contracts[name] = ContractABI(name, load_abi(name))
+    return _contracts[name]
+
+
+def _artifact_abi(name: str, artifacts_dir: str) -> list:
+    with open(artifact_path(name, artifacts_dir)) as f:
+        return [_strip(e) for e in json.load(f)["abi"] if e.get("type") != "error"]
+
+
+def _entries(abi: list) -> list:
+    """ABI entries in a canonical form, so order and key order don't count as changes."""
+    return sorted(json.dumps(entry, sort_keys=True) for entry in abi)
+
+
+def drift(artifacts_dir: str = ARTIFACTS_DIR, out_dir: str = BUNDLED_DIR) -> dict:
+    """
+    Compare the bundled ABIs against a forge build.
+
+    Returns {contract: {"missing": [...], "extra": [...]}} for every
+    contract whose bundled copy differs; "missing" entries are in the
+    build but not bundled, "extra" ones the reverse.
+    """
+    changed = {}
+    for name in CONTRACTS:
+        built = _entries(_artifact_abi(name, artifacts_dir))
+        with open(os.path.join(out_dir, f"{name}.json")) as f:
+            bundled = _entries(json.load(f))
+        if built != bundled:
+            changed[name] = {
+                "missing": [json.loads(e) for e in built if e not in bundled],
+                "extra": [json.loads(e) for e in bundled if e not in built],
+            }
+    return changed
+
+
+def export(artifacts_dir: str = ARTIFACTS_DIR, out_dir: str = BUNDLED_DIR) -> list:
+    """Refresh the bundled ABIs from a forge build; returns the files written."""
+    written = []
+    for name in CONTRACTS:
+        abi = _artifact_abi(name, artifacts_dir)
+        path = os.path.join(out_dir, f"{name}.json")
+        with open(path, "w") as f:
+            json.dump(abi, f, indent=2)
+            f.write("\n")
+        written.append(path)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JudgePay ABI registry")
+    parser.add_argument("--export", action="store_true", help="Copy ABIs from the forge out/ directory into scripts/abi/")
+    parser.add_argument("--check", action="store_true", help="Exit non-zero if scripts/abi/ differs from the forge out/ directory")
+    parser.add_argument("--artifacts", default=ARTIFACTS_DIR, help="forge out/ directory")
+    args = parser.parse_args()
+
+    if args.export:
+        print(json.dumps({"written": export(args.artifacts)}, indent=2))
+        return
+    if args.check:
+        changed = drift(args.artifacts)
+        print(json.dumps({"drift": changed}, indent=2))
+        if changed:
+            raise SystemExit("Bundled ABIs are stale; run abi_registry.py --export after forge build")
+        return
+
+    summary = {}
+    for name in CONTRACTS:
+        entry = contract(name)
+        summary[name] = {
+            "functions": {n: "0x" + s.hex() for n, s in sorted(entry.selectors.items())},
+            "events": {n: "0x" + t.hex() for n, t in sorted(entry.topics.items())},
+        }
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+JudgePay - Standing USDC allowance
+Track a one-time bulk approval and the task escrows spent against it.
+"""
+
+import json
+import os
+import threading
+
+DEFAULT_LEDGER = os.getenv("JUDGEPAY_ALLOWANCE_LEDGER", "judgepay_allowance.json")
+
+
+class AllowanceLedger:
+    """
+    Local ledger of standing allowances, keyed by (owner, spender).
+
+    `judgepay preapprove` records the budget it approved; every task created
+    against that allowance records its amount, so the remaining budget is
+    known without another RPC call. The file is rewritten on every change.
+    """
+
+    def __init__(self, path: str = DEFAULT_LEDGER):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self._entries = json.load(f)
+
+    @staticmethod
+    def _key(owner: str, spender: str) -> str:
+        return f"{owner.lower()}:{spender.lower()}"
+
+    def _save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._entries, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def set_budget(self, owner: str, spender: str, amount_raw: int, tx_hash: str = None):
+        """Record a new standing allowance, resetting the spend counter."""
+        with self._lock:
+            self._entries[self._key(owner, spender)] = {"budget": amount_raw, "spent": 0, "tx_hash": tx_hash}
+            self._save()
+
+    def record_spend(self, owner: str, spender: str, amount_raw: int):
+        """Count a task escrow against the standing allowance, if one is recorded."""
+        with self._lock:
+            entry = self._entries.get(self._key(owner, spender))
+            if entry is None:
+                return
+            entry["spent"] += amount_raw
+            self._save()
+
+    def status(self, owner: str, spender: str) -> dict:
+        """Budget, spend and remaining amount (raw units), or None if nothing is recorded."""
+        with self._lock:
+            entry = self._entries.get(self._key(owner, spender))
+            if entry is None:
+                return None
+            return dict(entry, remaining=max(entry["budget"] - entry["spent"], 0))
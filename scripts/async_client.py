@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+JudgePay - asyncio client
+Drive many escrow lifecycles from one event loop with AsyncWeb3.
+"""
+
+import asyncio
+import os
+
+from eth_account import Account
+from web3 import AsyncWeb3, Web3
+
+from abi_cache import checksum_address
+from abi_registry import contract
+from allowance import AllowanceLedger
+from blob_store import DEFAULT_BLOB_DIR, BlobStore, resolve_content
+from judgepay import (
+    JUDGEPAY_ADDRESS,
+    USDC_ADDRESS,
+    explorer_url,
+    format_task,
+)
+from fees import DEFAULT_SPEED, FeeOracle, GasEstimator
+from nonce_manager import NonceManager, is_already_known
+from receipts import DEFAULT_CONFIRMATIONS, ReceiptTracker
+from rpc_router import RpcRouter, async_web3_provider, endpoints_from_env, parse_endpoints, web3_provider
+from task_events import task_id_from_receipt
+
+DEFAULT_MAX_CONCURRENCY = 32
+
+
+class AsyncJudgePayClient:
+    """
+    Async counterpart of JudgePayClient.
+
+    All RPC requests go through one semaphore, so the number of requests in
+    flight stays bounded however many lifecycles are running. Receipts are
+    resolved by a shared ReceiptTracker, so waiting transactions hold no
+    slot and add no per-transaction polling. Both go through one RpcRouter,
+    so `rpc_url` may list several endpoints.
+    """
+
+    def __init__(
+        self,
+        rpc_url: str = None,
+        contract_address: str = None,
+        private_key: str = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        speed: str = DEFAULT_SPEED,
+        confirmations: int = DEFAULT_CONFIRMATIONS,
+        blob_dir: str = DEFAULT_BLOB_DIR
+    ):
+        self.contract_address = contract_address or JUDGEPAY_ADDRESS
+        self.private_key = private_key or os.getenv("USDC_PRIVATE_KEY")
+
+        import requests
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_concurrency, pool_maxsize=max_concurrency)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        # `rpc_url` may list several endpoints, comma-separated or as a list
+        self.router = RpcRouter(parse_endpoints(rpc_url) or endpoints_from_env(), session=session, pool_size=max_concurrency)
+        self.w3 = AsyncWeb3(async_web3_provider(self.router, max_workers=max_concurrency))
+        self.nonces = NonceManager()
+        self.fees = FeeOracle()
+        self.gas = GasEstimator()
+        self.speed = speed
+        self.receipts = ReceiptTracker(Web3(web3_provider(self.router)), confirmations=confirmations)
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.judgepay = contract("JudgePayLite")
+        self.usdc = contract("MockUSDC")
+        self._chain_id = None
+        self._decimals = None
+        self._accounts = {}
+        self._allowances = {}
+        self._allowance_lock = asyncio.Lock()
+        self._funding_locks = {}
+        self.ledger = AllowanceLedger()
+        self.blobs = BlobStore(blob_dir) if blob_dir else None
+
+    @property
+    def rpc_url(self) -> str:
+        """The endpoint the router currently prefers."""
+        return self.router.url
+
+    async def close(self):
+        """Stop the receipt poller and the router."""
+        self.receipts.close()
+        await self.w3.provider.disconnect()
+        self.router.session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _rpc(self, awaitable):
+        """Await an RPC call under the concurrency limit."""
+        async with self._semaphore:
+            return await awaitable
+
+    async def _view(self, entry, name: str, *args, to: str = None) -> tuple:
+        """Call view function `name` of registry entry `entry` and decode its outputs."""
+        call = {"to": checksum_address(to or self.contract_address), "data": "0x" + entry.encode(name, *args).hex()}
+        return entry.decode(name, await self._rpc(self.w3.eth.call(call)))
+
+    # --- Cached chain facts ---
+
+    async def chain_id(self) -> int:
+        if self._chain_id is None:
+            self._chain_id = await self._rpc(self.w3.eth.chain_id)
+        return self._chain_id
+
+    async def decimals(self) -> int:
+        if self._decimals is None:
+            self._decimals = (await self._view(self.usdc, "decimals", to=USDC_ADDRESS))[0]
+        return self._decimals
+
+    def account(self, private_key: str = None):
+        """Return the (cached) signing account, or None if no key is configured."""
+        pk = private_key or self.private_key
+        if not pk:
+            return None
+        if pk not in self._accounts:
+            self._accounts[pk] = Account.from_key(pk)
+        return self._accounts[pk]
+
+    def _commit_text(self, text: str) -> bytes:
+        """keccak256 of `text`, keeping the preimage in the blob store."""
+        if self.blobs is None:
+            return Web3.keccak(text=text)
+        return self.blobs.put_text(text)
+
+    def _link(self, task_id: int, **hashes):
+        """Record a task's content hashes in the blob store, if there is one."""
+        if self.blobs is not None and task_id is not None:
+            self.blobs.set_ref(self.contract_address, task_id, **hashes)
+
+    def _check(self, private_key: str = None, need_key: bool = True):
+        """Return an error dict if the client cannot perform an operation."""
+        if need_key and not (private_key or self.private_key):
+            return {"error": "No private key. Set USDC_PRIVATE_KEY."}
+        if not self.contract_address:
+            return {"error": "No contract address. Set JUDGEPAY_CONTRACT."}
+        return None
+
+    # --- Nonces, sending and receipts ---
+
+    async def _chain_nonce(self, address: str) -> int:
+        return await self._rpc(self.w3.eth.get_transaction_count(address, "pending"))
+
+    async def _fees(self) -> dict:
+        if not self.fees.is_fresh():
+            history = await self._rpc(self.w3.eth.fee_history(self.fees.blocks, "latest", self.fees.percentiles))
+            self.fees.update(history)
+        return self.fees.fees(self.speed)
+
+    async def _gas_limit(self, tx: dict, fallback_gas: int) -> int:
+        limit = self.gas.lookup(tx)
+        if limit is not None:
+            return limit
+        try:
+            estimate = await self._rpc(self.w3.eth.estimate_gas({k: v for k, v in tx.items() if k != "gas"}))
+        except Exception:
+            return fallback_gas
+        return self.gas.learn(tx, estimate)
+
+    async def _send(self, to: str, data: bytes, account, fallback_gas: int):
+        """Sign and broadcast a call (`data` to `to`) with a locally reserved nonce."""
+        template = {
+            'from': account.address,
+            'to': checksum_address(to),
+            'data': '0x' + data.hex(),
+            'value': 0,
+            'gas': fallback_gas,
+            'chainId': await self.chain_id(),
+            **await self._fees(),
+        }
+        template['gas'] = await self._gas_limit(template, fallback_gas)
+
+        async def send(nonce):
+            signed = account.sign_transaction(dict(template, nonce=nonce))
+            try:
+                return await self._rpc(self.w3.eth.send_raw_transaction(signed.raw_transaction))
+            except Exception as exc:
+                # A node that already has this exact payload has accepted it
+                if not is_already_known(exc):
+                    raise
+                return signed.hash
+
+        return await self.nonces.send_async(account.address, send, lambda: self._chain_nonce(account.address))
+
+    async def wait_for_receipt(self, tx_hash, timeout: float = None):
+        """Await a final receipt from the shared tracker."""
+        return await asyncio.wrap_future(self.receipts.track(tx_hash, timeout=timeout))
+
+    def _funding_lock(self, owner: str) -> asyncio.Lock:
+        """Held from `_ensure_allowance` until the spending tx is sent; see JudgePayClient._funding_lock."""
+        lock = self._funding_locks.get(owner)
+        if lock is None:
+            lock = self._funding_locks[owner] = asyncio.Lock()
+        return lock
+
+    async def _ensure_allowance(self, account, amount_raw: int):
+        """Send an approve only if the tracked allowance can't cover `amount_raw`; call under `_funding_lock`."""
+        owner = account.address
+        spender = checksum_address(self.contract_address)
+        async with self._allowance_lock:
+            allowance = self._allowances.get(owner)
+            if allowance is None:
+                allowance = (await self._view(self.usdc, "allowance", owner, spender, to=USDC_ADDRESS))[0]
+            if allowance >= amount_raw:
+                self._allowances[owner] = allowance - amount_raw
+                self.ledger.record_spend(owner, spender, amount_raw)
+                return None
+            self._allowances[owner] = 0
+
+        return await self._send(USDC_ADDRESS, self.usdc.encode("approve", spender, amount_raw), account, 100000)
+
+    # --- Operations ---
+
+    async def create_task(
+        self,
+        description: str,
+        amount_usdc: float,
+        deadline_hours: int = 24,
+        private_key: str = None
+    ) -> dict:
+        """Create a new task with USDC escrow."""
+
+        error = self._check(private_key)
+        if error:
+            return error
+
+        account = self.account(private_key)
+        amount_raw = int(amount_usdc * (10 ** await self.decimals()))
+
+        desc_hash = self._commit_text(description)
+        data = self.judgepay.encode("createTask", amount_raw, deadline_hours)
+        async with self._funding_lock(account.address):
+            approve_hash = await self._ensure_allowance(account, amount_raw)
+            tx_hash = await self._send(self.contract_address, data, account, 300000)
+
+        # createTask is nonce-ordered after its approve, so its receipt covers both
+        receipt = await self.wait_for_receipt(tx_hash)
+        task_id = task_id_from_receipt(receipt, self.contract_address)
+        self._link(task_id, description_hash=desc_hash)
+
+        return {
+            "success": True,
+            "task_id": task_id,
+            "description": description,
+            "description_hash": desc_hash.hex(),
+            "amount_usdc": amount_usdc,
+            "deadline_hours": deadline_hours,
+            "tx_hash": tx_hash.hex(),
+            "explorer": explorer_url(tx_hash.hex())
+        }
+
+    async def get_task(self, task_id: int) -> dict:
+        """Get task details."""
+
+        error = self._check(need_key=False)
+        if error:
+            return error
+
+        row = format_task(task_id, await self._view(self.judgepay, "tasks", task_id))
+        if self.blobs is None:
+            return row
+        row.update(self.blobs.refs(self.contract_address, task_id))
+        # Misses may go out to blob peers, so keep them off the event loop
+        return await asyncio.to_thread(resolve_content, self.blobs, row)
+
+    async def submit_work(self, task_id: int, output: str, private_key: str = None) -> dict:
+        """Submit work for a task."""
+
+        error = self._check(private_key)
+        if error:
+            return error
+
+        account = self.account(private_key)
+        output_hash = self._commit_text(output)
+        output_length = len(output.encode())
+
+        tx_hash = await self._send(self.contract_address, self.judgepay.encode("submitWork", task_id), account, 200000)
+        self._link(task_id, output_hash=output_hash)
+        await self.wait_for_receipt(tx_hash)
+
+        return {
+            "success": True,
+            "task_id": task_id,
+            "output_length": output_length,
+            "output_hash": output_hash.hex(),
+            "tx_hash": tx_hash.hex(),
+            "explorer": explorer_url(tx_hash.hex())
+        }
+
+    async def evaluate_task(self, task_id: int, approve: bool, private_key: str = None) -> dict:
+        """Evaluate submitted work: JudgePayLite approve() or reject()."""
+
+        error = self._check(private_key)
+        if error:
+            return error
+
+        account = self.account(private_key)
+
+        data = self.judgepay.encode("approve" if approve else "reject", task_id)
+        tx_hash = await self._send(self.contract_address, data, account, 200000)
+        await self.wait_for_receipt(tx_hash)
+
+        return {
+            "success": True,
+            "task_id": task_id,
+            "approved": approve,
+            "result": "USDC released to worker" if approve else "USDC refunded to requester",
+            "tx_hash": tx_hash.hex(),
+            "explorer": explorer_url(tx_hash.hex())
+        }
+
+
+# Shared client for the module-level coroutines below
+_client = None
+
+
+def get_client() -> AsyncJudgePayClient:
+    """Return the process-wide AsyncJudgePayClient, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = AsyncJudgePayClient()
+    return _client
+
+
+async def create_task(
+    description: str,
+    amount_usdc: float,
+    deadline_hours: int = 24,
+    private_key: str = None
+) -> dict:
+    """Create a new task with USDC escrow."""
+    return await get_client().create_task(
+        description,
+        amount_usdc,
+        deadline_hours=deadline_hours,
+        private_key=private_key
+    )
+
+
+async def get_task(task_id: int) -> dict:
+    """Get task details."""
+    return await get_client().get_task(task_id)
+
+
+async def submit_work(task_id: int, output: str, private_key: str = None) -> dict:
+    """Submit work for a task."""
+    return await get_client().submit_work(task_id, output, private_key=private_key)
+
+
+async def evaluate_task(task_id: int, approve: bool, private_key: str = None) -> dict:
+    """Evaluate submitted work."""
+    return await get_client().evaluate_task(task_id, approve, private_key=private_key)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+JudgePay - Offline auto-evaluation
+Check submitted outputs against task conditions and the submitted commitment,
+one at a time or in parallel batches.
+"""
+
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from eth_hash.auto import keccak
+
+from hashing import merkle_from_chunks
+
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+
+def output_commitment(data: bytes, merkle_chunk_size: int = 0) -> bytes:
+    """The hash `submit` commits for `data`: flat keccak256, or the Merkle root for a chunk size."""
+    if not merkle_chunk_size:
+        return keccak(data)
+    chunks = (data[i:i + merkle_chunk_size] for i in range(0, len(data), merkle_chunk_size))
+    return merkle_from_chunks(chunks, merkle_chunk_size, workers=1)["root"]
+
+
+def _keyword_pattern(keywords: list):
+    if not keywords:
+        return None
+    # Longest first so the alternation prefers the most specific keyword
+    ordered = sorted(set(keywords), key=len, reverse=True)
+    return re.compile("|".join(re.escape(k) for k in ordered))
+
+
+class RuleSet:
+    """
+    Compiled evaluation conditions.
+
+    Supports the SKILL.md conditions `min_length`, `max_length` (in UTF-8
+    bytes), `must_contain` and `must_not_contain`. Keyword lists are compiled into a
+    single regex each, so an output is scanned once per list no matter how
+    many keywords it has. Matching is case-insensitive unless
+    `case_sensitive` is set.
+    """
+
+    def __init__(self, conditions: dict = None):
+        conditions = conditions or {}
+        self.conditions = conditions
+        self.min_length = int(conditions.get("min_length") or 0)
+        self.max_length = int(conditions.get("max_length") or 0)
+        self.case_sensitive = bool(conditions.get("case_sensitive", False))
+
+        fold = (lambda k: k) if self.case_sensitive else str.lower
+        self.must_contain = [fold(k) for k in conditions.get("must_contain") or []]
+        self.must_not_contain = [fold(k) for k in conditions.get("must_not_contain") or []]
+        self._contain_re = _keyword_pattern(self.must_contain)
+        self._forbid_re = _keyword_pattern(self.must_not_contain)
+
+    def check(self, output: str, task: dict = None) -> dict:
+        """
+        Evaluate one output.
+
+        With `task` (a formatted task dict) the output must also match the
+        task's `output_hash` commitment and its own length bounds, if it has
+        any. A Merkle commitment (the task's ref has an `output_chunk_size`)
+        is recomputed with that chunk size. JudgePayLite keeps no output hash
+        on-chain, so the commitment is only known where the submission was
+        linked in the blob store; without it the result has `verified`
+        False, and such a verdict must not be applied.
+        """
+        failures = []
+        data = output.encode()
+        # In UTF-8 bytes, like the task bounds and the committed length
+        length = len(data)
+
+        if self.min_length and length < self.min_length:
+            failures.append(f"min_length: {length} < {self.min_length}")
+        if self.max_length and length > self.max_length:
+            failures.append(f"max_length: {length} > {self.max_length}")
+
+        if self._contain_re or self._forbid_re:
+            text = output if self.case_sensitive else output.lower()
+            if self._contain_re:
+                found = set(self._contain_re.findall(text))
+                # Keywords nested inside a longer match are checked directly
+                missing = [k for k in self.must_contain if k not in found and k not in text]
+                if missing:
+                    failures.append(f"must_contain: missing {missing}")
+            if self._forbid_re:
+                forbidden = sorted(set(self._forbid_re.findall(text)))
+                if forbidden:
+                    failures.append(f"must_not_contain: found {forbidden}")
+
+        output_hash = output_commitment(data, (task or {}).get("output_chunk_size") or 0).hex()
+        verified = False
+        if task is not None:
+            committed = task.get("output_hash")
+            verified = bool(committed) and output_hash == committed.removeprefix("0x")
+            if committed and not verified:
+                failures.append("output_hash: does not match the submitted commitment")
+            if task.get("min_length") and length < task["min_length"]:
+                failures.append(f"task min_length: {length} < {task['min_length']}")
+            if task.get("max_length") and length > task["max_length"]:
+                failures.append(f"task max_length: {length} > {task['max_length']}")
+
+        return {
+            "passed": not failures,
+            "verified": verified,
+            "failures": failures,
+            "output_length": length,
+            "output_hash": output_hash,
+        }
+
+
+# Per-process rule set, compiled once by the pool initializer
+_worker_rules = None
+
+
+def _init_worker(conditions: dict):
+    global _worker_rules
+    _worker_rules = RuleSet(conditions)
+
+
+def _check_in_worker(item: tuple) -> dict:
+    output, task = item
+    return _worker_rules.check(output, task)
+
+
+class BatchEvaluator:
+    """
+    Score many submissions against one rule set.
+
+    Each worker process compiles the rule set once at start-up and then only
+    receives (output, task) pairs. Results come back in input order. With
+    `workers=1` everything runs in-process.
+    """
+
+    def __init__(self, conditions: dict = None, workers: int = DEFAULT_WORKERS):
+        self.conditions = conditions or {}
+        self.rules = RuleSet(self.conditions)
+        self.workers = max(workers, 1)
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def evaluate(self, items: list) -> list:
+        """Evaluate a list of (output, task-or-None) pairs."""
+        if self.workers == 1 or len(items) < 2:
+            return [self.rules.check(output, task) for output, task in items]
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.conditions,)
+            )
+        chunksize = max(len(items) // (self.workers * 4), 1)
+        return list(self._pool.map(_check_in_worker, items, chunksize=chunksize))
+
+
+def read_submissions(path: str):
+    """
+    Yield (line number, task ID, output) from a submissions JSONL file.
+
+    Each line holds `task_id` plus either `output` (text) or `output_file`
+    (a path read as UTF-8). Unreadable lines yield an exception in place of
+    the output.
+    """
+    with open(path) as f:
+        for n, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+                if "output_file" in row:
+                    with open(row["output_file"], encoding="utf-8") as out:
+                        output = out.read()
+                else:
+                    output = row["output"]
+                yield n, int(row["task_id"]), output
+            except (ValueError, KeyError, OSError) as exc:
+                yield n, None, exc
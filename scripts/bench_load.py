@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+JudgePay - Load harness
+Deploy JudgePayLite and MockUSDC to a local anvil node, then drive concurrent
+create -> submit -> approve lifecycles through JudgePayClient. Prints
+throughput and per-phase latency percentiles as one JSON object.
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from eth_hash.auto import keccak
+
+from abi_registry import ARTIFACTS_DIR, artifact_path
+from allowance import AllowanceLedger
+from judgepay import JudgePayClient
+from task_events import task_id_from_receipt
+
+OPERATIONS = ("create", "submit", "approve")
+PHASES = ("sign", "send", "inclusion")
+PERCENTILES = (50, 95, 99)
+
+FUNDING_WEI = 10_000 * 10 ** 18
+TASK_AMOUNT_USDC = 1.0
+NODE_START_TIMEOUT = 15.0
+
+
+def percentile(ordered: list, q: float) -> float:
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    return ordered[max(math.ceil(q / 100 * len(ordered)), 1) - 1]
+
+
+def summarize(samples: list) -> dict:
+    ordered = sorted(samples)
+    summary = {"count": len(ordered)}
+    if ordered:
+        for q in PERCENTILES:
+            summary[f"p{q}_ms"] = round(percentile(ordered, q) * 1000, 2)
+        summary["max_ms"] = round(ordered[-1] * 1000, 2)
+    return summary
+
+
+def load_key(role: str, index: int) -> str:
+    """Deterministic throwaway key for a harness account."""
+    return "0x" + keccak(f"judgepay-load/{role}/{index}".encode()).hex()
+
+
+class PhaseRecorder:
+    """Latency samples per (operation, phase), safe to feed from many threads."""
+
+    def __init__(self):
+        self.samples = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def operation(self) -> str:
+        """Operation the calling thread is currently timing."""
+        return getattr(self._local, "operation", "setup")
+
+    @operation.setter
+    def operation(self, name: str):
+        self._local.operation = name
+
+    def add(self, phase: str, seconds: float, operation: str = None):
+        with self._lock:
+            self.samples.setdefault((operation or self.operation, phase), []).append(seconds)
+
+    def report(self) -> dict:
+        return {
+            op: {phase: summarize(self.samples.get((op, phase), [])) for phase in PHASES}
+            for op in OPERATIONS
+        }
+
+
+class TimedClient(JudgePayClient):
+    """JudgePayClient that records how long each signature and broadcast takes."""
+
+    def __init__(self, recorder: PhaseRecorder, **kwargs):
+        super().__init__(**kwargs)
+        self.recorder = recorder
+
+    def _sign(self, account, tx: dict) -> bytes:
+        start = time.perf_counter()
+        raw = super()._sign(account, tx)
+        self.recorder.add("sign", time.perf_counter() - start)
+        return raw
+
+    def _broadcast(self, raw: bytes):
+        start = time.perf_counter()
+        tx_hash = super()._broadcast(raw)
+        self.recorder.add("send", time.perf_counter() - start)
+        return tx_hash
+
+    def included(self, tx_hash) -> dict:
+        """Wait for `tx_hash`, recording the wait as the inclusion phase."""
+        start = time.perf_counter()
+        receipt = self.receipts.wait(tx_hash)
+        self.recorder.add("inclusion", time.perf_counter() - start)
+        if receipt["status"] != 1:
+            raise RuntimeError(f"{self.recorder.operation} reverted: {receipt['transactionHash'].hex()}")
+        return receipt
+
+
+# --- Local node ---
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_anvil(binary: str, block_time: float):
+    """Start anvil on a free port; returns (process, rpc_url) once it answers."""
+    path = shutil.which(binary)
+    if path is None:
+        raise SystemExit(f"{binary} not found; install foundry or pass --rpc")
+    port = free_port()
+    argv = [path, "--port", str(port), "--silent"]
+    if block_time:
+        argv += ["--block-time", str(block_time)]
+    process = subprocess.Popen(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    rpc_url = f"http://127.0.0.1:{port}"
+
+    import requests
+    deadline = time.monotonic() + NODE_START_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            requests.post(rpc_url, json={"jsonrpc": "2.0", "id": 1, "method": "eth_chainId", "params": []}, timeout=1)
+            return process, rpc_url
+        except requests.ConnectionError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.1)
+    process.terminate()
+    raise SystemExit("anvil did not start")
+
+
+def deploy(client: TimedClient, account, name: str, types: list = (), args: list = (), artifacts_dir: str = ARTIFACTS_DIR) -> str:
+    """Deploy contract `name` from its forge artifact; returns the new address."""
+    from eth_abi import encode
+    try:
+        with open(artifact_path(name, artifacts_dir)) as f:
+            bytecode = json.load(f)["bytecode"]["object"]
+    except FileNotFoundError:
+        raise SystemExit(f"No artifact for {name} in {artifacts_dir}; run `forge build` first")
+
+    data = bytes.fromhex(bytecode.removeprefix("0x")) + (encode(list(types), list(args)) if types else b"")
+    template = {
+        "from": account.address,
+        "data": "0x" + data.hex(),
+        "value": 0,
+        "gas": 5_000_000,
+        "chainId": client.chain_id,
+        **client.fees.fees(client.speed),
+    }
+    tx_hash = client.nonces.send(account.address, lambda nonce: client._broadcast(client._sign(account, dict(template, nonce=nonce))))
+    return client.included(tx_hash)["contractAddress"]
+
+
+def setup(client: TimedClient, pairs: int, tasks: int, artifacts_dir: str) -> list:
+    """Deploy the contracts and fund `pairs` requester/worker accounts; returns their keys."""
+    deployer_key = load_key("deployer", 0)
+    keys = [(load_key("requester", i), load_key("worker", i)) for i in range(pairs)]
+    for key in [deployer_key, *(k for pair in keys for k in pair)]:
+        client.rpc("anvil_setBalance", [client.account(key).address, hex(FUNDING_WEI)])
+
+    deployer = client.account(deployer_key)
+    client.usdc_address = deploy(client, deployer, "MockUSDC", artifacts_dir=artifacts_dir)
+    client.contract_address = deploy(client, deployer, "JudgePayLite", ["address"], [client.usdc_address], artifacts_dir)
+
+    # Every requester gets enough USDC, and a standing allowance, for its share of the run
+    budget = TASK_AMOUNT_USDC * math.ceil(tasks / pairs)
+    budget_raw = int(budget * 10 ** client.decimals)
+    minted = [
+        client._send(client.usdc_address, client.usdc.encode("mint", client.account(requester).address, budget_raw), deployer, 100000)
+        for requester, _ in keys
+    ]
+    for tx_hash in minted:
+        client.included(tx_hash)
+    with ThreadPoolExecutor(max_workers=min(pairs, 32)) as pool:
+        for result in pool.map(lambda pair: client.preapprove(budget, private_key=pair[0]), keys):
+            if not result.get("success"):
+                raise SystemExit(f"preapprove failed: {result}")
+    return keys
+
+
+def lifecycle(client: TimedClient, requester_key: str, worker_key: str, index: int) -> float:
+    """One create -> submit -> approve loop; returns its wall time."""
+    recorder = client.recorder
+    start = time.perf_counter()
+
+    recorder.operation = "create"
+    created = client.create_task(f"load task {index}", TASK_AMOUNT_USDC, private_key=requester_key, wait=False)
+    if not created.get("success"):
+        raise RuntimeError(f"create failed: {created}")
+    task_id = task_id_from_receipt(client.included(created["tx_hash"]), client.contract_address)
+
+    recorder.operation = "submit"
+    submitted = client.submit_work(task_id, f"load output {index}", private_key=worker_key, wait=False)
+    client.included(submitted["tx_hash"])
+
+    recorder.operation = "approve"
+    approved = client.evaluate_task(task_id, True, private_key=requester_key, wait=False)
+    client.included(approved["tx_hash"])
+
+    return time.perf_counter() - start
+
+
+def run(client: TimedClient, keys: list, tasks: int) -> dict:
+    durations, errors = [], []
+    lock = threading.Lock()
+
+    def one(index):
+        requester_key, worker_key = keys[index % len(keys)]
+        try:
+            elapsed = lifecycle(client, requester_key, worker_key, index)
+        except Exception as exc:
+            with lock:
+                errors.append(f"task {index}: {exc}")
+            return
+        with lock:
+            durations.append(elapsed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(keys)) as pool:
+        list(pool.map(one, range(tasks)))
+    wall = time.perf_counter() - start
+
+    return {
+        "completed": len(durations),
+        "failed": len(errors),
+        "errors": errors[:10],
+        "wall_s": round(wall, 3),
+        "tasks_per_sec": round(len(durations) / wall, 2) if wall else None,
+        "lifecycle": summarize(durations),
+        "phases": client.recorder.report(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=200, help="Lifecycles to run")
+    parser.add_argument("--concurrency", type=int, default=20, help="Requester/worker pairs driving lifecycles in parallel")
+    parser.add_argument("--rpc", help="Use this anvil node instead of starting one")
+    parser.add_argument("--anvil", default="anvil", help="anvil binary")
+    parser.add_argument("--block-time", type=float, default=2.0, help="Seconds per block for the started node (0 = mine every tx)")
+    parser.add_argument("--poll-interval", type=float, default=0.05, help="Receipt poll interval")
+    parser.add_argument("--artifacts", default=ARTIFACTS_DIR, help="forge out/ directory")
+    args = parser.parse_args()
+
+    process, rpc_url = (None, args.rpc) if args.rpc else start_anvil(args.anvil, args.block_time)
+    workdir = tempfile.mkdtemp(prefix="judgepay-load-")
+    recorder = PhaseRecorder()
+    client = TimedClient(
+        recorder,
+        rpc_url=rpc_url,
+        pool_size=max(args.concurrency, 16),
+        confirmations=1,
+        blob_dir="",
+        poll_interval=args.poll_interval,
+    )
+    client._ledger = AllowanceLedger(os.path.join(workdir, "allowance.json"))
+    try:
+        keys = setup(client, args.concurrency, args.tasks, args.artifacts)
+        result = run(client, keys, args.tasks)
+    finally:
+        client.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    print(json.dumps({
+        "rpc": rpc_url if args.rpc else "anvil",
+        "block_time_s": None if args.rpc else args.block_time,
+        "tasks": args.tasks,
+        "concurrency": args.concurrency,
+        "contract": client.contract_address,
+        **result,
+    }, indent=2))
+    sys.exit(1 if result["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
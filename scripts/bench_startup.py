@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+JudgePay - CLI start-up benchmark
+Time short-lived judgepay.py invocations in fresh interpreters so import-time
+regressions show up. Prints one JSON object; exits 1 if a budget is exceeded.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "judgepay.py")
+
+# name -> argv after the interpreter. None of these touch the network: the
+# contract address is cleared so `get` stops right after building the client.
+COMMANDS = {
+    "import": ["-c", "import judgepay"],
+    "help": [SCRIPT, "--help"],
+    "get": [SCRIPT, "get", "0"],
+    "tasks": [SCRIPT, "tasks", "--db", os.devnull, "--limit", "1"],
+}
+
+# Modules that must not be imported by the commands above
+HEAVY_MODULES = ("web3", "eth_account")
+
+
+def run_once(argv: list, env: dict) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *argv], env=env, cwd=os.path.dirname(SCRIPT),
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+    return (time.perf_counter() - start) * 1000
+
+
+def heavy_imports(argv: list, env: dict) -> list:
+    """Heavy modules imported by one invocation, from `python -X importtime`."""
+    result = subprocess.run([sys.executable, "-X", "importtime", *argv], env=env, cwd=os.path.dirname(SCRIPT),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=False)
+    imported = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines() if "|" in line}
+    return sorted(m for m in HEAVY_MODULES if m in imported)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Invocations per command")
+    parser.add_argument("--max-ms", type=float, help="Fail if any command's median exceeds this")
+    parser.add_argument("commands", nargs="*", help=f"Commands to time (default: all of {', '.join(COMMANDS)})")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.commands if name not in COMMANDS]
+    if unknown:
+        parser.error(f"unknown command(s) {unknown}; choose from {list(COMMANDS)}")
+
+    env = dict(os.environ, JUDGEPAY_CONTRACT="")
+    results = {}
+    failed = False
+    for name in args.commands or COMMANDS:
+        argv = COMMANDS[name]
+        run_once(argv, env)  # warm the OS page cache and bytecode
+        samples = sorted(run_once(argv, env) for _ in range(args.runs))
+        heavy = heavy_imports(argv, env)
+        median = statistics.median(samples)
+        results[name] = {
+            "median_ms": round(median, 1),
+            "min_ms": round(samples[0], 1),
+            "max_ms": round(samples[-1], 1),
+            "heavy_imports": heavy,
+        }
+        if heavy or (args.max_ms and median > args.max_ms):
+            failed = True
+
+    print(json.dumps({"python": sys.version.split()[0], "runs": args.runs, "commands": results}, indent=2))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,545 @@
+#!/usr/bin/env python3
+"""
+JudgePay - Content-addressed blob store
+Keep the preimages of on-chain description and output hashes so evaluators
+can fetch what was actually submitted, locally or from another agent.
+"""
+
+import json
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from eth_hash.auto import keccak
+
+from hashing import DEFAULT_CHUNK_SIZE, iter_chunks, merkle_from_chunks
+
+DEFAULT_BLOB_DIR = os.getenv("JUDGEPAY_BLOB_DIR", "judgepay_blobs")
+DEFAULT_MAX_BYTES = int(os.getenv("JUDGEPAY_BLOB_MAX_BYTES", str(1 << 30)))
+DEFAULT_PEERS = [url for url in os.getenv("JUDGEPAY_BLOB_PEERS", "").split(",") if url]
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8546
+PEER_TIMEOUT = 30
+# Largest blob get_text will inline into a task dict
+INLINE_LIMIT = 1 << 20
+COMPRESS_LEVEL = 6
+# Data whose first chunk doesn't shrink below this ratio is stored raw
+MIN_COMPRESSION_RATIO = 0.9
+
+RAW, COMPRESSED, ALIAS = "", ".z", ".ref"
+# Per-task hash references, kept beside (not among) the blobs
+REFS_DIR = "refs"
+
+
+def blob_key(blob_hash) -> str:
+    """Normalise a 32-byte hash (bytes or hex, with or without 0x) to lowercase hex."""
+    key = blob_hash.hex() if isinstance(blob_hash, (bytes, bytearray)) else str(blob_hash)
+    key = key.lower().removeprefix("0x")
+    if len(key) != 64 or any(c not in "0123456789abcdef" for c in key):
+        raise ValueError(f"Not a 32-byte hash: {blob_hash!r}")
+    return key
+
+
+def _mapped_read(path: str) -> bytes:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return mapped[:]
+
+
+def _read_bounded(path: str, kind: str, limit: int):
+    """A stored file's content, or None if it holds more than `limit` bytes; never inflates past that."""
+    if kind != COMPRESSED:
+        return None if os.path.getsize(path) > limit else _mapped_read(path)
+    inflater = zlib.decompressobj()
+    out = bytearray()
+    for piece in iter_chunks(path, DEFAULT_CHUNK_SIZE):
+        out += inflater.decompress(piece, limit + 1 - len(out))
+        if len(out) > limit:
+            return None
+    out += inflater.flush()
+    return None if len(out) > limit else bytes(out)
+
+
+def _inflate(path: str, chunk_size: int):
+    """Yield the decompressed contents of a zlib file in exact `chunk_size` pieces."""
+    inflater = zlib.decompressobj()
+    pending = bytearray()
+    for piece in iter_chunks(path, chunk_size):
+        pending += inflater.decompress(piece)
+        while len(pending) >= chunk_size:
+            yield bytes(pending[:chunk_size])
+            del pending[:chunk_size]
+    pending += inflater.flush()
+    while pending:
+        yield bytes(pending[:chunk_size])
+        del pending[:chunk_size]
+
+
+class BlobStore:
+    """
+    Blobs keyed by the keccak256 hashes committed on-chain.
+
+    Each blob lives under `root` as `<aa>/<hash>.z` (zlib) or `<aa>/<hash>`
+    when the data doesn't compress. Writing content that is already stored
+    only refreshes it, so identical outputs are kept once. Reads go through
+    mmap. Once the store grows past `max_bytes` the least recently used
+    blobs are evicted; file mtimes record recency, so the order survives
+    restarts. Merkle roots from `submit --file --merkle` are kept as small
+    aliases to the flat blob, and `refs/` maps task IDs to the hashes of
+    their description and output. Misses are fetched from `peers`, other
+    agents running `judgepay serve-blobs`, and verified before being kept.
+    """
+
+    def __init__(self, root: str = DEFAULT_BLOB_DIR, max_bytes: int = DEFAULT_MAX_BYTES, peers: list = None):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.peers = [url.rstrip("/") for url in (DEFAULT_PEERS if peers is None else peers)]
+        self._lock = threading.Lock()
+        self._lru = None
+        self._size = 0
+
+    # --- Index ---
+
+    def _index(self) -> OrderedDict:
+        """key -> (path, size), oldest first. Built from disk on first use."""
+        if self._lru is None:
+            entries = []
+            for dirpath, dirnames, names in os.walk(self.root):
+                if dirpath == self.root and REFS_DIR in dirnames:
+                    dirnames.remove(REFS_DIR)
+                for name in names:
+                    if name.startswith("."):
+                        continue
+                    path = os.path.join(dirpath, name)
+                    st = os.stat(path)
+                    entries.append((st.st_mtime, name.split(".")[0], path, st.st_size))
+            entries.sort()
+            self._lru = OrderedDict((key, (path, size)) for _, key, path, size in entries)
+            self._size = sum(size for _, size in self._lru.values())
+        return self._lru
+
+    def _touch(self, key: str):
+        path, _ = self._index()[key]
+        self._lru.move_to_end(key)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _add(self, key: str, path: str):
+        size = os.path.getsize(path)
+        index = self._index()
+        index[key] = (path, size)
+        index.move_to_end(key)
+        self._size += size
+        self._evict(keep=key)
+
+    def _evict(self, keep: str):
+        while self._size > self.max_bytes and len(self._lru) > 1:
+            key, (path, size) = next(iter(self._lru.items()))
+            if key == keep:
+                self._lru.move_to_end(key)
+                continue
+            del self._lru[key]
+            self._size -= size
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _lookup(self, key: str):
+        """(path, kind) of a stored blob, refreshing its LRU position; None if absent."""
+        with self._lock:
+            entry = self._index().get(key)
+            if entry is None:
+                return None
+            path = entry[0]
+            if not os.path.exists(path):
+                del self._lru[key]
+                self._size -= entry[1]
+                return None
+            self._touch(key)
+        kind = COMPRESSED if path.endswith(COMPRESSED) else ALIAS if path.endswith(ALIAS) else RAW
+        return path, kind
+
+    def _resolve(self, key: str):
+        """Follow an alias to (path, kind, flat key, merkle chunk size or None)."""
+        found = self._lookup(key)
+        if found is None:
+            return None
+        path, kind = found
+        if kind != ALIAS:
+            return path, kind, key, None
+        with open(path) as f:
+            target, chunk_size = f.read().split()
+        found = self._lookup(target)
+        if found is None:
+            return None
+        return found[0], found[1], target, int(chunk_size)
+
+    def __contains__(self, blob_hash) -> bool:
+        return self._resolve(blob_key(blob_hash)) is not None
+
+    def stats(self) -> dict:
+        with self._lock:
+            index = self._index()
+            return {"root": self.root, "blobs": len(index), "bytes": self._size, "max_bytes": self.max_bytes}
+
+    # --- Writes ---
+
+    def _ingest(self, chunks) -> tuple:
+        """
+        Stream chunks into a temp file inside the store.
+
+        Returns (digest, length, temp path, kind). Compression is decided
+        from the first chunk so incompressible data costs one trial only.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".ingest-")
+        preimage = keccak.new(b"")
+        length = 0
+        compressor = None
+        kind = RAW
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for chunk in chunks:
+                    if length == 0 and chunk:
+                        if len(zlib.compress(chunk, 1)) < len(chunk) * MIN_COMPRESSION_RATIO:
+                            compressor = zlib.compressobj(COMPRESS_LEVEL)
+                            kind = COMPRESSED
+                    preimage.update(chunk)
+                    length += len(chunk)
+                    out.write(compressor.compress(chunk) if compressor else chunk)
+                if compressor:
+                    out.write(compressor.flush())
+        except BaseException:
+            os.remove(tmp)
+            raise
+        return preimage.digest(), length, tmp, kind
+
+    def _place(self, key: str, tmp: str, kind: str):
+        """Move an ingested temp file into place, or drop it if the blob already exists."""
+        with self._lock:
+            entry = self._index().get(key)
+            if entry is not None and os.path.exists(entry[0]):
+                os.remove(tmp)
+                self._touch(key)
+                return
+            directory = os.path.join(self.root, key[:2])
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, key + kind)
+            os.replace(tmp, path)
+            self._add(key, path)
+
+    def put(self, data: bytes) -> bytes:
+        """Store `data`; returns its keccak256, the key it is stored under."""
+        key = keccak(data)
+        if self._lookup(key.hex()) is None:
+            digest, _, tmp, kind = self._ingest([data])
+            self._place(digest.hex(), tmp, kind)
+        return key
+
+    def put_text(self, text: str) -> bytes:
+        """Store UTF-8 text; the key equals Web3.keccak(text=text)."""
+        return self.put(text.encode())
+
+    def put_file(self, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> tuple:
+        """Stream a file (or stdin for "-") into the store; returns (digest, byte length)."""
+        digest, length, tmp, kind = self._ingest(iter_chunks(path, chunk_size))
+        self._place(digest.hex(), tmp, kind)
+        return digest, length
+
+    def alias(self, alias_hash, blob_hash, chunk_size: int):
+        """Make a Merkle root resolve to the flat blob it was computed over."""
+        key, target = blob_key(alias_hash), blob_key(blob_hash)
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".ingest-")
+        with os.fdopen(fd, "w") as f:
+            f.write(f"{target} {chunk_size}\n")
+        self._place(key, tmp, ALIAS)
+
+    def ingest_verified(self, blob_hash, chunks, merkle_chunk_size: int = None) -> bool:
+        """
+        Store untrusted content claimed to hash to `blob_hash`.
+
+        The content is kept only if its keccak256 matches, or, when
+        `merkle_chunk_size` is given, if its Merkle root does. The chunk
+        size must come from our own records (a task ref or the submit
+        result), never from whoever sent the content. Nothing is placed in
+        the store until verification passed.
+        """
+        key = blob_key(blob_hash)
+        digest, _, tmp, kind = self._ingest(chunks)
+        try:
+            if digest.hex() == key:
+                self._place(key, tmp, kind)
+                return True
+            if not merkle_chunk_size:
+                return False
+            pieces = _inflate(tmp, merkle_chunk_size) if kind == COMPRESSED else iter_chunks(tmp, merkle_chunk_size)
+            if merkle_from_chunks(pieces, merkle_chunk_size)["root"].hex() != key:
+                return False
+            self._place(digest.hex(), tmp, kind)
+            self.alias(key, digest, merkle_chunk_size)
+            return True
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    # --- Reads ---
+
+    def get(self, blob_hash, merkle_chunk_size: int = None) -> bytes:
+        """
+        Content for a hash, fetched from peers on a local miss; None if unavailable.
+
+        Pass `merkle_chunk_size` when `blob_hash` is a Merkle root, so a
+        fetched copy can be verified against it.
+        """
+        found = self._find(blob_hash, merkle_chunk_size)
+        if found is None:
+            return None
+        path, kind, _, _ = found
+        data = _mapped_read(path)
+        return zlib.decompress(data) if kind == COMPRESSED else data
+
+    def _find(self, blob_hash, merkle_chunk_size: int = None):
+        """_resolve, fetching from peers on a local miss."""
+        key = blob_key(blob_hash)
+        found = self._resolve(key)
+        if found is None and self.fetch(key, merkle_chunk_size):
+            found = self._resolve(key)
+        return found
+
+    def get_text(self, blob_hash, limit: int = INLINE_LIMIT, merkle_chunk_size: int = None) -> str:
+        """
+        UTF-8 content for a hash; None if unavailable, binary or over `limit` bytes.
+
+        The size is checked before anything is read: raw blobs by their file
+        size, compressed ones by inflating at most `limit` + 1 bytes.
+        """
+        found = self._find(blob_hash, merkle_chunk_size)
+        if found is None:
+            return None
+        path, kind, _, _ = found
+        data = _read_bounded(path, kind, limit)
+        if data is None:
+            return None
+        try:
+            return data.decode()
+        except UnicodeDecodeError:
+            return None
+
+    def iter_chunks(self, blob_hash, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """Yield a stored blob's content in `chunk_size` pieces without loading it whole."""
+        found = self._resolve(blob_key(blob_hash))
+        if found is None:
+            raise KeyError(blob_key(blob_hash))
+        path, kind, _, _ = found
+        if kind == COMPRESSED:
+            return _inflate(path, chunk_size)
+        return iter_chunks(path, chunk_size)
+
+    # --- Task references ---
+
+    def _ref_path(self, contract_address: str, task_id: int) -> str:
+        return os.path.join(self.root, REFS_DIR, contract_address.lower(), f"{task_id}.json")
+
+    def set_ref(self, contract_address: str, task_id: int, **hashes):
+        """
+        Record blob hashes for a task, e.g. description_hash=... / output_hash=...
+
+        JudgePayLite keeps no content hashes on-chain, so these references
+        are how a task read back from the chain finds its text again.
+        Integer values (output_chunk_size) are stored as they are.
+        """
+        refs = self.refs(contract_address, task_id)
+        refs.update({field: value if isinstance(value, int) else blob_key(value) for field, value in hashes.items()})
+        path = self._ref_path(contract_address, task_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".ref-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(refs, f)
+        os.replace(tmp, path)
+
+    def refs(self, contract_address: str, task_id: int) -> dict:
+        """Hashes recorded for a task with set_ref; {} if none."""
+        try:
+            with open(self._ref_path(contract_address, task_id)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    # --- Peers ---
+
+    def fetch(self, blob_hash, merkle_chunk_size: int = None) -> bool:
+        """
+        Try each peer for a missing blob; True once one verified copy is stored.
+
+        Without `merkle_chunk_size` only content whose flat keccak256 is
+        `blob_hash` is accepted.
+        """
+        key = blob_key(blob_hash)
+        if not self.peers:
+            return False
+        import requests
+        for url in self.peers:
+            try:
+                with requests.get(f"{url}/blobs/{key}", stream=True, timeout=PEER_TIMEOUT) as response:
+                    if response.status_code != 200:
+                        continue
+                    chunks = response.iter_content(DEFAULT_CHUNK_SIZE)
+                    if self.ingest_verified(key, chunks, merkle_chunk_size):
+                        return True
+            except requests.RequestException:
+                continue
+        return False
+
+    def push(self, url: str, blob_hash) -> bool:
+        """
+        Send a blob to a peer unless it already has it.
+
+        The stored bytes go as-is (zlib blobs as `Content-Encoding: deflate`).
+        A Merkle root is pushed as the flat blob it aliases, since peers only
+        accept uploads they can check against the hash in the URL.
+        Returns True if content was uploaded.
+        """
+        import requests
+        found = self._resolve(blob_key(blob_hash))
+        if found is None:
+            raise KeyError(blob_key(blob_hash))
+        path, kind, key, _ = found
+        url = f"{url.rstrip('/')}/blobs/{key}"
+        if requests.head(url, timeout=PEER_TIMEOUT).status_code == 200:
+            return False
+        headers = {"Content-Length": str(os.path.getsize(path))}
+        if kind == COMPRESSED:
+            headers["Content-Encoding"] = "deflate"
+        with open(path, "rb") as f:
+            response = requests.put(url, data=f, headers=headers, timeout=PEER_TIMEOUT)
+        response.raise_for_status()
+        return True
+
+
+def resolve_content(store: BlobStore, task: dict) -> dict:
+    """Add `description` / `output` text to a formatted task for hashes found in `store`."""
+    for field in ("description", "output"):
+        blob_hash = task.get(f"{field}_hash")
+        if blob_hash and int(blob_hash, 16):
+            chunk_size = task.get("output_chunk_size") if field == "output" else None
+            text = store.get_text(blob_hash, merkle_chunk_size=chunk_size or None)
+            if text is not None:
+                task[field] = text
+    return task
+
+
+# --- HTTP serving ---
+
+def _read_body(rfile, length: int, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    while length > 0:
+        chunk = rfile.read(min(chunk_size, length))
+        if not chunk:
+            return
+        length -= len(chunk)
+        yield chunk
+
+
+def _deflated(chunks):
+    inflater = zlib.decompressobj()
+    for chunk in chunks:
+        yield inflater.decompress(chunk)
+    yield inflater.flush()
+
+
+class BlobRequestHandler(BaseHTTPRequestHandler):
+    """
+    GET/HEAD/PUT /blobs/<hash>.
+
+    Compressed blobs are sent without re-encoding to clients that accept
+    deflate. Uploads are kept only if their keccak256 is the hash in the
+    URL; anything else is rejected and deleted.
+    """
+
+    store = None
+    server_version = "JudgePayBlobs/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _key(self):
+        prefix, _, name = self.path.partition("/blobs/")
+        try:
+            return blob_key(name) if prefix == "" else None
+        except ValueError:
+            return None
+
+    def _respond(self, status: int, length: int = 0, headers: dict = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(length))
+        self.end_headers()
+
+    def _send_blob(self, body: bool):
+        key = self._key()
+        found = self.store._resolve(key) if key else None
+        if found is None:
+            self._respond(404)
+            return
+        path, kind, _, _ = found
+        headers = {"Content-Type": "application/octet-stream"}
+
+        if kind == COMPRESSED and "deflate" not in self.headers.get("Accept-Encoding", ""):
+            # Length unknown until inflated: stream and close the connection
+            self.send_response(200)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            if body:
+                for chunk in _inflate(path, DEFAULT_CHUNK_SIZE):
+                    self.wfile.write(chunk)
+            return
+
+        if kind == COMPRESSED:
+            headers["Content-Encoding"] = "deflate"
+        self._respond(200, os.path.getsize(path), headers)
+        if body:
+            with open(path, "rb") as f:
+                shutil.copyfileobj(f, self.wfile, DEFAULT_CHUNK_SIZE)
+
+    def do_HEAD(self):
+        self._send_blob(body=False)
+
+    def do_GET(self):
+        self._send_blob(body=True)
+
+    def do_PUT(self):
+        key = self._key()
+        if key is None:
+            self._respond(404)
+            return
+        if self.store._resolve(key) is not None:
+            self._respond(200)
+            return
+        chunks = _read_body(self.rfile, int(self.headers.get("Content-Length", 0)))
+        if self.headers.get("Content-Encoding") == "deflate":
+            chunks = _deflated(chunks)
+        try:
+            ok = self.store.ingest_verified(key, chunks)
+        except (ValueError, zlib.error):
+            ok = False
+        self._respond(201 if ok else 422)
+
+
+def serve(store: BlobStore, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """Create (but don't start) an HTTP server sharing `store` with other agents."""
+    handler = type("Handler", (BlobRequestHandler,), {"store": store})
+    return ThreadingHTTPServer((host, port), handler)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+JudgePay - Bulk transaction signing
+Sign many prepared transactions across worker processes, for pipelined
+broadcast or an offline hand-off file.
+"""
+
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from eth_hash.auto import keccak
+
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+# Below this many transactions the pool start-up costs more than it saves
+MIN_PARALLEL = 64
+
+
+# Per-process signing account, derived once by the pool initializer
+_worker_account = None
+
+
+def _load_account(private_key: str):
+    from eth_account import Account
+    return Account.from_key(private_key)
+
+
+def _init_worker(private_key: str):
+    global _worker_account
+    _worker_account = _load_account(private_key)
+
+
+def _sign_in_worker(tx: dict) -> bytes:
+    return bytes(_worker_account.sign_transaction(tx).raw_transaction)
+
+
+def tx_hash(raw: bytes) -> bytes:
+    """Hash of a signed transaction, as returned by send_raw_transaction."""
+    return keccak(raw)
+
+
+class BulkSigner:
+    """
+    Sign batches of transactions for one key.
+
+    Transactions are complete unsigned dicts: nonce, gas, fees and chainId
+    must already be set (nonces typically reserved from a NonceManager).
+    Each worker process derives the account once and then only receives
+    transaction dicts; signatures come back in input order. With
+    `workers=1`, or for small batches, everything runs in-process.
+    """
+
+    def __init__(self, private_key: str, workers: int = DEFAULT_WORKERS):
+        self.private_key = private_key
+        self.workers = max(workers, 1)
+        self.account = _load_account(private_key)
+        self._pool = None
+
+    @property
+    def address(self) -> str:
+        return self.account.address
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def sign(self, txs: list) -> list:
+        """Raw signed payloads for `txs`, in the same order."""
+        missing = [i for i, tx in enumerate(txs) if "nonce" not in tx]
+        if missing:
+            raise ValueError(f"Transactions without a nonce at positions {missing[:10]}")
+        if self.workers == 1 or len(txs) < MIN_PARALLEL:
+            return [bytes(self.account.sign_transaction(tx).raw_transaction) for tx in txs]
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.private_key,)
+            )
+        chunksize = max(len(txs) // (self.workers * 4), 1)
+        return list(self._pool.map(_sign_in_worker, txs, chunksize=chunksize))
+
+
+def write_signed(out, rows):
+    """
+    Write signed transactions as JSONL to an open text file.
+
+    Rows with a `raw` payload (bytes) get its `tx_hash` added; bytes values
+    are hex-encoded. Any other fields (nonce, line, errors, ...) are kept
+    for the side that broadcasts.
+    """
+    for row in rows:
+        if "raw" in row:
+            row = dict(row, tx_hash=tx_hash(row["raw"]))
+        out.write(json.dumps({k: "0x" + v.hex() if isinstance(v, bytes) else v for k, v in row.items()}) + "\n")
+
+
+def read_signed(path: str):
+    """Yield rows from a write_signed file ("-" for stdin), with `raw` as bytes when present."""
+    f = sys.stdin if path == "-" else open(path)
+    try:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            if "raw" in row:
+                row["raw"] = bytes.fromhex(row["raw"].removeprefix("0x"))
+            yield row
+    finally:
+        if f is not sys.stdin:
+            f.close()
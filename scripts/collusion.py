@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+JudgePay - Collusion analytics
+Rank suspected juror rings from indexed L3_Voted / DisputeResolved history,
+using sparse juror x task vote matrices instead of per-pair loops.
+Needs numpy and scipy; reads the store written by `judgepay.py index`.
+"""
+
+import argparse
+import json
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from abi_cache import checksum_address
+from indexer import DEFAULT_DB, TaskStore
+
+# A pair needs this many shared juries before its agreement rate means much;
+# matches the contract's COLLUSION_THRESHOLD.
+MIN_SHARED = 5
+MIN_AGREEMENT = 0.9
+
+
+class VoteMatrix:
+    """
+    Juror x task view of the indexed votes.
+
+    `approve` and `reject` are 0/1 CSR matrices with one row per juror and
+    one column per disputed task. `verdict` holds +1 where the worker won,
+    -1 where the requester won and 0 while the dispute is unresolved.
+    """
+
+    def __init__(self, jurors: list, tasks: list, approve, reject, power, verdict):
+        self.jurors = jurors
+        self.tasks = tasks
+        self.approve = approve
+        self.reject = reject
+        self.power = power
+        self.verdict = verdict
+
+    @property
+    def votes(self):
+        return self.approve + self.reject
+
+    @property
+    def lost(self):
+        """Votes on the losing side of a resolved dispute."""
+        worker_won = sparse.diags((self.verdict > 0).astype(np.int64), dtype=np.int64)
+        requester_won = sparse.diags((self.verdict < 0).astype(np.int64), dtype=np.int64)
+        return (self.reject @ worker_won + self.approve @ requester_won).tocsr()
+
+
+def load_votes(store: TaskStore, address: str = None) -> VoteMatrix:
+    """Build the vote matrices from a TaskStore, optionally for one escrow contract."""
+    scope, params = "", ()
+    if address:
+        scope, params = " AND address = ?", (checksum_address(address),)
+    rows = store.conn.execute(
+        f"SELECT address, task_id, juror, approve, voting_power FROM votes WHERE 1{scope}", params
+    ).fetchall()
+
+    task_keys = sorted({(r["address"], r["task_id"]) for r in rows})
+    task_index = {key: i for i, key in enumerate(task_keys)}
+    jurors = sorted({r["juror"] for r in rows})
+    juror_index = {juror: i for i, juror in enumerate(jurors)}
+
+    row = np.fromiter((juror_index[r["juror"]] for r in rows), dtype=np.int64, count=len(rows))
+    col = np.fromiter((task_index[(r["address"], r["task_id"])] for r in rows), dtype=np.int64, count=len(rows))
+    approved = np.fromiter((r["approve"] for r in rows), dtype=bool, count=len(rows))
+    power = np.fromiter((r["voting_power"] for r in rows), dtype=np.float64, count=len(rows))
+
+    shape = (len(jurors), len(task_keys))
+
+    def indicator(mask):
+        return sparse.csr_matrix((np.ones(mask.sum(), dtype=np.int64), (row[mask], col[mask])), shape=shape)
+
+    verdict = np.zeros(len(task_keys), dtype=np.int64)
+    resolved = store.conn.execute(
+        f"SELECT address, task_id, args FROM events WHERE event = 'DisputeResolved'{scope}", params
+    )
+    for r in resolved:
+        i = task_index.get((r["address"], r["task_id"]))
+        if i is not None:
+            verdict[i] = 1 if json.loads(r["args"])["workerWins"] else -1
+
+    return VoteMatrix(
+        jurors,
+        task_keys,
+        indicator(approved),
+        indicator(~approved),
+        sparse.csr_matrix((power, (row, col)), shape=shape),
+        verdict,
+    )
+
+
+def _at(matrix, rows, cols):
+    """Entries of a sparse matrix at (rows[i], cols[i]) as a flat array."""
+    if not len(rows):
+        return np.zeros(0, dtype=matrix.dtype)
+    return np.asarray(matrix[rows, cols]).ravel()
+
+
+def pair_stats(matrix: VoteMatrix) -> dict:
+    """
+    Per-pair counts for every pair of jurors that sat on a jury together.
+
+    Returns parallel arrays `a`, `b` (juror indexes, a < b), `shared`,
+    `agree` and `lost_together`, plus the overall agreement rate `base`.
+    Everything comes from three sparse Gram matrices, so cost follows the
+    number of co-serving pairs, not jurors squared.
+    """
+    votes = matrix.votes
+    shared = sparse.triu(votes @ votes.T, k=1).tocsr()
+    agree = sparse.triu(matrix.approve @ matrix.approve.T + matrix.reject @ matrix.reject.T, k=1).tocsr()
+    lost = matrix.lost
+    lost_together = sparse.triu(lost @ lost.T, k=1).tocsr()
+
+    coo = shared.tocoo()
+    a, b = coo.row, coo.col
+    agree_counts = _at(agree, a, b)
+    total_shared = coo.data.sum()
+    return {
+        "a": a,
+        "b": b,
+        "shared": coo.data,
+        "agree": agree_counts,
+        "lost_together": _at(lost_together, a, b),
+        "base": agree_counts.sum() / total_shared if total_shared else 0.0,
+    }
+
+
+def agreement_z(agree, shared, base: float):
+    """How far each pair's agreement count sits above the base rate, in binomial standard deviations."""
+    base = min(max(base, 1e-6), 1 - 1e-6)
+    return (agree - base * shared) / np.sqrt(shared * base * (1 - base))
+
+
+def find_rings(
+    matrix: VoteMatrix,
+    min_shared: int = MIN_SHARED,
+    min_agreement: float = MIN_AGREEMENT,
+    top: int = 20,
+) -> dict:
+    """
+    Ranked suspicion report.
+
+    Pairs that shared at least `min_shared` juries and agreed on at least
+    `min_agreement` of them become edges. Connected components of that
+    graph are candidate rings. Each ring is scored by the summed z-scores
+    of its edges times its density, so tight groups with lopsided
+    agreement rank first. Losing together in resolved disputes is reported
+    alongside, since honest jurors rarely share many wrong calls.
+    """
+    stats = pair_stats(matrix)
+    shared = stats["shared"]
+    rate = np.divide(stats["agree"], shared, out=np.zeros(len(shared)), where=shared > 0)
+    z = agreement_z(stats["agree"], shared, stats["base"])
+
+    edge = (shared >= min_shared) & (rate >= min_agreement)
+    a, b = stats["a"][edge], stats["b"][edge]
+    n = len(matrix.jurors)
+    graph = sparse.csr_matrix((np.ones(len(a)), (a, b)), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+
+    # Ring statistics, aggregated per component label without a Python loop over edges
+    edge_label = labels[a]
+    edge_count = np.bincount(edge_label, minlength=n)
+    size = np.bincount(labels[np.unique(np.concatenate([a, b]))], minlength=n)
+    z_sum = np.bincount(edge_label, weights=z[edge], minlength=n)
+    rate_sum = np.bincount(edge_label, weights=rate[edge], minlength=n)
+    lost_sum = np.bincount(edge_label, weights=stats["lost_together"][edge], minlength=n)
+    possible = size * (size - 1) / 2
+    density = np.divide(edge_count, possible, out=np.zeros(n), where=possible > 0)
+    suspicion = z_sum * density
+
+    votes_cast = np.asarray(matrix.votes.sum(axis=1)).ravel()
+    power = np.asarray(matrix.power.sum(axis=1)).ravel()
+
+    rings = []
+    candidates = np.flatnonzero(size >= 2)
+    for label in candidates[np.argsort(-suspicion[candidates])][:top]:
+        members = np.flatnonzero(labels == label)
+        rings.append({
+            "jurors": [matrix.jurors[i] for i in members],
+            "size": int(size[label]),
+            "edges": int(edge_count[label]),
+            "density": round(float(density[label]), 3),
+            "mean_agreement": round(float(rate_sum[label] / edge_count[label]), 3),
+            "lost_together": int(lost_sum[label]),
+            "votes": int(votes_cast[members].sum()),
+            "voting_power": int(power[members].sum()),
+            "suspicion": round(float(suspicion[label]), 2),
+        })
+
+    order = np.argsort(-z[edge])[:top]
+    pairs = [
+        {
+            "jurors": [matrix.jurors[a[i]], matrix.jurors[b[i]]],
+            "shared": int(shared[edge][i]),
+            "agreement": round(float(rate[edge][i]), 3),
+            "lost_together": int(stats["lost_together"][edge][i]),
+            "z": round(float(z[edge][i]), 2),
+        }
+        for i in order
+    ]
+
+    return {
+        "jurors": n,
+        "tasks": len(matrix.tasks),
+        "resolved": int(np.count_nonzero(matrix.verdict)),
+        "pairs": len(shared),
+        "base_agreement": round(float(stats["base"]), 3),
+        "flagged_pairs": int(edge.sum()),
+        "rings": rings,
+        "top_pairs": pairs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default=DEFAULT_DB, help="SQLite database written by 'judgepay.py index'")
+    parser.add_argument("--escrow", help="Only this JudgePayEscrow address")
+    parser.add_argument("--min-shared", type=int, default=MIN_SHARED, help="Shared juries before a pair is judged")
+    parser.add_argument("--min-agreement", type=float, default=MIN_AGREEMENT, help="Agreement rate that links a pair")
+    parser.add_argument("--top", type=int, default=20, help="Rings and pairs to report")
+    args = parser.parse_args()
+
+    store = TaskStore(args.db)
+    try:
+        report = find_rings(load_votes(store, args.escrow), args.min_shared, args.min_agreement, args.top)
+    finally:
+        store.close()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
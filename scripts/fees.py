@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+JudgePay - Fee and gas strategy
+EIP-1559 fee suggestions from a cached eth_feeHistory sample, and gas limits
+learned per contract function from estimate_gas.
+"""
+
+import os
+import threading
+import time
+
+FEE_HISTORY_BLOCKS = 10
+FEE_TTL_SECONDS = 4.0
+GAS_MARGIN = 1.25
+MIN_PRIORITY_FEE = 1
+
+DEFAULT_SPEED = os.getenv("JUDGEPAY_FEE_SPEED", "standard")
+
+# speed -> (reward percentile for the tip, multiplier on the next base fee)
+SPEED_TIERS = {
+    "slow": (10, 1.25),
+    "standard": (50, 2.0),
+    "fast": (90, 3.0),
+}
+
+
+class FeeOracle:
+    """
+    EIP-1559 fee suggestions for Base.
+
+    One `eth_feeHistory` sample covering the configured tier percentiles is
+    cached for `ttl` seconds and shared by every transaction built in that
+    window, instead of one gas-price lookup per transaction. Async callers
+    feed samples themselves through `update()`.
+    """
+
+    def __init__(self, w3=None, ttl: float = FEE_TTL_SECONDS, tiers: dict = None, blocks: int = FEE_HISTORY_BLOCKS):
+        self.w3 = w3
+        self.ttl = ttl
+        self.tiers = tiers or SPEED_TIERS
+        self.blocks = blocks
+        self._lock = threading.Lock()
+        self._base_fee = None
+        self._rewards = {}
+        self._fetched_at = 0.0
+
+    @property
+    def percentiles(self) -> list:
+        return sorted({percentile for percentile, _ in self.tiers.values()})
+
+    def is_fresh(self) -> bool:
+        return self._base_fee is not None and time.monotonic() - self._fetched_at < self.ttl
+
+    def update(self, history):
+        """Load an eth_feeHistory result requested with `self.percentiles`."""
+        # The last baseFeePerGas entry is the base fee of the next block
+        base_fee = history["baseFeePerGas"][-1]
+        rewards = {}
+        for column, percentile in enumerate(self.percentiles):
+            samples = sorted(block[column] for block in history.get("reward") or [] if len(block) > column)
+            rewards[percentile] = samples[len(samples) // 2] if samples else 0
+        with self._lock:
+            self._base_fee = base_fee
+            self._rewards = rewards
+            self._fetched_at = time.monotonic()
+
+    def refresh(self):
+        """Fetch a new fee history sample from the chain."""
+        self.update(self.w3.eth.fee_history(self.blocks, "latest", self.percentiles))
+
+    def fees(self, speed: str = DEFAULT_SPEED) -> dict:
+        """Return maxFeePerGas / maxPriorityFeePerGas for a speed tier."""
+        if speed not in self.tiers:
+            raise ValueError(f"Unknown speed '{speed}'. Choose from: {', '.join(self.tiers)}")
+        if not self.is_fresh():
+            self.refresh()
+
+        percentile, multiplier = self.tiers[speed]
+        with self._lock:
+            priority = max(self._rewards.get(percentile, 0), MIN_PRIORITY_FEE)
+            max_fee = int(self._base_fee * multiplier) + priority
+        return {"maxFeePerGas": max_fee, "maxPriorityFeePerGas": priority}
+
+
+class GasEstimator:
+    """
+    Gas limits learned per (contract, function selector).
+
+    The first transaction to a function pays for one `estimate_gas`; later
+    ones reuse the highest estimate seen, padded by `margin`. When estimation
+    fails (e.g. the call depends on a transaction that is still pending) a
+    caller-supplied fallback limit is used instead.
+
+    Functions that take an array (approveMany, createTasks, ...) cost
+    whatever their batch size makes them cost, so a limit learned from one
+    batch says little about the next. Callers pass the batch size as
+    `items`. Those calls are estimated every time, and the highest padded
+    cost per item seen so far is kept as a floor, scaled to the batch.
+    That floor covers an estimate that ran while most items would be
+    skipped, and a failed estimate.
+    """
+
+    def __init__(self, w3=None, margin: float = GAS_MARGIN):
+        self.w3 = w3
+        self.margin = margin
+        self._lock = threading.Lock()
+        self._limits = {}
+        self._per_item = {}
+
+    @staticmethod
+    def key(tx: dict) -> tuple:
+        data = tx.get("data") or "0x"
+        if isinstance(data, bytes):
+            data = "0x" + data.hex()
+        return (str(tx.get("to", "")).lower(), data[:10])
+
+    def lookup(self, tx: dict, items: int = None):
+        """
+        Return the learned limit for this transaction's function, or None.
+
+        With `items`, the learned per-item cost scaled to that many items.
+        """
+        key = self.key(tx)
+        with self._lock:
+            if items is None:
+                return self._limits.get(key)
+            per_item = self._per_item.get(key)
+        return per_item * items if per_item else None
+
+    def learn(self, tx: dict, estimate: int, items: int = None) -> int:
+        """Record an estimate_gas result and return the padded limit."""
+        limit = int(estimate * self.margin)
+        key = self.key(tx)
+        with self._lock:
+            if items:
+                per_item = max(-(-limit // items), self._per_item.get(key, 0))
+                self._per_item[key] = per_item
+                return max(limit, per_item * items)
+            limit = max(limit, self._limits.get(key, 0))
+            self._limits[key] = limit
+        return limit
+
+    def fallback(self, tx: dict, fallback: int = None, items: int = None):
+        """Limit to use when `tx` cannot be estimated: `fallback`, or the scaled per-item cost if higher."""
+        if not items:
+            return fallback
+        return max(fallback or 0, self.lookup(tx, items) or 0) or None
+
+    def gas_limit(self, tx: dict, fallback: int = None, items: int = None) -> int:
+        """Learned limit for `tx`, estimating it on first use, or every time for `items`-sized batches."""
+        if items is None:
+            limit = self.lookup(tx)
+            if limit is not None:
+                return limit
+        try:
+            estimate = self.w3.eth.estimate_gas({k: v for k, v in tx.items() if k != "gas"})
+        except Exception:
+            limit = self.fallback(tx, fallback, items)
+            if limit is None:
+                raise
+            return limit
+        return self.learn(tx, estimate, items)
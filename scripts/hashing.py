@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+JudgePay - Streaming output commitments
+Hash work outputs of any size without loading them into memory, either as a
+plain keccak256 digest or as a chunked Merkle root.
+"""
+
+import mmap
+import os
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from eth_hash.auto import keccak
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MiB
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+
+def _open_source(path: str):
+    """Return a binary file object for `path` ("-" means stdin)."""
+    return sys.stdin.buffer if path == "-" else open(path, "rb")
+
+
+def _mapped(f):
+    """mmap a regular, non-empty file; None for pipes and empty files."""
+    try:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+
+def iter_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Yield the contents of `path` (or stdin for "-") in `chunk_size` pieces."""
+    f = _open_source(path)
+    try:
+        mapped = _mapped(f)
+        if mapped is not None:
+            with mapped:
+                for offset in range(0, len(mapped), chunk_size):
+                    yield mapped[offset:offset + chunk_size]
+            return
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        if f is not sys.stdin.buffer:
+            f.close()
+
+
+def hash_file(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> tuple:
+    """
+    keccak256 of a file's bytes, computed incrementally.
+
+    Returns (digest, byte length). The digest equals keccak(text=...) for a
+    UTF-8 text file, so it matches what `submit --output` commits.
+    """
+    preimage = keccak.new(b"")
+    length = 0
+    for chunk in iter_chunks(path, chunk_size):
+        preimage.update(chunk)
+        length += len(chunk)
+    return preimage.digest(), length
+
+
+# Domain tags: a leaf can never be read as an inner node, nor either as a root
+LEAF_TAG = b"\x00"
+NODE_TAG = b"\x01"
+ROOT_TAG = b"\x02"
+
+
+def leaf_hash(chunk: bytes) -> bytes:
+    return keccak(LEAF_TAG + chunk)
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return keccak(NODE_TAG + left + right)
+
+
+def bind_root(tree_root: bytes, chunk_size: int, length: int) -> bytes:
+    """The committed root: the tree root bound to the chunk size and byte length it covers."""
+    return keccak(ROOT_TAG + chunk_size.to_bytes(32, "big") + length.to_bytes(32, "big") + tree_root)
+
+
+def leaf_count(length: int, chunk_size: int) -> int:
+    """Leaves in the tree over `length` bytes; empty content still has one (empty) leaf."""
+    return max(-(-length // chunk_size), 1)
+
+
+def _leaf_hashes(chunks, workers: int) -> tuple:
+    """Hash chunks in a thread pool, keeping at most 2 * workers chunks in flight."""
+    leaves, length = [], 0
+    in_flight = deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for chunk in chunks:
+            length += len(chunk)
+            in_flight.append(pool.submit(leaf_hash, chunk))
+            if len(in_flight) >= workers * 2:
+                leaves.append(in_flight.popleft().result())
+        leaves.extend(f.result() for f in in_flight)
+    return leaves, length
+
+
+def merkle_levels(leaves: list) -> list:
+    """All tree levels from the leaves up to the tree root; an odd last node is carried up unchanged."""
+    levels = [leaves or [leaf_hash(b"")]]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+
+def merkle_commitment(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = DEFAULT_WORKERS) -> dict:
+    """
+    Chunked Merkle commitment of a file (or stdin for "-").
+
+    Leaves are keccak256(0x00 || chunk) of each `chunk_size` piece and are
+    hashed in parallel; inner nodes are keccak256(0x01 || left || right).
+    The committed root also binds the chunk size and total length, so the
+    same tree can't be presented with a different chunking. It can be
+    committed on-chain in place of the flat digest, and single chunks can
+    then be checked with `merkle_proof` / `verify_chunk` without
+    downloading the whole output.
+    """
+    return merkle_from_chunks(iter_chunks(path, chunk_size), chunk_size, workers)
+
+
+def merkle_from_chunks(chunks, chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = DEFAULT_WORKERS) -> dict:
+    """Merkle commitment over an iterable of `chunk_size` pieces (see merkle_commitment)."""
+    leaves, length = _leaf_hashes(chunks, workers)
+    levels = merkle_levels(leaves)
+    return {
+        "root": bind_root(levels[-1][0], chunk_size, length),
+        "length": length,
+        "chunk_size": chunk_size,
+        "leaves": leaves,
+    }
+
+
+def merkle_proof(leaves: list, index: int) -> list:
+    """Sibling hashes proving leaf `index`, bottom-up. None marks a carried-up level."""
+    proof = []
+    for level in merkle_levels(leaves)[:-1]:
+        sibling = index ^ 1
+        proof.append(level[sibling] if sibling < len(level) else None)
+        index //= 2
+    return proof
+
+
+def verify_chunk(chunk: bytes, index: int, proof: list, root: bytes, chunk_size: int, length: int) -> bool:
+    """
+    Check one chunk against a committed Merkle root using its proof.
+
+    The tree shape follows from `chunk_size` and `length`, so the chunk's
+    size and the position of every carried-up level are checked too.
+    """
+    width = leaf_count(length, chunk_size)
+    if not 0 <= index < width:
+        return False
+    expected = min(chunk_size, length - index * chunk_size)
+    if len(chunk) != expected:
+        return False
+
+    node = leaf_hash(chunk)
+    for sibling in proof:
+        if width == 1:
+            return False
+        carried = index == width - 1 and width % 2
+        if carried != (sibling is None):
+            return False
+        if sibling is not None:
+            node = node_hash(node, sibling) if index % 2 == 0 else node_hash(sibling, node)
+        index //= 2
+        width = -(-width // 2)
+    return width == 1 and bind_root(node, chunk_size, length) == root
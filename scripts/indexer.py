@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+JudgePay - Event indexer
+Scan JudgePay logs into a local SQLite task store so history and lookups by
+requester, worker or status no longer need RPC scans.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from abi_cache import checksum_address
+from task_events import ALL_TOPICS, decode_log, status_after
+
+DEFAULT_DB = os.getenv("JUDGEPAY_DB", "judgepay_tasks.db")
+DEFAULT_CHUNK_SIZE = 2000
+DEFAULT_WORKERS = 4
+DEFAULT_CONFIRMATIONS = 2
+# How many recent checkpoint hashes are kept for reorg detection
+REORG_DEPTH = 128
+
+# RPC error fragments meaning "ask for a smaller block range"
+RANGE_LIMIT_ERRORS = (
+    "query returned more than",
+    "block range",
+    "range is too large",
+    "limit exceeded",
+    "too many",
+    "response size",
+    "-32005",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    block_hash TEXT NOT NULL,
+    tx_hash TEXT NOT NULL,
+    address TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    event TEXT NOT NULL,
+    task_id INTEGER NOT NULL,
+    args TEXT NOT NULL,
+    PRIMARY KEY (block_number, log_index)
+);
+CREATE INDEX IF NOT EXISTS events_task ON events (address, task_id);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    address TEXT NOT NULL,
+    task_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    requester TEXT,
+    worker TEXT,
+    amount INTEGER,
+    status TEXT NOT NULL,
+    created_block INTEGER,
+    updated_block INTEGER,
+    PRIMARY KEY (address, task_id)
+);
+CREATE INDEX IF NOT EXISTS tasks_requester ON tasks (requester);
+CREATE INDEX IF NOT EXISTS tasks_worker ON tasks (worker);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status);
+
+CREATE TABLE IF NOT EXISTS votes (
+    address TEXT NOT NULL,
+    task_id INTEGER NOT NULL,
+    juror TEXT NOT NULL,
+    approve INTEGER NOT NULL,
+    voting_power INTEGER NOT NULL,
+    block_number INTEGER NOT NULL,
+    PRIMARY KEY (address, task_id, juror)
+);
+CREATE INDEX IF NOT EXISTS votes_juror ON votes (juror);
+
+CREATE TABLE IF NOT EXISTS blocks (
+    block_number INTEGER PRIMARY KEY,
+    block_hash TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def is_range_limit_error(exc: Exception) -> bool:
+    """True if an eth_getLogs error asks for a smaller block range."""
+    message = str(exc).lower()
+    return any(err in message for err in RANGE_LIMIT_ERRORS)
+
+
+class TaskStore:
+    """
+    SQLite store of JudgePay events and the task state derived from them.
+
+    `events` is the source of truth; `tasks` and `votes` are rebuilt from it
+    whenever a reorg rolls events back.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+
+    def close(self):
+        self.conn.close()
+
+    # --- Checkpoints ---
+
+    def checkpoint(self):
+        """Return the last fully indexed block number, or None."""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'checkpoint'").fetchone()
+        return int(row["value"]) if row else None
+
+    def recent_blocks(self) -> list:
+        """Checkpointed (block_number, block_hash) pairs, newest first."""
+        rows = self.conn.execute("SELECT block_number, block_hash FROM blocks ORDER BY block_number DESC")
+        return [(row["block_number"], row["block_hash"]) for row in rows]
+
+    def set_checkpoint(self, block_number: int, block_hash: str):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('checkpoint', ?)", (str(block_number),))
+        self.conn.execute("INSERT OR REPLACE INTO blocks (block_number, block_hash) VALUES (?, ?)", (block_number, block_hash))
+        self.conn.execute(
+            "DELETE FROM blocks WHERE block_number NOT IN "
+            "(SELECT block_number FROM blocks ORDER BY block_number DESC LIMIT ?)",
+            (REORG_DEPTH,)
+        )
+
+    # --- Writes ---
+
+    def add_events(self, events: list):
+        """Record decoded events and apply them to the task state."""
+        for ev in events:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    ev["block_number"], ev["log_index"], ev["block_hash"], ev["tx_hash"],
+                    ev["address"], ev["kind"], ev["event"], ev["task_id"],
+                    json.dumps(ev["args"], default=_json_default),
+                )
+            )
+            if cursor.rowcount:
+                self._apply(ev)
+
+    def _apply(self, ev: dict):
+        """Fold one event into the tasks/votes tables."""
+        key = (ev["address"], ev["task_id"])
+        args = ev["args"]
+        name = ev["event"]
+        block = ev["block_number"]
+        status = status_after(name, args)
+
+        if name == "TaskCreated":
+            self.conn.execute(
+                "INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, NULL, ?, ?, ?, ?)",
+                (*key, ev["kind"], args["requester"], int(args["amount"]), status, block, block)
+            )
+        elif name in ("TaskClaimed", "WorkSubmitted"):
+            self._update(key, block, status=status, worker=args["worker"])
+        elif name == "L3_Voted":
+            self.conn.execute(
+                "INSERT OR REPLACE INTO votes VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, args["juror"], int(args["approve"]), int(args["votingPower"]), block)
+            )
+            self._update(key, block, status=status)
+        else:
+            self._update(key, block, status=status)
+
+    def _update(self, key: tuple, block: int, **fields):
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        self.conn.execute(
+            f"UPDATE tasks SET {columns}, updated_block = ? WHERE address = ? AND task_id = ?",
+            (*fields.values(), block, *key)
+        )
+
+    def rollback(self, block_number: int):
+        """Drop everything above `block_number` and rebuild affected tasks."""
+        affected = self.conn.execute(
+            "SELECT DISTINCT address, task_id FROM events WHERE block_number > ?", (block_number,)
+        ).fetchall()
+
+        self.conn.execute("DELETE FROM events WHERE block_number > ?", (block_number,))
+        self.conn.execute("DELETE FROM blocks WHERE block_number > ?", (block_number,))
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('checkpoint', ?)", (str(block_number),))
+
+        for row in affected:
+            key = (row["address"], row["task_id"])
+            self.conn.execute("DELETE FROM tasks WHERE address = ? AND task_id = ?", key)
+            self.conn.execute("DELETE FROM votes WHERE address = ? AND task_id = ?", key)
+            replay = self.conn.execute(
+                "SELECT * FROM events WHERE address = ? AND task_id = ? ORDER BY block_number, log_index", key
+            ).fetchall()
+            for ev in replay:
+                self._apply({
+                    "address": ev["address"],
+                    "task_id": ev["task_id"],
+                    "kind": ev["kind"],
+                    "event": ev["event"],
+                    "block_number": ev["block_number"],
+                    "args": json.loads(ev["args"]),
+                })
+
+    # --- Queries ---
+
+    def find_tasks(self, requester: str = None, worker: str = None, status: str = None, limit: int = None) -> list:
+        """Look up indexed tasks by requester, worker and/or status."""
+        clauses, params = [], []
+        if requester:
+            clauses.append("requester = ?")
+            params.append(checksum_address(requester))
+        if worker:
+            clauses.append("worker = ?")
+            params.append(checksum_address(worker))
+        if status:
+            clauses.append("status = ? COLLATE NOCASE")
+            params.append(status)
+
+        query = "SELECT * FROM tasks"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY address, task_id"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.conn.execute(query, params)]
+
+    def task_events(self, address: str, task_id: int) -> list:
+        """Full event history of one task, oldest first."""
+        rows = self.conn.execute(
+            "SELECT * FROM events WHERE address = ? AND task_id = ? ORDER BY block_number, log_index",
+            (checksum_address(address), task_id)
+        )
+        return [dict(row, args=json.loads(row["args"])) for row in rows]
+
+
+def _json_default(value):
+    if isinstance(value, bytes):
+        return "0x" + value.hex()
+    raise TypeError(f"Cannot serialise {type(value).__name__}")
+
+
+class Indexer:
+    """
+    Incremental JudgePay log indexer.
+
+    Block ranges are fetched in parallel and applied in order; a range that
+    trips the RPC's log limits is split in half until it fits. Each applied
+    window is checkpointed with its block hash, and on the next sync the
+    stored hashes are compared with the chain to roll back reorged blocks.
+    """
+
+    def __init__(
+        self,
+        w3,
+        store: TaskStore,
+        addresses: list,
+        start_block: int = 0,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        workers: int = DEFAULT_WORKERS,
+        confirmations: int = DEFAULT_CONFIRMATIONS
+    ):
+        self.w3 = w3
+        self.store = store
+        self.addresses = [checksum_address(a) for a in addresses]
+        self.start_block = start_block
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.confirmations = confirmations
+
+    def fetch_logs(self, from_block: int, to_block: int) -> list:
+        """eth_getLogs for one range, splitting it while the RPC refuses."""
+        try:
+            return self.w3.eth.get_logs({
+                "fromBlock": from_block,
+                "toBlock": to_block,
+                "address": self.addresses,
+                "topics": [ALL_TOPICS],
+            })
+        except Exception as exc:
+            if from_block >= to_block or not is_range_limit_error(exc):
+                raise
+            mid = (from_block + to_block) // 2
+            return self.fetch_logs(from_block, mid) + self.fetch_logs(mid + 1, to_block)
+
+    def _block_hash(self, block_number: int) -> str:
+        return "0x" + bytes(self.w3.eth.get_block(block_number)["hash"]).hex()
+
+    def handle_reorg(self):
+        """Roll the store back to the newest checkpoint still on the canonical chain."""
+        for block_number, block_hash in self.store.recent_blocks():
+            if self._block_hash(block_number) == block_hash:
+                if block_number != self.store.checkpoint():
+                    self.store.rollback(block_number)
+                    self.store.conn.commit()
+                return
+        if self.store.checkpoint() is not None:
+            self.store.rollback(self.start_block - 1)
+            self.store.conn.commit()
+
+    def sync(self, to_block: int = None) -> int:
+        """Index from the checkpoint up to `to_block` (default: head minus confirmations)."""
+        self.handle_reorg()
+
+        if to_block is None:
+            to_block = self.w3.eth.block_number - self.confirmations
+        checkpoint = self.store.checkpoint()
+        from_block = self.start_block if checkpoint is None else checkpoint + 1
+        if from_block > to_block:
+            return 0
+
+        ranges = [
+            (lo, min(lo + self.chunk_size - 1, to_block))
+            for lo in range(from_block, to_block + 1, self.chunk_size)
+        ]
+
+        indexed = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for window in range(0, len(ranges), self.workers):
+                batch = ranges[window:window + self.workers]
+                results = pool.map(lambda r: self.fetch_logs(*r), batch)
+                for (_, hi), logs in zip(batch, results):
+                    events = [ev for ev in map(decode_log, logs) if ev is not None]
+                    with self.store.lock:
+                        self.store.add_events(events)
+                        self.store.set_checkpoint(hi, self._block_hash(hi))
+                        self.store.conn.commit()
+                    indexed += len(events)
+        return indexed
@@ -5,360 +5,1104 @@ Create tasks, submit work, and evaluate conditions.
 """
 
 import argparse
+import atexit
 import json
 import os
+import sys
 import hashlib
-from web3 import Web3
-from eth_account import Account
+import threading
+
+from eth_hash.auto import keccak
+
+# web3, eth_account and requests are imported where they are first needed:
+# together they cost over a second, which commands such as --help, `tasks`
+# or `blob` never need to pay.
+from abi_cache import checksum_address
+from abi_registry import contract, load_abi
+from allowance import AllowanceLedger
+from auto_eval import DEFAULT_WORKERS, BatchEvaluator, RuleSet, read_submissions
+from blob_store import DEFAULT_BLOB_DIR, DEFAULT_HOST, DEFAULT_PORT, BlobStore, resolve_content, serve
+from bulk_signer import BulkSigner, read_signed, tx_hash as signed_tx_hash, write_signed
+from fees import DEFAULT_SPEED, SPEED_TIERS, FeeOracle, GasEstimator
+from hashing import DEFAULT_CHUNK_SIZE, hash_file, merkle_commitment, merkle_from_chunks
+from indexer import DEFAULT_DB, Indexer, TaskStore
+from metrics import TRACER, instrumented_session, operation, phase, serve_metrics, write_metrics
+from nonce_manager import NonceManager, is_already_known
+from rpc_router import RpcRouter, endpoints_from_env, parse_endpoints, routed_web3, web3_provider
+from receipts import DEFAULT_CONFIRMATIONS, DEFAULT_POLL_INTERVAL as RECEIPT_POLL_INTERVAL, ReceiptTracker
+from task_batch import read_task_specs
+from task_events import task_id_from_receipt, task_ids_from_receipt
+from task_reader import TaskReader
+from watcher import DEFAULT_POLL_INTERVAL, WS_RPC, TaskWatcher
 
 # Contract addresses (Base Sepolia)
 JUDGEPAY_ADDRESS = os.getenv("JUDGEPAY_CONTRACT", "")
-USDC_ADDRESS = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
-
-# Default RPC
-DEFAULT_RPC = "https://base-sepolia-rpc.publicnode.com"
-
-# Minimal ABIs
-USDC_ABI = [
-    {
-        "inputs": [
-            {"name": "spender", "type": "address"},
-            {"name": "amount", "type": "uint256"}
-        ],
-        "name": "approve",
-        "outputs": [{"name": "", "type": "bool"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [{"name": "account", "type": "address"}],
-        "name": "balanceOf",
-        "outputs": [{"name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "decimals",
-        "outputs": [{"name": "", "type": "uint8"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-]
-
-JUDGEPAY_ABI = [
-    {
-        "inputs": [
-            {"name": "_descriptionHash", "type": "bytes32"},
-            {"name": "_amount", "type": "uint256"},
-            {"name": "_deadlineHours", "type": "uint256"},
-            {"name": "_evaluator", "type": "address"},
-            {"name": "_minLength", "type": "uint256"},
-            {"name": "_maxLength", "type": "uint256"},
-            {"name": "_requiredApprovals", "type": "uint8"}
-        ],
-        "name": "createTask",
-        "outputs": [{"name": "", "type": "uint256"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [{"name": "_taskId", "type": "uint256"}],
-        "name": "claimTask",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"name": "_taskId", "type": "uint256"},
-            {"name": "_outputHash", "type": "bytes32"},
-            {"name": "_outputLength", "type": "uint256"}
-        ],
-        "name": "submitWork",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [
-            {"name": "_taskId", "type": "uint256"},
-            {"name": "_approve", "type": "bool"}
-        ],
-        "name": "evaluate",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [{"name": "_taskId", "type": "uint256"}],
-        "name": "getTask",
-        "outputs": [
-            {
-                "components": [
-                    {"name": "requester", "type": "address"},
-                    {"name": "worker", "type": "address"},
-                    {"name": "evaluator", "type": "address"},
-                    {"name": "amount", "type": "uint256"},
-                    {"name": "createdAt", "type": "uint256"},
-                    {"name": "deadline", "type": "uint256"},
-                    {"name": "descriptionHash", "type": "bytes32"},
-                    {"name": "outputHash", "type": "bytes32"},
-                    {"name": "status", "type": "uint8"},
-                    {"name": "minLength", "type": "uint256"},
-                    {"name": "maxLength", "type": "uint256"},
-                    {"name": "requiredApprovals", "type": "uint8"},
-                    {"name": "currentApprovals", "type": "uint8"}
-                ],
-                "name": "",
-                "type": "tuple"
-            }
-        ],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "taskCount",
-        "outputs": [{"name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-]
+ESCROW_ADDRESS = os.getenv("JUDGEPAY_ESCROW_CONTRACT", "")
+USDC_ADDRESS = os.getenv("JUDGEPAY_USDC", "0x036CbD53842c5426634e7929541eC2318f3dCF7e")
+
+# ABIs come from the foundry artifacts, or the copies in scripts/abi/ (see abi_registry.py)
+USDC_ABI = load_abi("MockUSDC")
+JUDGEPAY_ABI = load_abi("JudgePayLite")
+
+# Batch settlement: command -> (JudgePayLite function, events marking a settled task)
+SETTLE_ACTIONS = {
+    "approve-many": ("approveMany", ("TaskCompleted",)),
+    "reject-many": ("rejectMany", ("TaskRefunded",)),
+    "claim-timeouts": ("claimTimeouts", ("TaskRefunded",)),
+}
+
+# auto-evaluate --apply never pays out or refunds on an output it could not tie to its commitment
+UNVERIFIED = "No output commitment for this task in the blob store; verdict not applied"
 
 # Status mapping
 STATUS_NAMES = {
     0: "Open",
     1: "Submitted",
     2: "Completed",
-    3: "Refunded",
-    4: "Disputed"
+    3: "Refunded"
 }
 
 
 def get_web3():
-    """Get Web3 instance."""
-    rpc_url = os.getenv("USDC_RPC_BASE", DEFAULT_RPC)
-    return Web3(Web3.HTTPProvider(rpc_url))
+    """Get Web3 instance, routed over USDC_RPC_BASE (comma-separated) or the default endpoints."""
+    return routed_web3()
 
 
 def hash_description(description: str) -> bytes:
     """Hash task description."""
-    return Web3.keccak(text=description)
+    return keccak(description.encode())
 
 
 def hash_output(output: str) -> bytes:
     """Hash work output."""
-    return Web3.keccak(text=output)
+    return keccak(output.encode())
+
+
+def explorer_url(tx_hash: str) -> str:
+    """Basescan link for a transaction."""
+    return f"https://sepolia.basescan.org/tx/{tx_hash}"
+
+
+class JudgePayClient:
+    """
+    Long-lived JudgePay client for the JudgePayLite contract.
+
+    Keeps one keep-alive HTTP session for every RPC call and caches the
+    chain facts that never change (chain ID, USDC decimals), so each
+    operation only pays for the calls it really needs. Calldata is encoded
+    with the ABI registry's codecs rather than web3 contract objects; web3
+    itself is only built for signing and sending transactions.
+    """
+
+    def __init__(
+        self,
+        rpc_url: str = None,
+        contract_address: str = None,
+        private_key: str = None,
+        pool_size: int = 16,
+        speed: str = DEFAULT_SPEED,
+        confirmations: int = DEFAULT_CONFIRMATIONS,
+        blob_dir: str = DEFAULT_BLOB_DIR,
+        usdc_address: str = None,
+        poll_interval: float = RECEIPT_POLL_INTERVAL
+    ):
+        self.contract_address = contract_address or JUDGEPAY_ADDRESS
+        self.usdc_address = usdc_address or USDC_ADDRESS
+        self.private_key = private_key or os.getenv("USDC_PRIVATE_KEY")
+        self.blob_dir = blob_dir
+
+        import requests
+        self.session = instrumented_session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # `rpc_url` may list several endpoints, comma-separated or as a list
+        self.router = RpcRouter(parse_endpoints(rpc_url) or endpoints_from_env(), session=self.session, pool_size=pool_size)
+        self.speed = speed
+        self.confirmations = confirmations
+        self.poll_interval = poll_interval
+
+        self._w3 = None
+        self._nonces = None
+        self._fees = None
+        self._gas = None
+        self._receipts = None
+        self._rpc_id = 0
+        self.judgepay = contract("JudgePayLite")
+        self.usdc = contract("MockUSDC")
+        self._chain_id = None
+        self._decimals = None
+        self._reader = None
+        self._accounts = {}
+        self._allowances = {}
+        self._allowance_lock = threading.Lock()
+        self._funding_locks = {}
+        self._ledger = None
+        self._blobs = None
+
+    def close(self):
+        """Stop the receipt poller and release the pooled HTTP connections."""
+        if self._receipts is not None:
+            self._receipts.close()
+        self.router.close()
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Lazily built RPC machinery ---
+
+    @property
+    def rpc_url(self) -> str:
+        """The endpoint currently preferred by the router."""
+        return self.router.url
+
+    @property
+    def w3(self):
+        if self._w3 is None:
+            from web3 import Web3
+            self._w3 = Web3(web3_provider(self.router))
+        return self._w3
+
+    @property
+    def nonces(self) -> NonceManager:
+        if self._nonces is None:
+            self._nonces = NonceManager(self.w3)
+        return self._nonces
+
+    @property
+    def fees(self) -> FeeOracle:
+        if self._fees is None:
+            self._fees = FeeOracle(self.w3)
+        return self._fees
+
+    @property
+    def gas(self) -> GasEstimator:
+        if self._gas is None:
+            self._gas = GasEstimator(self.w3)
+        return self._gas
+
+    @property
+    def receipts(self) -> ReceiptTracker:
+        if self._receipts is None:
+            self._receipts = ReceiptTracker(self.w3, confirmations=self.confirmations, poll_interval=self.poll_interval)
+        return self._receipts
+
+    def rpc(self, method: str, params: list):
+        """Plain JSON-RPC request through the endpoint router, without web3."""
+        self._rpc_id += 1
+        request = {"jsonrpc": "2.0", "id": self._rpc_id, "method": method, "params": params}
+        body = self.router.request(json.dumps(request).encode(), [method])
+        if "error" in body:
+            raise RuntimeError(f"{method} failed: {body['error']}")
+        return body["result"]
+
+    def eth_call(self, data: bytes, to: str = None) -> bytes:
+        """eth_call against the JudgePay contract (or `to`) at the latest block."""
+        result = self.rpc("eth_call", [{"to": to or self.contract_address, "data": "0x" + data.hex()}, "latest"])
+        return bytes.fromhex(result.removeprefix("0x"))
+
+    def _view(self, entry, name: str, *args, to: str = None) -> tuple:
+        """Call view function `name` of registry entry `entry` and decode its outputs."""
+        return entry.decode(name, self.eth_call(entry.encode(name, *args), to))
+
+    # --- Cached chain facts ---
+
+    @property
+    def chain_id(self) -> int:
+        if self._chain_id is None:
+            self._chain_id = int(self.rpc("eth_chainId", []), 16)
+        return self._chain_id
+
+    @property
+    def decimals(self) -> int:
+        if self._decimals is None:
+            self._decimals = self._view(self.usdc, "decimals", to=self.usdc_address)[0]
+        return self._decimals
+
+    @property
+    def reader(self) -> TaskReader:
+        if self._reader is None:
+            self._reader = TaskReader(self)
+        return self._reader
+
+    @property
+    def ledger(self) -> AllowanceLedger:
+        if self._ledger is None:
+            self._ledger = AllowanceLedger()
+        return self._ledger
+
+    @property
+    def blobs(self) -> BlobStore:
+        """Preimage store for committed hashes; None when `blob_dir` is empty."""
+        if self._blobs is None and self.blob_dir:
+            self._blobs = BlobStore(self.blob_dir)
+        return self._blobs
+
+    def _commit_text(self, text: str) -> bytes:
+        """keccak256 of `text`, keeping the preimage in the blob store."""
+        if self.blobs is None:
+            return keccak(text.encode())
+        return self.blobs.put_text(text)
+
+    def _link(self, task_id: int, **hashes):
+        """Record a task's content hashes in the blob store, if there is one."""
+        if self.blobs is not None and task_id is not None:
+            self.blobs.set_ref(self.contract_address, task_id, **hashes)
+
+    def _refs(self, task_id: int) -> dict:
+        """Content hashes recorded for a task by _link ({} without a blob store)."""
+        return self.blobs.refs(self.contract_address, task_id) if self.blobs is not None else {}
+
+    def account(self, private_key: str = None):
+        """Return the (cached) signing account, or None if no key is configured."""
+        pk = private_key or self.private_key
+        if not pk:
+            return None
+        if pk not in self._accounts:
+            from eth_account import Account
+            self._accounts[pk] = Account.from_key(pk)
+        return self._accounts[pk]
+
+    def _check(self, private_key: str = None, need_key: bool = True):
+        """Return an error dict if the client cannot perform an operation."""
+        if need_key and not (private_key or self.private_key):
+            return {"error": "No private key. Set USDC_PRIVATE_KEY."}
+        if not self.contract_address:
+            return {"error": "No contract address. Set JUDGEPAY_CONTRACT."}
+        return None
+
+    def _send(self, to: str, data: bytes, account, fallback_gas: int, items: int = None):
+        """
+        Sign and broadcast a call (`data` to `to`) with a locally reserved nonce.
+
+        Fees come from the cached fee oracle at the client's speed tier and
+        the gas limit from the per-function estimator; `fallback_gas` is only
+        used when the call cannot be estimated yet. Batch calls pass their
+        item count as `items` so their limit follows the batch size.
+        """
+        with phase("build"):
+            template = {
+                'from': account.address,
+                'to': checksum_address(to),
+                'data': '0x' + data.hex(),
+                'value': 0,
+                'gas': fallback_gas,
+                'chainId': self.chain_id,
+                **self.fees.fees(self.speed),
+            }
+            template['gas'] = self.gas.gas_limit(template, fallback_gas, items)
+
+        def send(nonce):
+            return self._broadcast(self._sign(account, dict(template, nonce=nonce)))
+
+        return self.nonces.send(account.address, send)
+
+    def _sign(self, account, tx: dict) -> bytes:
+        """Raw signed payload for a complete transaction dict."""
+        with phase("sign"):
+            return account.sign_transaction(tx).raw_transaction
+
+    def _broadcast(self, raw: bytes):
+        """Send a signed payload; returns its transaction hash."""
+        with phase("send"):
+            try:
+                return self.w3.eth.send_raw_transaction(raw)
+            except Exception as exc:
+                # A node that already has this exact payload has accepted it
+                if not is_already_known(exc):
+                    raise
+                return signed_tx_hash(bytes(raw))
+
+    def _confirm(self, tx_hash) -> dict:
+        """Wait for `tx_hash` to be confirmed; returns its receipt."""
+        with phase("confirm"):
+            return self.receipts.wait(tx_hash)
+
+    # --- Operations ---
+
+    @operation("create_task")
+    def create_task(
+        self,
+        description: str,
+        amount_usdc: float,
+        deadline_hours: int = 24,
+        private_key: str = None,
+        wait: bool = True
+    ) -> dict:
+        """
+        Create a new task with USDC escrow.
+
+        The approve and createTask transactions are sent back-to-back with
+        consecutive nonces, so both can land in the same block. JudgePayLite
+        stores no description on-chain: its hash is returned and, with a blob
+        store, linked to the task ID once that is known.
+        """
+
+        error = self._check(private_key)
+        if error:
+            return error
+
+        account = self.account(private_key)
+        amount_raw = int(amount_usdc * (10 ** self.decimals))
+
+        desc_hash = self._commit_text(description)
+        data = self.judgepay.encode("createTask", amount_raw, deadline_hours)
+        with self._funding_lock(account.address):
+            # Step 1: Approve USDC, unless a standing allowance already covers it
+            approve_hash = self._ensure_allowance(account, amount_raw)
+
+            # Step 2: Create task
+            tx_hash = self._send(self.contract_address, data, account, 300000)
+
+        if not wait:
+            return {
+                "success": True,
+                "pending": True,
+                "description": description,
+                "description_hash": desc_hash.hex(),
+                "amount_usdc": amount_usdc,
+                "deadline_hours": deadline_hours,
+                "approve_tx_hash": approve_hash.hex() if approve_hash else None,
+                "tx_hash": tx_hash.hex(),
+                "explorer": explorer_url(tx_hash.hex())
+            }
+
+        # createTask is nonce-ordered after its approve, so its receipt covers both
+        receipt = self._confirm(tx_hash)
+
+        # Task ID from our own TaskCreated log (taskCount() races other requesters)
+        task_id = task_id_from_receipt(receipt, self.contract_address)
+        self._link(task_id, description_hash=desc_hash)
+
+        return {
+            "success": True,
+            "task_id": task_id,
+            "description": description,
+            "description_hash": desc_hash.hex(),
+            "amount_usdc": amount_usdc,
+            "deadline_hours": deadline_hours,
+            "tx_hash": tx_hash.hex(),
+            "explorer": explorer_url(tx_hash.hex())
+        }
+
+    def _funding_lock(self, owner: str) -> threading.RLock:
+        """
+        Lock held from `_ensure_allowance` until the spending tx is sent.
+
+        approve() overwrites the allowance, so an approve sent by another
+        create between this create's approve (or allowance check) and its
+        spend would leave this spend short. Holding the owner's lock keeps
+        each create's nonces next to each other.
+        """
+        with self._allowance_lock:
+            lock = self._funding_locks.get(owner)
+            if lock is None:
+                lock = self._funding_locks[owner] = threading.RLock()
+            return lock
+
+    def _ensure_allowance(self, account, amount_raw: int):
+        """
+        Make sure the escrow may pull `amount_raw` from `account`.
+
+        The allowance is read from the chain once per sender and then tracked
+        locally, so pipelined creates don't see stale on-chain values. Returns
+        the approve tx hash when one had to be sent, otherwise None. Call it,
+        and send the transaction that spends the allowance, under the owner's
+        `_funding_lock`.
+        """
+        owner = account.address
+        spender = checksum_address(self.contract_address)
+        with self._allowance_lock:
+            allowance = self._allowances.get(owner)
+            if allowance is None:
+                allowance = self._view(self.usdc, "allowance", owner, spender, to=self.usdc_address)[0]
+            if allowance >= amount_raw:
+                self._allowances[owner] = allowance - amount_raw
+                self.ledger.record_spend(owner, spender, amount_raw)
+                return None
+            # approve() overwrites the allowance, and createTask consumes all of it
+            self._allowances[owner] = 0
+
+        return self._send(self.usdc_address, self.usdc.encode("approve", spender, amount_raw), account, 100000)
+
+    @operation("preapprove")
+    def preapprove(self, budget_usdc: float, private_key: str = None) -> dict:
+        """Approve a standing USDC budget so later creates skip their approve tx."""
+
+        error = self._check(private_key)
+        if error:
+            return error
+
+        account = self.account(private_key)
+        owner = account.address
+        spender = checksum_address(self.contract_address)
+        budget_raw = int(budget_usdc * (10 ** self.decimals))
+
+        with self._funding_lock(owner):
+            tx_hash = self._send(self.usdc_address, self.usdc.encode("approve", spender, budget_raw), account, 100000)
+        self._confirm(tx_hash)
+
+        with self._allowance_lock:
+            self._allowances[owner] = budget_raw
+        self.ledger.set_budget(owner, spender, budget_raw, tx_hash.hex())
+
+        return {
+            "success": True,
+            "budget_usdc": budget_usdc,
+            "tx_hash": tx_hash.hex(),
+            "explorer": explorer_url(tx_hash.hex())
+        }
+
+    def allowance_status(self, private_key: str = None) -> dict:
+        """On-chain allowance plus the locally tracked budget and spend."""
+
+        error = self._check(private_key)
+        if error:
+            return error
+
+        owner = self.account(private_key).address
+        spender = checksum_address(self.contract_address)
+        scale = 10 ** self.decimals
+        result = {
+            "owner": owner,
+            "spender": spender,
+            "allowance_usdc": self._view(self.usdc, "allowance", owner, spender, to=self.usdc_address)[0] / scale,
+        }
+        entry = self.ledger.status(owner, spender)
+        if entry:
+            result.update({
+                "budget_usdc": entry["budget"] / scale,
+                "spent_usdc": entry["spent"] / scale,
+                "remaining_usdc": entry["remaining"] / scale,
+            })
+        return result
+
+    def create_tasks(self, specs, private_key: str = None, window: int = 100):
+        """
+        Create many tasks, yielding one result dict per spec in input order.
+
+        `specs` yields (line, spec) pairs as produced by `read_task_specs`.
+        Up to `window` createTask transactions are signed and broadcast
+        back-to-back with local nonces, then their receipts are collected
+        together, so a window fills blocks instead of taking one per task.
+        """
+        error = self._check(private_key)
+        if error:
+            yield error
+            return
+
+        pending = []
+        for line, spec in specs:
+            if isinstance(spec, Exception):
+                pending.append({"line": line, "success": False, "error": str(spec)})
+            else:
+                try:
+                    sent = self.create_task(**spec, private_key=private_key, wait=False)
+                    pending.append(dict(sent, line=line))
+                except Exception as exc:
+                    pending.append({"line": line, "success": False, "error": str(exc), "description": spec["description"]})
+
+            if len(pending) >= window:
+                yield from self._collect_created(pending)
+                pending = []
+
+        yield from self._collect_created(pending)
+
+    def _collect_created(self, pending: list):
+        """Wait for the receipts of sent createTask txs and resolve their task IDs."""
+        # Track the whole window first so one poller resolves it together
+        futures = [
+            self.receipts.track(item["tx_hash"]) if item.get("success") else None
+            for item in pending
+        ]
+        for item, future in zip(pending, futures):
+            if future is None:
+                yield item
+                continue
+            try:
+                receipt = future.result()
+            except Exception as exc:
+                yield {"line": item["line"], "success": False, "error": str(exc), "tx_hash": item["tx_hash"]}
+                continue
+
+            result = {
+                "line": item["line"],
+                "success": receipt["status"] == 1,
+                "task_id": task_id_from_receipt(receipt, self.contract_address),
+                "description": item["description"],
+                "description_hash": item["description_hash"],
+                "amount_usdc": item["amount_usdc"],
+                "tx_hash": item["tx_hash"],
+                "block_number": receipt["blockNumber"],
+            }
+            if receipt["status"] != 1:
+                result["error"] = "createTask reverted"
+            else:
+                self._link(result["task_id"], description_hash=item["description_hash"])
+            yield result
+
+    def create_tasks_packed(self, specs, pack: int = 50, private_key: str = None, window: int = 20):
+        """
+        Create many tasks with JudgePayLite.createTasks, `pack` tasks per transaction.
+
+        Yields one result dict per spec in input order, like create_tasks.
+        Each pack is funded by a single transferFrom of its total; up to
+        `window` packs are broadcast back-to-back before their receipts are
+        collected. Task IDs come from the TaskCreated logs of each pack.
+        """
+        error = self._check(private_key)
+        if error:
+            yield error
+            return
+
+        account = self.account(private_key)
+        pending, group, packed = [], [], 0
+        for line, spec in specs:
+            # Invalid specs stay in their pack so results keep input order
+            group.append((line, spec))
+            if not self._pack_error(spec):
+                packed += 1
+            if packed >= pack:
+                pending.append(self._send_pack(account, group))
+                group, packed = [], 0
+                if len(pending) >= window:
+                    yield from self._collect_packs(pending)
+                    pending = []
+
+        if group:
+            pending.append(self._send_pack(account, group))
+        yield from self._collect_packs(pending)
+
+    @staticmethod
+    def _pack_error(spec):
+        if isinstance(spec, Exception):
+            return str(spec)
+        if spec["amount_usdc"] <= 0:
+            # createTasks would skip it, which would shift the ID mapping
+            return "amount_usdc must be positive"
+        return None
+
+    def _send_pack(self, account, group: list) -> dict:
+        """Send one createTasks transaction for the valid (line, spec) pairs; returns a pending item."""
+        rows, valid = [], []
+        for line, spec in group:
+            error = self._pack_error(spec)
+            if error:
+                rows.append({"line": line, "success": False, "error": error})
+                continue
+            valid.append(spec)
+            rows.append({
+                "line": line,
+                "description": spec["description"],
+                "description_hash": self._commit_text(spec["description"]).hex(),
+                "amount_usdc": spec["amount_usdc"],
+            })
+        if not valid:
+            return {"tasks": rows}
+        try:
+            scale = 10 ** self.decimals
+            amounts = [int(spec["amount_usdc"] * scale) for spec in valid]
+            hours = [spec["deadline_hours"] for spec in valid]
+            data = self.judgepay.encode("createTasks", amounts, hours)
+            with self._funding_lock(account.address):
+                self._ensure_allowance(account, sum(amounts))
+                tx_hash = self._send(self.contract_address, data, account, 100000 + 60000 * len(valid), items=len(valid))
+        except Exception as exc:
+            return {"error": str(exc), "tasks": rows}
+        return {"tx_hash": tx_hash.hex(), "tasks": rows}
+
+    def _collect_packs(self, pending: list):
+        """Resolve sent createTasks packs into one result per task."""
+        futures = [
+            self.receipts.track(item["tx_hash"]) if item.get("tx_hash") else None
+            for item in pending
+        ]
+        for item, future in zip(pending, futures):
+            receipt, error = None, item.get("error")
+            if future is not None:
+                try:
+                    receipt = future.result()
+                except Exception as exc:
+                    error = str(exc)
+            task_ids = []
+            if receipt is not None:
+                if receipt["status"] == 1:
+                    task_ids = task_ids_from_receipt(receipt, self.contract_address)
+                else:
+                    error = "createTasks reverted"
+            task_ids = iter(task_ids)
+
+            for row in item["tasks"]:
+                if "error" in row:
+                    yield row
+                    continue
+                task_id = next(task_ids, None)
+                if task_id is None:
+                    yield dict(row, success=False, error=error or "TaskCreated log missing", tx_hash=item.get("tx_hash"))
+                    continue
+                self._link(task_id, description_hash=row["description_hash"])
+                yield dict(row, success=True, task_id=task_id, tx_hash=item["tx_hash"], block_number=receipt["blockNumber"])
+
+    def settle_many(self, action: str, task_ids: list, chunk: int = 100, private_key: str = None) -> dict:
+        """
+        Approve, reject or reclaim many tasks with JudgePayLite's batch calls.
+
+        `action` is "approve-many", "reject-many" or "claim-timeouts" (see
+        SETTLE_ACTIONS). IDs go `chunk` per transaction; the
+        chunks are sent back-to-back and confirmed together. The contract
+        skips tasks that fail its checks, so the result lists which IDs were
+        settled (from the TaskCompleted / TaskRefunded logs) and which not.
+        """
+        function, events = SETTLE_ACTIONS[action]
+        error = self._check(private_key)
+        if error:
+            return error
+
+        account = self.account(private_key)
+        chunks = [task_ids[i:i + chunk] for i in range(0, len(task_ids), chunk)]
+        sent = []
+        for ids in chunks:
+            data = self.judgepay.encode(function, ids)
+            sent.append(self._send(self.contract_address, data, account, 60000 + 40000 * len(ids), items=len(ids)))
+
+        futures = [self.receipts.track(tx_hash) for tx_hash in sent]
+        settled, transactions = [], []
+        for ids, tx_hash, future in zip(chunks, sent, futures):
+            receipt = future.result()
+            done = task_ids_from_receipt(receipt, self.contract_address, events) if receipt["status"] == 1 else []
+            settled.extend(done)
+            transactions.append({
+                "tx_hash": tx_hash.hex(),
+                "tasks": len(ids),
+                "settled": len(done),
+                "status": receipt["status"],
+                "gas_used": receipt["gasUsed"],
+                "explorer": explorer_url(tx_hash.hex())
+            })
+
+        done = set(settled)
+        return {
+            "success": all(tx["status"] == 1 for tx in transactions),
+            "action": action,
+            "settled": settled,
+            "skipped": [task_id for task_id in task_ids if task_id not in done],
+            "transactions": transactions
+        }
+
+    def sign_create_batch(self, specs, private_key: str = None, workers: int = DEFAULT_WORKERS, window: int = 1000):
+        """
+        Sign createTask transactions for many specs without sending them.
+
+        Yields one row per spec in input order; signed rows carry the raw
+        payload, its nonce and the description hash. Nonces are reserved
+        locally and consecutive, fees are read once per `window`, and the
+        signatures of a window are spread over `workers` processes. Nothing
+        is approved here: tasks are funded from the standing allowance, so
+        run `preapprove` for the batch total first.
+        """
+        error = self._check(private_key)
+        if error:
+            yield error
+            return
+
+        with BulkSigner(private_key or self.private_key, workers) as signer:
+            items = []
+            for item in specs:
+                items.append(item)
+                if len(items) >= window:
+                    yield from self._sign_window(signer, items)
+                    items = []
+            yield from self._sign_window(signer, items)
+
+    def _sign_window(self, signer: BulkSigner, items: list) -> list:
+        if not items:
+            return []
+        scale = 10 ** self.decimals
+        template = {
+            'from': signer.address,
+            'to': checksum_address(self.contract_address),
+            'value': 0,
+            'chainId': self.chain_id,
+            **self.fees.fees(self.speed),
+        }
+        rows, txs = [], []
+        for line, spec in items:
+            if isinstance(spec, Exception):
+                rows.append({"line": line, "success": False, "error": str(spec)})
+                continue
+            data = self.judgepay.encode("createTask", int(spec["amount_usdc"] * scale), spec["deadline_hours"])
+            tx = dict(template, data="0x" + data.hex())
+            tx["gas"] = self.gas.gas_limit(tx, 300000)
+            tx["nonce"] = self.nonces.reserve(signer.address)
+            txs.append(tx)
+            rows.append({
+                "line": line,
+                "success": True,
+                "nonce": tx["nonce"],
+                "description": spec["description"],
+                "description_hash": self._commit_text(spec["description"]).hex(),
+                "amount_usdc": spec["amount_usdc"],
+                "deadline_hours": spec["deadline_hours"],
+            })
+
+        raws = iter(signer.sign(txs))
+        for row in rows:
+            if row["success"]:
+                row["raw"] = next(raws)
+        return rows
+
+    def broadcast(self, rows, window: int = 100):
+        """
+        Send createTask transactions signed by sign_create_batch.
+
+        Payloads are sent back-to-back and their receipts collected a window
+        at a time, as in create_tasks; yields one result per row in order.
+        A payload the node rejects is reported, not re-signed.
+        """
+        pending = []
+        for row in rows:
+            if "raw" not in row:
+                pending.append(row)
+            else:
+                try:
+                    tx_hash = self._broadcast(row["raw"])
+                    sent = {k: v for k, v in row.items() if k != "raw"}
+                    pending.append(dict(sent, tx_hash=tx_hash.hex()))
+                except Exception as exc:
+                    pending.append({"line": row.get("line"), "success": False, "error": str(exc), "nonce": row.get("nonce")})
+
+            if len(pending) >= window:
+                yield from self._collect_created(pending)
+                pending = []
+
+        yield from self._collect_created(pending)
+
+    def get_task(self, task_id: int) -> dict:
+        """Get task details."""
+
+        error = self._check(need_key=False)
+        if error:
+            return error
+
+        row = dict(format_task(task_id, self._view(self.judgepay, "tasks", task_id)), **self._refs(task_id))
+        return resolve_content(self.blobs, row) if self.blobs is not None else row
+
+    def iter_tasks(self, start: int = 0, end: int = None, status: str = None, batch_size: int = None):
+        """
+        Yield formatted tasks with IDs in [start, end), read in bulk.
+
+        `end` defaults to the current taskCount. When `status` is given only
+        tasks in that status (case-insensitive name, e.g. "open") are yielded.
+        """
+        if end is None:
+            end = self._view(self.judgepay, "taskCount")[0]
+        wanted = status.lower() if status else None
+
+        for task_id, task in self.reader.iter_raw(start, end, batch_size):
+            row = format_task(task_id, task)
+            if wanted and row["status"].lower() != wanted:
+                continue
+            yield row
+
+    @operation("submit_work")
+    def submit_work(self, task_id: int, output: str, private_key: str = None, wait: bool = True) -> dict:
+        """Submit work for a task."""
+        # The committed length is the UTF-8 byte length, matching submit_file
+        return self._submit_commitment(task_id, self._commit_text(output), len(output.encode()), 0, private_key, wait)
+
+    @operation("submit_file")
+    def submit_file(
+        self,
+        task_id: int,
+        path: str,
+        merkle: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        private_key: str = None,
+        wait: bool = True
+    ) -> dict:
+        """
+        Submit a file (or stdin for "-") as the work output.
+
+        The file is streamed, never loaded whole. By default the output hash
+        is the plain keccak256 of its bytes; with `merkle` it is the root of a
+        chunked Merkle tree so evaluators can verify single chunks. The
+        content is copied into the blob store on the same pass.
+        """
+        error = self._check(private_key)
+        if error:
+            return error
+
+        if self.blobs is not None:
+            output_hash, output_length = self.blobs.put_file(path, chunk_size)
+            if merkle:
+                commitment = merkle_from_chunks(self.blobs.iter_chunks(output_hash, chunk_size), chunk_size)
+                self.blobs.alias(commitment["root"], output_hash, chunk_size)
+                output_hash = commitment["root"]
+        elif merkle:
+            commitment = merkle_commitment(path, chunk_size)
+            output_hash, output_length = commitment["root"], commitment["length"]
+        else:
+            output_hash, output_length = hash_file(path, chunk_size)
+
+        result = self._submit_commitment(task_id, output_hash, output_length, chunk_size if merkle else 0, private_key, wait)
+        if merkle and result.get("success"):
+            result["commitment"] = {
+                "type": "merkle",
+                "chunk_size": chunk_size,
+                "chunks": len(commitment["leaves"]),
+            }
+        return result
+
+    def _submit_commitment(
+        self,
+        task_id: int,
+        output_hash: bytes,
+        output_length: int,
+        merkle_chunk_size: int,
+        private_key: str,
+        wait: bool
+    ) -> dict:
+        # JudgePayLite's submitWork takes only the task ID; the output hash is
+        # returned to the caller and linked to the task in the blob store,
+        # with the Merkle chunk size (0 for a flat digest) so evaluators can
+        # recompute it the same way.
+        error = self._check(private_key)
+        if error:
+            return error
+
+        account = self.account(private_key)
+        tx_hash = self._send(self.contract_address, self.judgepay.encode("submitWork", task_id), account, 200000)
+        self._link(task_id, output_hash=output_hash, output_chunk_size=merkle_chunk_size)
+        if wait:
+            self._confirm(tx_hash)
+
+        return {
+            "success": True,
+            "pending": not wait,
+            "task_id": task_id,
+            "output_length": output_length,
+            "output_hash": output_hash.hex(),
+            "tx_hash": tx_hash.hex(),
+            "explorer": explorer_url(tx_hash.hex())
+        }
+
+    def auto_evaluate(
+        self,
+        task_id: int,
+        output: str,
+        conditions: dict = None,
+        apply: bool = False,
+        private_key: str = None
+    ) -> dict:
+        """
+        Check an output against `conditions` and the task's output commitment.
+
+        With `apply` the verdict is sent on-chain through evaluate_task, but
+        only once the output has been verified against its commitment.
+        """
+        task = self.get_task(task_id)
+        if "error" in task:
+            return task
+
+        result = dict(RuleSet(conditions).check(output, task), task_id=task_id)
+        if apply:
+            if result["verified"]:
+                result["evaluation"] = self.evaluate_task(task_id, result["passed"], private_key=private_key)
+            else:
+                result["evaluation"] = {"error": UNVERIFIED}
+        return result
+
+    def auto_evaluate_batch(
+        self,
+        submissions,
+        conditions: dict = None,
+        workers: int = DEFAULT_WORKERS,
+        apply: bool = False,
+        window: int = 200,
+        private_key: str = None
+    ):
+        """
+        Score many submissions, yielding one result dict per input in order.
+
+        `submissions` yields (line, task_id, output) as from `read_submissions`.
+        Each window of tasks is read in one Multicall and scored in parallel
+        with a rule set compiled once per worker. With `apply`, verdicts for
+        tasks still in Submitted are sent back-to-back and confirmed together.
+        """
+        error = self._check(private_key, need_key=apply)
+        if error:
+            yield error
+            return
+
+        with BatchEvaluator(conditions, workers) as evaluator:
+            chunk = []
+            for item in submissions:
+                chunk.append(item)
+                if len(chunk) >= window:
+                    yield from self._auto_evaluate_chunk(chunk, evaluator, apply, private_key)
+                    chunk = []
+            yield from self._auto_evaluate_chunk(chunk, evaluator, apply, private_key)
+
+    def _auto_evaluate_chunk(self, chunk: list, evaluator: BatchEvaluator, apply: bool, private_key: str):
+        valid = [(line, task_id, output) for line, task_id, output in chunk if task_id is not None]
+        raw = self.reader.read([task_id for _, task_id, _ in valid])
+        tasks = {
+            line: dict(format_task(task_id, task), **self._refs(task_id))
+            for (line, task_id, _), task in zip(valid, raw)
+            if task is not None
+        }
+        scored = evaluator.evaluate([(output, tasks[line]) for line, _, output in valid if line in tasks])
+        verdicts = dict(zip([line for line, _, _ in valid if line in tasks], scored))
+
+        rows = []
+        for line, task_id, output in chunk:
+            if task_id is None:
+                rows.append({"line": line, "success": False, "error": str(output)})
+            elif line not in tasks:
+                rows.append({"line": line, "task_id": task_id, "success": False, "error": "tasks() call failed"})
+            else:
+                row = dict(verdicts[line], line=line, task_id=task_id, success=True)
+                if apply and tasks[line]["status"] == "Submitted" and not row["verified"]:
+                    row["skipped"] = UNVERIFIED
+                elif apply and tasks[line]["status"] == "Submitted":
+                    sent = self.evaluate_task(task_id, row["passed"], private_key=private_key, wait=False)
+                    row["tx_hash"] = sent.get("tx_hash")
+                rows.append(row)
+
+        futures = [self.receipts.track(row["tx_hash"]) if row.get("tx_hash") else None for row in rows]
+        for row, future in zip(rows, futures):
+            if future is not None:
+                try:
+                    row["applied"] = future.result()["status"] == 1
+                except Exception as exc:
+                    row["applied"] = False
+                    row["error"] = str(exc)
+            yield row
+
+    @operation("evaluate_task")
+    def evaluate_task(self, task_id: int, approve: bool, private_key: str = None, wait: bool = True) -> dict:
+        """Evaluate submitted work: JudgePayLite approve() or reject()."""
+
+        error = self._check(private_key)
+        if error:
+            return error
+
+        account = self.account(private_key)
+
+        data = self.judgepay.encode("approve" if approve else "reject", task_id)
+        tx_hash = self._send(self.contract_address, data, account, 200000)
+        if wait:
+            self._confirm(tx_hash)
+
+        return {
+            "success": True,
+            "pending": not wait,
+            "task_id": task_id,
+            "approved": approve,
+            "result": "USDC released to worker" if approve else "USDC refunded to requester",
+            "tx_hash": tx_hash.hex(),
+            "explorer": explorer_url(tx_hash.hex())
+        }
+
+
+def format_task(task_id: int, task) -> dict:
+    """Convert a raw `tasks(id)` tuple into a JSON-friendly dict."""
+    return {
+        "task_id": task_id,
+        "requester": checksum_address(task[0]),
+        "worker": checksum_address(task[1]),
+        "amount_usdc": task[2] / 1e6,
+        "deadline": task[3],
+        "submit_time": task[4],
+        "status": STATUS_NAMES.get(task[5], "Unknown")
+    }
+
+
+# Shared client for the module-level helpers below
+_client = None
+# Constructor options for the shared client, set by the CLI before first use
+_client_options = {}
+
+
+def get_client() -> JudgePayClient:
+    """Return the process-wide JudgePayClient, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = JudgePayClient(**_client_options)
+    return _client
 
 
 def create_task(
     description: str,
     amount_usdc: float,
     deadline_hours: int = 24,
-    evaluator: str = None,
-    min_length: int = 0,
-    max_length: int = 0,
-    required_approvals: int = 0,
-    private_key: str = None
+    private_key: str = None,
+    wait: bool = True
 ) -> dict:
     """Create a new task with USDC escrow."""
-    
-    w3 = get_web3()
-    pk = private_key or os.getenv("USDC_PRIVATE_KEY")
-    
-    if not pk:
-        return {"error": "No private key. Set USDC_PRIVATE_KEY."}
-    
-    if not JUDGEPAY_ADDRESS:
-        return {"error": "No contract address. Set JUDGEPAY_CONTRACT."}
-    
-    account = Account.from_key(pk)
-    sender = account.address
-    
-    # Contracts
-    usdc = w3.eth.contract(address=Web3.to_checksum_address(USDC_ADDRESS), abi=USDC_ABI)
-    judgepay = w3.eth.contract(address=Web3.to_checksum_address(JUDGEPAY_ADDRESS), abi=JUDGEPAY_ABI)
-    
-    # Convert amount
-    decimals = usdc.functions.decimals().call()
-    amount_raw = int(amount_usdc * (10 ** decimals))
-    
-    # Step 1: Approve USDC
-    nonce = w3.eth.get_transaction_count(sender)
-    approve_tx = usdc.functions.approve(
-        Web3.to_checksum_address(JUDGEPAY_ADDRESS),
-        amount_raw
-    ).build_transaction({
-        'from': sender,
-        'nonce': nonce,
-        'gas': 100000,
-        'gasPrice': w3.eth.gas_price,
-        'chainId': w3.eth.chain_id,
-    })
-    signed = w3.eth.account.sign_transaction(approve_tx, pk)
-    tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
-    w3.eth.wait_for_transaction_receipt(tx_hash)
-    
-    # Step 2: Create task
-    desc_hash = hash_description(description)
-    eval_addr = Web3.to_checksum_address(evaluator) if evaluator else "0x0000000000000000000000000000000000000000"
-    
-    nonce = w3.eth.get_transaction_count(sender)
-    create_tx = judgepay.functions.createTask(
-        desc_hash,
-        amount_raw,
-        deadline_hours,
-        eval_addr,
-        min_length,
-        max_length,
-        required_approvals
-    ).build_transaction({
-        'from': sender,
-        'nonce': nonce,
-        'gas': 300000,
-        'gasPrice': w3.eth.gas_price,
-        'chainId': w3.eth.chain_id,
-    })
-    signed = w3.eth.account.sign_transaction(create_tx, pk)
-    tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
-    receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
-    
-    # Get task ID from events or counter
-    task_count = judgepay.functions.taskCount().call()
-    task_id = task_count - 1
-    
-    return {
-        "success": True,
-        "task_id": task_id,
-        "description": description,
-        "amount_usdc": amount_usdc,
-        "deadline_hours": deadline_hours,
-        "tx_hash": tx_hash.hex(),
-        "explorer": f"https://sepolia.basescan.org/tx/{tx_hash.hex()}"
-    }
+    return get_client().create_task(
+        description,
+        amount_usdc,
+        deadline_hours=deadline_hours,
+        private_key=private_key,
+        wait=wait
+    )
 
 
 def get_task(task_id: int) -> dict:
     """Get task details."""
-    
-    w3 = get_web3()
-    
-    if not JUDGEPAY_ADDRESS:
-        return {"error": "No contract address. Set JUDGEPAY_CONTRACT."}
-    
-    judgepay = w3.eth.contract(address=Web3.to_checksum_address(JUDGEPAY_ADDRESS), abi=JUDGEPAY_ABI)
-    
-    task = judgepay.functions.getTask(task_id).call()
-    
-    return {
-        "task_id": task_id,
-        "requester": task[0],
-        "worker": task[1],
-        "evaluator": task[2],
-        "amount_usdc": task[3] / 1e6,
-        "created_at": task[4],
-        "deadline": task[5],
-        "description_hash": task[6].hex(),
-        "output_hash": task[7].hex(),
-        "status": STATUS_NAMES.get(task[8], "Unknown"),
-        "min_length": task[9],
-        "max_length": task[10],
-        "required_approvals": task[11],
-        "current_approvals": task[12]
-    }
+    return get_client().get_task(task_id)
 
 
-def submit_work(task_id: int, output: str, private_key: str = None) -> dict:
+def submit_work(task_id: int, output: str, private_key: str = None, wait: bool = True) -> dict:
     """Submit work for a task."""
-    
-    w3 = get_web3()
-    pk = private_key or os.getenv("USDC_PRIVATE_KEY")
-    
-    if not pk:
-        return {"error": "No private key. Set USDC_PRIVATE_KEY."}
-    
-    if not JUDGEPAY_ADDRESS:
-        return {"error": "No contract address. Set JUDGEPAY_CONTRACT."}
-    
-    account = Account.from_key(pk)
-    sender = account.address
-    
-    judgepay = w3.eth.contract(address=Web3.to_checksum_address(JUDGEPAY_ADDRESS), abi=JUDGEPAY_ABI)
-    
-    output_hash = hash_output(output)
-    output_length = len(output)
-    
-    nonce = w3.eth.get_transaction_count(sender)
-    tx = judgepay.functions.submitWork(
-        task_id,
-        output_hash,
-        output_length
-    ).build_transaction({
-        'from': sender,
-        'nonce': nonce,
-        'gas': 200000,
-        'gasPrice': w3.eth.gas_price,
-        'chainId': w3.eth.chain_id,
-    })
-    signed = w3.eth.account.sign_transaction(tx, pk)
-    tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
-    receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
-    
-    return {
-        "success": True,
-        "task_id": task_id,
-        "output_length": output_length,
-        "output_hash": output_hash.hex(),
-        "tx_hash": tx_hash.hex(),
-        "explorer": f"https://sepolia.basescan.org/tx/{tx_hash.hex()}"
-    }
+    return get_client().submit_work(task_id, output, private_key=private_key, wait=wait)
 
 
-def evaluate_task(task_id: int, approve: bool, private_key: str = None) -> dict:
+def evaluate_task(task_id: int, approve: bool, private_key: str = None, wait: bool = True) -> dict:
     """Evaluate submitted work."""
-    
-    w3 = get_web3()
-    pk = private_key or os.getenv("USDC_PRIVATE_KEY")
-    
-    if not pk:
-        return {"error": "No private key. Set USDC_PRIVATE_KEY."}
-    
-    if not JUDGEPAY_ADDRESS:
-        return {"error": "No contract address. Set JUDGEPAY_CONTRACT."}
-    
-    account = Account.from_key(pk)
-    sender = account.address
-    
-    judgepay = w3.eth.contract(address=Web3.to_checksum_address(JUDGEPAY_ADDRESS), abi=JUDGEPAY_ABI)
-    
-    nonce = w3.eth.get_transaction_count(sender)
-    tx = judgepay.functions.evaluate(
-        task_id,
-        approve
-    ).build_transaction({
-        'from': sender,
-        'nonce': nonce,
-        'gas': 200000,
-        'gasPrice': w3.eth.gas_price,
-        'chainId': w3.eth.chain_id,
-    })
-    signed = w3.eth.account.sign_transaction(tx, pk)
-    tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
-    receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
-    
-    return {
-        "success": True,
-        "task_id": task_id,
-        "approved": approve,
-        "result": "USDC released to worker" if approve else "USDC refunded to requester",
-        "tx_hash": tx_hash.hex(),
-        "explorer": f"https://sepolia.basescan.org/tx/{tx_hash.hex()}"
-    }
+    return get_client().evaluate_task(task_id, approve, private_key=private_key, wait=wait)
+
+
+def watch(addresses: list, args):
+    """Run `judgepay watch`, printing one JSON line per transition."""
+    watcher = TaskWatcher(addresses, args.task, args.requester, args.worker)
+
+    if (args.requester or args.worker) and os.path.exists(args.db):
+        store = TaskStore(args.db)
+        for requester in args.requester or []:
+            watcher.seed_tasks((t["address"], t["task_id"]) for t in store.find_tasks(requester=requester))
+        for worker in args.worker or []:
+            watcher.seed_tasks((t["address"], t["task_id"]) for t in store.find_tasks(worker=worker))
+        store.close()
+
+    import asyncio
+
+    async def stream():
+        async for transition in watcher.subscribe(args.ws):
+            print(json.dumps(transition), flush=True)
+
+    try:
+        if args.ws:
+            asyncio.run(stream())
+        else:
+            for transition in watcher.poll(get_client().w3, args.interval):
+                print(json.dumps(transition), flush=True)
+    except KeyboardInterrupt:
+        pass
 
 
 def main():
     parser = argparse.ArgumentParser(description="JudgePay CLI")
+    parser.add_argument("--speed", choices=list(SPEED_TIERS), default=DEFAULT_SPEED, help="Fee speed tier")
+    parser.add_argument("--rpc", help="RPC endpoint(s), comma-separated (default: USDC_RPC_BASE or the built-in list)")
+    parser.add_argument("--metrics", metavar="FILE", help="Write RPC and phase metrics (Prometheus text) here on exit")
+    parser.add_argument("--metrics-port", type=int, help="Also serve them on http://127.0.0.1:PORT/metrics while running")
+    parser.add_argument("--profile", metavar="FILE", help="Write a Chrome trace of RPC calls and operation phases here on exit")
     subparsers = parser.add_subparsers(dest="command", help="Commands")
     
     # Create task
@@ -366,18 +1110,111 @@ def main():
     create_parser.add_argument("--description", "-d", required=True, help="Task description")
     create_parser.add_argument("--amount", "-a", required=True, type=float, help="USDC amount")
     create_parser.add_argument("--deadline", type=int, default=24, help="Deadline in hours")
-    create_parser.add_argument("--evaluator", "-e", help="Evaluator address")
-    create_parser.add_argument("--min-length", type=int, default=0, help="Min output length")
-    create_parser.add_argument("--max-length", type=int, default=0, help="Max output length")
     
+    # Create many tasks
+    batch_parser = subparsers.add_parser("create-batch", help="Create tasks from a JSONL or CSV file")
+    batch_parser.add_argument("--input", "-i", required=True, help="Task file (.jsonl or .csv, '-' for JSONL on stdin)")
+    batch_parser.add_argument("--output", "-o", help="Results JSONL file (default: stdout)")
+    batch_parser.add_argument("--window", type=int, default=100, help="Transactions in flight before collecting receipts")
+    batch_parser.add_argument("--pack", type=int, default=1, help="Tasks per createTasks transaction (1 sends one createTask each)")
+
+    # Offline signing
+    sign_parser = subparsers.add_parser("sign-batch", help="Sign createTask transactions from a task file for later broadcast")
+    sign_parser.add_argument("--input", "-i", required=True, help="Task file (.jsonl or .csv, '-' for JSONL on stdin)")
+    sign_parser.add_argument("--output", "-o", help="Signed transactions JSONL file (default: stdout)")
+    sign_parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Signing processes")
+    sign_parser.add_argument("--window", type=int, default=1000, help="Transactions signed per fee quote")
+
+    broadcast_parser = subparsers.add_parser("broadcast", help="Send transactions signed by sign-batch")
+    broadcast_parser.add_argument("--input", "-i", required=True, help="Signed transactions JSONL ('-' for stdin)")
+    broadcast_parser.add_argument("--output", "-o", help="Results JSONL file (default: stdout)")
+    broadcast_parser.add_argument("--window", type=int, default=100, help="Transactions in flight before collecting receipts")
+
+    # Batch settlement
+    for action, (function, _) in SETTLE_ACTIONS.items():
+        settle_parser = subparsers.add_parser(action, help=f"Call {function} for many tasks, skipping ineligible ones")
+        settle_parser.add_argument("task_ids", type=int, nargs="+", help="Task IDs")
+        settle_parser.add_argument("--chunk", type=int, default=100, help="Task IDs per transaction")
+
     # Get task
     get_parser = subparsers.add_parser("get", help="Get task details")
     get_parser.add_argument("task_id", type=int, help="Task ID")
     
+    # List tasks
+    list_parser = subparsers.add_parser("list", help="List a range of tasks (one JSON object per line)")
+    list_parser.add_argument("--from", dest="start", type=int, default=0, help="First task ID")
+    list_parser.add_argument("--to", dest="end", type=int, help="Stop before this task ID (default: taskCount)")
+    list_parser.add_argument("--status", choices=[name.lower() for name in STATUS_NAMES.values()], help="Only show tasks in this status")
+    list_parser.add_argument("--batch-size", type=int, default=200, help="Tasks per RPC round-trip")
+
+    # Index events
+    index_parser = subparsers.add_parser("index", help="Index JudgePay events into a local SQLite store")
+    index_parser.add_argument("--db", default=DEFAULT_DB, help="SQLite database path")
+    index_parser.add_argument("--from-block", type=int, default=0, help="First block to scan on a fresh store")
+    index_parser.add_argument("--escrow", default=ESCROW_ADDRESS, help="JudgePayEscrow address to index as well")
+    index_parser.add_argument("--chunk-size", type=int, default=2000, help="Blocks per eth_getLogs request")
+    index_parser.add_argument("--workers", type=int, default=4, help="Parallel eth_getLogs requests")
+    index_parser.add_argument("--confirmations", type=int, default=2, help="Stay this many blocks behind head")
+
+    # Query the local store
+    tasks_parser = subparsers.add_parser("tasks", help="Query indexed tasks (one JSON object per line)")
+    tasks_parser.add_argument("--db", default=DEFAULT_DB, help="SQLite database path")
+    tasks_parser.add_argument("--requester", help="Requester address")
+    tasks_parser.add_argument("--worker", help="Worker address")
+    tasks_parser.add_argument("--status", help="Task status (e.g. open, submitted, completed)")
+    tasks_parser.add_argument("--limit", type=int, help="Maximum rows")
+
+    # Juror collusion analytics
+    collusion_parser = subparsers.add_parser("collusion", help="Rank suspected juror rings from indexed votes")
+    collusion_parser.add_argument("--db", default=DEFAULT_DB, help="SQLite database path")
+    collusion_parser.add_argument("--escrow", help="Only this JudgePayEscrow address")
+    collusion_parser.add_argument("--min-shared", type=int, default=5, help="Shared juries before a pair is judged")
+    collusion_parser.add_argument("--min-agreement", type=float, default=0.9, help="Agreement rate that links a pair")
+    collusion_parser.add_argument("--top", type=int, default=20, help="Rings and pairs to report")
+
+    # Standing allowance
+    preapprove_parser = subparsers.add_parser("preapprove", help="Approve a standing USDC budget for task creation")
+    preapprove_parser.add_argument("--budget", type=float, help="USDC budget to approve")
+    preapprove_parser.add_argument("--show", action="store_true", help="Show allowance and tracked spend")
+
+    # Auto-evaluate submissions
+    auto_parser = subparsers.add_parser("auto-evaluate", help="Score submissions against task conditions")
+    auto_parser.add_argument("--input", "-i", required=True, help="Submissions JSONL (task_id plus output or output_file)")
+    auto_parser.add_argument("--conditions", "-c", help="JSON file with min_length/max_length/must_contain/must_not_contain")
+    auto_parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Parallel evaluation processes")
+    auto_parser.add_argument("--apply", action="store_true", help="Send approve/reject on-chain for Submitted tasks")
+
+    # Stream status transitions
+    watch_parser = subparsers.add_parser("watch", help="Stream task status transitions as JSON lines")
+    watch_parser.add_argument("--task", type=int, action="append", help="Task ID to watch (repeatable)")
+    watch_parser.add_argument("--requester", action="append", help="Requester address to watch (repeatable)")
+    watch_parser.add_argument("--worker", action="append", help="Worker address to watch (repeatable)")
+    watch_parser.add_argument("--escrow", default=ESCROW_ADDRESS, help="JudgePayEscrow address to watch as well")
+    watch_parser.add_argument("--ws", default=WS_RPC, help="WebSocket RPC URL (uses eth_subscribe)")
+    watch_parser.add_argument("--db", default=DEFAULT_DB, help="Indexer store used to find existing tasks of watched addresses")
+    watch_parser.add_argument("--interval", type=float, default=DEFAULT_POLL_INTERVAL, help="Filter poll interval without --ws")
+
+    # Blob store
+    blob_parser = subparsers.add_parser("blob", help="Fetch the content behind a description or output hash")
+    blob_parser.add_argument("hash", help="Description or output keccak256, or a Merkle root")
+    blob_parser.add_argument("--output", "-o", help="Write the content to this file instead of stdout")
+    blob_parser.add_argument("--push", metavar="URL", help="Send the blob to a peer's serve-blobs endpoint instead")
+    blob_parser.add_argument("--dir", default=DEFAULT_BLOB_DIR, help="Blob store directory")
+    blob_parser.add_argument("--chunk-size", type=int, help="For a Merkle root: the chunk size it was committed with")
+
+    serve_parser = subparsers.add_parser("serve-blobs", help="Share the local blob store over HTTP")
+    serve_parser.add_argument("--host", default=DEFAULT_HOST, help="Address to bind")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to bind")
+    serve_parser.add_argument("--dir", default=DEFAULT_BLOB_DIR, help="Blob store directory")
+
     # Submit work
     submit_parser = subparsers.add_parser("submit", help="Submit work")
     submit_parser.add_argument("task_id", type=int, help="Task ID")
-    submit_parser.add_argument("--output", "-o", required=True, help="Work output")
+    submit_source = submit_parser.add_mutually_exclusive_group(required=True)
+    submit_source.add_argument("--output", "-o", help="Work output")
+    submit_source.add_argument("--file", "-f", help="Read the output from a file (\"-\" for stdin), streamed")
+    submit_parser.add_argument("--merkle", action="store_true", help="Commit a chunked Merkle root (--file only)")
+    submit_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Merkle chunk size in bytes")
     
     # Evaluate
     eval_parser = subparsers.add_parser("evaluate", help="Evaluate work")
@@ -386,20 +1223,162 @@ def main():
     eval_parser.add_argument("--reject", action="store_true", help="Reject work")
     
     args = parser.parse_args()
+    if args.command == "submit" and args.merkle and not args.file:
+        parser.error("--merkle needs --file; --output text is committed as a plain keccak256")
+    _client_options["speed"] = args.speed
+    if args.rpc:
+        _client_options["rpc_url"] = args.rpc
+    # Registered before dispatch: most commands print and return early
+    if args.metrics:
+        atexit.register(write_metrics, args.metrics)
+    if args.metrics_port:
+        serve_metrics(DEFAULT_HOST, args.metrics_port)
+    if args.profile:
+        TRACER.enabled = True
+        atexit.register(TRACER.write, args.profile)
     
     if args.command == "create":
         result = create_task(
             description=args.description,
             amount_usdc=args.amount,
-            deadline_hours=args.deadline,
-            evaluator=args.evaluator,
-            min_length=args.min_length,
-            max_length=args.max_length
+            deadline_hours=args.deadline
         )
+    elif args.command == "create-batch":
+        out = open(args.output, "w") if args.output else sys.stdout
+        try:
+            specs = read_task_specs(args.input)
+            if args.pack > 1:
+                rows = get_client().create_tasks_packed(specs, pack=args.pack, window=max(args.window // args.pack, 1))
+            else:
+                rows = get_client().create_tasks(specs, window=args.window)
+            for row in rows:
+                out.write(json.dumps(row) + "\n")
+                out.flush()
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        return
+    elif args.command == "sign-batch":
+        out = open(args.output, "w") if args.output else sys.stdout
+        try:
+            rows = get_client().sign_create_batch(read_task_specs(args.input), workers=args.workers, window=args.window)
+            write_signed(out, rows)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        return
+    elif args.command == "broadcast":
+        out = open(args.output, "w") if args.output else sys.stdout
+        try:
+            for row in get_client().broadcast(read_signed(args.input), window=args.window):
+                out.write(json.dumps(row) + "\n")
+                out.flush()
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        return
+    elif args.command in SETTLE_ACTIONS:
+        result = get_client().settle_many(args.command, args.task_ids, chunk=args.chunk)
     elif args.command == "get":
         result = get_task(args.task_id)
+    elif args.command == "list":
+        error = get_client()._check(need_key=False)
+        if error:
+            result = error
+        else:
+            for row in get_client().iter_tasks(args.start, args.end, args.status, args.batch_size):
+                print(json.dumps(row), flush=True)
+            return
+    elif args.command == "index":
+        addresses = [a for a in (JUDGEPAY_ADDRESS, args.escrow) if a]
+        if not addresses:
+            result = {"error": "No contract address. Set JUDGEPAY_CONTRACT."}
+        else:
+            store = TaskStore(args.db)
+            indexer = Indexer(
+                get_client().w3,
+                store,
+                addresses,
+                start_block=args.from_block,
+                chunk_size=args.chunk_size,
+                workers=args.workers,
+                confirmations=args.confirmations
+            )
+            indexed = indexer.sync()
+            result = {"success": True, "events_indexed": indexed, "checkpoint": store.checkpoint(), "db": args.db}
+            store.close()
+    elif args.command == "tasks":
+        store = TaskStore(args.db)
+        for row in store.find_tasks(args.requester, args.worker, args.status, args.limit):
+            print(json.dumps(row), flush=True)
+        store.close()
+        return
+    elif args.command == "collusion":
+        # numpy/scipy are only needed here
+        from collusion import find_rings, load_votes
+        store = TaskStore(args.db)
+        try:
+            result = find_rings(load_votes(store, args.escrow), args.min_shared, args.min_agreement, args.top)
+        finally:
+            store.close()
+    elif args.command == "preapprove":
+        if args.show:
+            result = get_client().allowance_status()
+        elif args.budget:
+            result = get_client().preapprove(args.budget)
+        else:
+            result = {"error": "Specify --budget or --show"}
+    elif args.command == "auto-evaluate":
+        conditions = None
+        if args.conditions:
+            with open(args.conditions) as f:
+                conditions = json.load(f)
+        rows = get_client().auto_evaluate_batch(
+            read_submissions(args.input),
+            conditions=conditions,
+            workers=args.workers,
+            apply=args.apply
+        )
+        for row in rows:
+            print(json.dumps(row), flush=True)
+        return
+    elif args.command == "watch":
+        addresses = [a for a in (JUDGEPAY_ADDRESS, args.escrow) if a]
+        if not addresses:
+            result = {"error": "No contract address. Set JUDGEPAY_CONTRACT."}
+        else:
+            watch(addresses, args)
+            return
+    elif args.command == "blob":
+        store = BlobStore(args.dir)
+        if args.push:
+            result = {"success": True, "hash": args.hash, "uploaded": store.push(args.push, args.hash)}
+        else:
+            data = store.get(args.hash, args.chunk_size)
+            if data is None:
+                result = {"error": f"Blob {args.hash} not found"}
+            elif args.output:
+                with open(args.output, "wb") as f:
+                    f.write(data)
+                result = {"success": True, "hash": args.hash, "bytes": len(data), "output": args.output}
+            else:
+                sys.stdout.buffer.write(data)
+                return
+    elif args.command == "serve-blobs":
+        server = serve(BlobStore(args.dir), args.host, args.port)
+        print(json.dumps({"serving": f"http://{args.host}:{args.port}/blobs/", "dir": args.dir}), flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return
     elif args.command == "submit":
-        result = submit_work(args.task_id, args.output)
+        if args.file:
+            result = get_client().submit_file(args.task_id, args.file, merkle=args.merkle, chunk_size=args.chunk_size)
+        else:
+            result = submit_work(args.task_id, args.output)
     elif args.command == "evaluate":
         if args.approve:
             result = evaluate_task(args.task_id, True)
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+JudgePay - Client instrumentation
+Per-JSON-RPC-method latency and error counts, per-operation phase timings
+(build, sign, send, confirm), Prometheus text exposition and an optional
+Chrome trace of the same spans.
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds; public RPC round-trips sit in the 10ms-1s range, confirmations in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for values, total in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labels, values)} {_number(total)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels, as Prometheus expects it."""
+
+    def __init__(self, name: str, help_text: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, *label_values) -> int:
+        with self._lock:
+            series = self._series.get(label_values)
+            return sum(series[:-1]) if series else 0
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for values, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, hits in zip((*self.buckets, "+Inf"), series[:-1]):
+                    cumulative += hits
+                    le = 'le="%s"' % (bound if bound == "+Inf" else _number(bound))
+                    lines.append(f"{self.name}_bucket{_labels(self.labels, values, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.labels, values)} {_number(series[-1])}")
+                lines.append(f"{self.name}_count{_labels(self.labels, values)} {cumulative}")
+        return lines
+
+
+class Tracer:
+    """
+    Collects spans as Chrome trace "complete" events.
+
+    Disabled by default; `add` then returns after one attribute check. Load the
+    written file in chrome://tracing or https://ui.perfetto.dev.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def add(self, name: str, category: str, start: float, end: float, args: dict = None):
+        if not self.enabled:
+            return
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round((start - self._origin) * 1e6, 1),
+            "dur": round((end - start) * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+
+    def write(self, path: str):
+        with self._lock:
+            events = list(self.events)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+RPC_SECONDS = Histogram("judgepay_rpc_duration_seconds", "JSON-RPC request latency by method", ("method",))
+RPC_ERRORS = Counter("judgepay_rpc_errors_total", "JSON-RPC requests that failed or returned an error, by method", ("method",))
+OPERATION_SECONDS = Histogram("judgepay_operation_duration_seconds", "Client operation latency", ("operation",))
+PHASE_SECONDS = Histogram("judgepay_operation_phase_seconds", "Time per phase of a client operation", ("operation", "phase"))
+
+REGISTRY = (RPC_SECONDS, RPC_ERRORS, OPERATION_SECONDS, PHASE_SECONDS)
+TRACER = Tracer()
+
+_local = threading.local()
+
+
+def current_operation() -> str:
+    stack = getattr(_local, "operations", None)
+    return stack[-1] if stack else "other"
+
+
+@contextmanager
+def operation(name: str):
+    """Time a client operation; phases inside it are attributed to `name`. Also usable as a decorator."""
+    stack = getattr(_local, "operations", None)
+    if stack is None:
+        stack = _local.operations = []
+    stack.append(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        stack.pop()
+        OPERATION_SECONDS.observe(end - start, name)
+        TRACER.add(name, "operation", start, end)
+
+
+@contextmanager
+def phase(name: str):
+    """Time one phase (build, sign, send, confirm) of the current operation."""
+    op = current_operation()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        PHASE_SECONDS.observe(end - start, op, name)
+        TRACER.add(name, "phase", start, end, {"operation": op})
+
+
+def observe_rpc(method: str, seconds: float, failed: bool, start: float = None):
+    RPC_SECONDS.observe(seconds, method)
+    if failed:
+        RPC_ERRORS.inc(method)
+    if start is not None:
+        TRACER.add(method, "rpc", start, start + seconds, {"error": True} if failed else None)
+
+
+def rpc_methods(body) -> list:
+    """JSON-RPC method names in a request body (bytes, str or already-parsed JSON)."""
+    if isinstance(body, (bytes, str)):
+        try:
+            body = json.loads(body)
+        except ValueError:
+            return ["unknown"]
+    if isinstance(body, list):
+        return [item.get("method", "unknown") for item in body if isinstance(item, dict)]
+    if isinstance(body, dict):
+        return [body.get("method", "unknown")]
+    return ["unknown"]
+
+
+_session_class = None
+
+
+def instrumented_session():
+    """
+    A requests.Session that records every JSON-RPC POST it carries.
+
+    Both JudgePayClient.rpc and web3's HTTPProvider go through the client's
+    session, so this sees every HTTP JSON-RPC call. A batch of several
+    calls is recorded once, as method `batch`.
+    """
+    global _session_class
+    if _session_class is None:
+        import requests
+
+        class InstrumentedSession(requests.Session):
+            def request(self, method, url, *args, **kwargs):
+                # Session.post passes both; web3 sends bytes as data, JudgePayClient.rpc uses json
+                body = kwargs.get("json") if kwargs.get("json") is not None else kwargs.get("data")
+                if method.upper() != "POST" or body is None:
+                    return super().request(method, url, *args, **kwargs)
+                methods = rpc_methods(body)
+                name = methods[0] if len(methods) == 1 else "batch"
+                start = time.perf_counter()
+                failed = True
+                try:
+                    response = super().request(method, url, *args, **kwargs)
+                    failed = response.status_code >= 400 or b'"error"' in response.content
+                    return response
+                finally:
+                    observe_rpc(name, time.perf_counter() - start, failed, start)
+
+        _session_class = InstrumentedSession
+    return _session_class()
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(path: str):
+    """Write the current metrics to `path` (atomic, for a node_exporter textfile collector)."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(render())
+    os.replace(tmp, path)
+
+
+def serve_metrics(host: str, port: int):
+    """Expose /metrics over HTTP from a daemon thread; returns the server."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+JudgePay - Local nonce allocation
+Reserve nonces in-process so one sender can keep many transactions in flight.
+"""
+
+import heapq
+import threading
+
+# Node error messages that mean our local view of the nonce is wrong
+NONCE_ERRORS = (
+    "nonce too low",
+    "nonce too high",
+    "invalid nonce",
+    "replacement transaction underpriced",
+)
+
+# The node already holds this exact signed transaction: it was sent, not rejected
+ALREADY_KNOWN_ERRORS = (
+    "already known",
+    "known transaction",
+    "alreadyknown",
+)
+
+
+def is_nonce_error(exc: Exception) -> bool:
+    """True if an RPC error was caused by a stale or conflicting nonce."""
+    message = str(exc).lower()
+    return any(err in message for err in NONCE_ERRORS)
+
+
+def is_already_known(exc: Exception) -> bool:
+    """
+    True if the node rejected a payload only because it already has it.
+
+    Re-sending with a new nonce would then broadcast the operation twice;
+    the caller should treat the send as done, under the payload's own hash.
+    """
+    message = str(exc).lower()
+    return any(err in message for err in ALREADY_KNOWN_ERRORS)
+
+
+class _AccountNonces:
+    """Nonce state for a single sender."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.next = None
+        self.released = []
+
+
+class NonceManager:
+    """
+    Per-account nonce allocator.
+
+    The first reservation for an address reads its pending transaction count
+    from the chain; after that nonces are handed out locally, so callers can
+    sign and broadcast back-to-back without waiting for receipts. Nonces that
+    were reserved but never broadcast are released and reused first, so no
+    gap is left behind. Any nonce error from the node triggers a resync.
+
+    All methods are thread-safe and never block on I/O while another account
+    is being served. The chain lookup is the only I/O; asyncio code uses
+    `send_async`, which takes the lookup as a coroutine instead.
+    """
+
+    def __init__(self, w3=None):
+        self.w3 = w3
+        self._accounts = {}
+        self._lock = threading.Lock()
+
+    def _state(self, address: str) -> _AccountNonces:
+        with self._lock:
+            state = self._accounts.get(address)
+            if state is None:
+                state = self._accounts[address] = _AccountNonces()
+            return state
+
+    def _chain_nonce(self, address: str) -> int:
+        if self.w3 is None:
+            raise RuntimeError("NonceManager has no web3 instance; call sync() first")
+        return self.w3.eth.get_transaction_count(address, "pending")
+
+    def is_synced(self, address: str) -> bool:
+        """True once a starting nonce is known for `address`."""
+        return self._state(address).next is not None
+
+    def reserve(self, address: str) -> int:
+        """Reserve the next nonce for `address`."""
+        state = self._state(address)
+        with state.lock:
+            if state.released:
+                return heapq.heappop(state.released)
+            if state.next is None:
+                state.next = self._chain_nonce(address)
+            nonce = state.next
+            state.next += 1
+            return nonce
+
+    def release(self, address: str, nonce: int):
+        """Give back a nonce whose transaction was never broadcast."""
+        state = self._state(address)
+        with state.lock:
+            if state.next is None or nonce >= state.next:
+                return
+            if nonce == state.next - 1:
+                state.next -= 1
+            elif nonce not in state.released:
+                heapq.heappush(state.released, nonce)
+
+    def seed(self, address: str, chain_nonce: int) -> bool:
+        """Set the starting nonce for `address` unless one is already known."""
+        state = self._state(address)
+        with state.lock:
+            if state.next is not None:
+                return False
+            state.next = chain_nonce
+            return True
+
+    def sync(self, address: str, chain_nonce: int):
+        """Reset local state for `address` to a pending count fetched elsewhere."""
+        state = self._state(address)
+        with state.lock:
+            state.next = chain_nonce
+            state.released = []
+
+    def resync(self, address: str) -> int:
+        """Re-read the pending nonce from the chain and reset local state."""
+        chain_nonce = self._chain_nonce(address)
+        self.sync(address, chain_nonce)
+        return chain_nonce
+
+    def send(self, address: str, send_fn, retries: int = 2):
+        """
+        Reserve a nonce and call `send_fn(nonce)` with it.
+
+        On a nonce error the account is resynced and the send retried with a
+        fresh nonce; any other failure releases the nonce and re-raises.
+        """
+        for attempt in range(retries + 1):
+            nonce = self.reserve(address)
+            try:
+                return send_fn(nonce)
+            except Exception as exc:
+                if not self._nonce_conflict(address, nonce, exc):
+                    raise
+                self.resync(address)
+                if attempt == retries:
+                    raise
+
+    async def send_async(self, address: str, send_fn, chain_nonce_fn, retries: int = 2):
+        """
+        Coroutine version of `send` for asyncio clients.
+
+        `send_fn(nonce)` and `chain_nonce_fn()` are coroutine functions; the
+        latter stands in for the blocking chain lookup, both for the first
+        reservation and for resyncs after a nonce error.
+        """
+        for attempt in range(retries + 1):
+            if not self.is_synced(address):
+                # Concurrent first sends may all fetch; only the first result is kept
+                self.seed(address, await chain_nonce_fn())
+            nonce = self.reserve(address)
+            try:
+                return await send_fn(nonce)
+            except Exception as exc:
+                if not self._nonce_conflict(address, nonce, exc):
+                    raise
+                self.sync(address, await chain_nonce_fn())
+                if attempt == retries:
+                    raise
+
+    def _nonce_conflict(self, address: str, nonce: int, exc: Exception) -> bool:
+        """After a failed send: True on a nonce error (the caller resyncs), else `nonce` is released."""
+        if is_nonce_error(exc):
+            return True
+        self.release(address, nonce)
+        return False
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+JudgePay - Shared receipt tracking
+One background poller resolves receipts for every in-flight transaction.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+DEFAULT_CONFIRMATIONS = int(os.getenv("JUDGEPAY_CONFIRMATIONS", "1"))
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_TIMEOUT = 120.0
+
+
+def _hex(value) -> str:
+    if isinstance(value, str):
+        return value.lower() if value.startswith("0x") else "0x" + value.lower()
+    return "0x" + bytes(value).hex()
+
+
+class _Pending:
+    """A tracked transaction."""
+
+    def __init__(self, tx_hash: str, deadline: float):
+        self.tx_hash = tx_hash
+        self.deadline = deadline
+        self.callbacks = []
+        self.future = Future()
+        self.block_number = None
+        self.block_hash = None
+
+
+class ReceiptTracker:
+    """
+    Follows the chain head and resolves receipts for many transactions at once.
+
+    Each poll reads the head once; when it has moved, the receipts of all
+    pending transactions are fetched in a single JSON-RPC batch. A receipt
+    resolves once it is `confirmations` blocks deep. If a receipt moves to a
+    different block or disappears before that, the reorg is counted and the
+    transaction simply keeps waiting. RPC load stays at one call per poll
+    plus one batch per new block, however many transactions are in flight.
+    """
+
+    def __init__(
+        self,
+        w3,
+        confirmations: int = DEFAULT_CONFIRMATIONS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        timeout: float = DEFAULT_TIMEOUT
+    ):
+        self.w3 = w3
+        self.confirmations = max(confirmations, 1)
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.reorgs = 0
+
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_head = None
+        self._fresh = False
+
+    # --- Public API ---
+
+    def track(self, tx_hash, callback=None, timeout: float = None) -> Future:
+        """
+        Start tracking `tx_hash` and return a Future for its receipt.
+
+        `callback(receipt)` runs on the poller thread once the receipt is
+        final. Tracking the same hash twice returns the same Future.
+        """
+        key = _hex(tx_hash)
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is None:
+                deadline = time.monotonic() + (timeout or self.timeout)
+                pending = self._pending[key] = _Pending(key, deadline)
+                self._fresh = True
+            if callback is not None:
+                pending.callbacks.append(callback)
+        self._ensure_running()
+        self._wake.set()
+        return pending.future
+
+    def wait(self, tx_hash, timeout: float = None):
+        """Block until `tx_hash` is final and return its receipt."""
+        timeout = timeout or self.timeout
+        return self.track(tx_hash, timeout=timeout).result(timeout + self.poll_interval * 2)
+
+    def wait_all(self, tx_hashes: list, timeout: float = None) -> list:
+        """Wait for several transactions together; receipts come back in input order."""
+        futures = [self.track(h, timeout=timeout) for h in tx_hashes]
+        return [f.result() for f in futures]
+
+    def close(self):
+        """Stop the poller thread."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    # --- Poller ---
+
+    def _ensure_running(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="judgepay-receipts", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception:
+                # Transient RPC failure; try again on the next tick
+                pass
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def poll(self):
+        """Run one polling round (called by the background thread)."""
+        with self._lock:
+            pending = list(self._pending.values())
+        if not pending:
+            return
+
+        now = time.monotonic()
+        for item in pending:
+            if now >= item.deadline:
+                self._finish(item, error=TimeoutError(f"Transaction {item.tx_hash} not final after timeout"))
+
+        head = self.w3.eth.block_number
+        with self._lock:
+            if head == self._last_head and not self._fresh:
+                return
+            self._last_head = head
+            self._fresh = False
+            pending = list(self._pending.values())
+        if not pending:
+            return
+
+        responses = self.w3.provider.make_batch_request(
+            [("eth_getTransactionReceipt", [item.tx_hash]) for item in pending]
+        )
+        final = []
+        for item, response in zip(pending, responses):
+            raw = response.get("result") if isinstance(response, dict) else None
+            if raw is None:
+                if item.block_hash is not None:
+                    self.reorgs += 1
+                item.block_number = item.block_hash = None
+                continue
+
+            block_hash = _hex(raw["blockHash"])
+            if item.block_hash is not None and item.block_hash != block_hash:
+                self.reorgs += 1
+            item.block_hash = block_hash
+            item.block_number = int(raw["blockNumber"], 16)
+
+            if head - item.block_number + 1 >= self.confirmations:
+                final.append(item)
+
+        if final:
+            # Re-read through web3 so callers get the usual formatted receipts
+            with self.w3.batch_requests() as batch:
+                for item in final:
+                    batch.add(self.w3.eth.get_transaction_receipt(item.tx_hash))
+                receipts = batch.execute()
+            for item, receipt in zip(final, receipts):
+                if _hex(receipt["blockHash"]) == item.block_hash:
+                    self._finish(item, receipt=receipt)
+
+    def _finish(self, item: _Pending, receipt=None, error: Exception = None):
+        with self._lock:
+            if self._pending.pop(item.tx_hash, None) is None:
+                return
+        if error is not None:
+            item.future.set_exception(error)
+            return
+        item.future.set_result(receipt)
+        for callback in item.callbacks:
+            callback(receipt)
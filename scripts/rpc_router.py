@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+JudgePay - Multi-endpoint RPC routing
+Spreads JSON-RPC traffic over several HTTP endpoints: reads go to the fastest
+healthy node and are hedged to a second one when they run slow, raw
+transactions are broadcast to several nodes at once, and nodes that fail or
+throttle are backed off.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Base Sepolia; override with a comma-separated USDC_RPC_BASE
+DEFAULT_ENDPOINTS = (
+    "https://base-sepolia-rpc.publicnode.com",
+    "https://sepolia.base.org",
+)
+
+WRITE_METHODS = frozenset({"eth_sendRawTransaction", "eth_sendTransaction"})
+# Node-local state: a filter only exists on the node that created it
+STICKY_METHODS = frozenset({
+    "eth_newFilter",
+    "eth_newBlockFilter",
+    "eth_newPendingTransactionFilter",
+    "eth_getFilterChanges",
+    "eth_getFilterLogs",
+    "eth_uninstallFilter",
+})
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_FANOUT = 3
+WINDOW = 50  # outcomes kept per endpoint for its error rate
+LATENCY_GAIN = 0.125  # EWMA weights, as in TCP's RTT estimator
+DEVIATION_GAIN = 0.25
+HEDGE_MIN_DELAY = 0.05
+HEDGE_INITIAL_DELAY = 0.5  # before an endpoint has been measured
+HEDGE_MAX_DELAY = 2.0
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+THROTTLE_CODES = (-32005, -32029)
+THROTTLE_MARKERS = ("rate limit", "too many requests")
+
+
+def parse_endpoints(value) -> list:
+    """Endpoint URLs from a comma/whitespace separated string or an iterable."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.replace(",", " ").split()
+    return list(dict.fromkeys(url.strip() for url in value if url.strip()))
+
+
+def endpoints_from_env() -> list:
+    return parse_endpoints(os.getenv("USDC_RPC_BASE")) or list(DEFAULT_ENDPOINTS)
+
+
+class RpcUnavailable(Exception):
+    """An endpoint gave no usable answer: transport error, timeout, 5xx or throttling."""
+
+    def __init__(self, url: str, reason: str, throttled: bool = False, retry_after: float = None):
+        super().__init__(f"{url}: {reason}")
+        self.url = url
+        self.throttled = throttled
+        self.retry_after = retry_after
+
+
+class Endpoint:
+    """Rolling health of one RPC endpoint."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.latency = None  # smoothed seconds
+        self.deviation = 0.0
+        self.outcomes = deque(maxlen=WINDOW)
+        self.failures = 0  # consecutive
+        self.backoff_until = 0.0
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    @property
+    def error_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.backoff_until
+
+    def score(self) -> float:
+        """Lower is better; an unmeasured endpoint scores 0 so it gets probed."""
+        if self.latency is None:
+            return 0.0
+        return (self.latency + self.deviation) * (1 + 4 * self.error_rate)
+
+    def hedge_delay(self) -> float:
+        """How long a read may run here before a second node is asked too."""
+        if self.latency is None:
+            return HEDGE_INITIAL_DELAY
+        return min(max(self.latency + 4 * self.deviation, HEDGE_MIN_DELAY), HEDGE_MAX_DELAY)
+
+    def succeeded(self, seconds: float):
+        with self._lock:
+            self.requests += 1
+            self.outcomes.append(True)
+            self.failures = 0
+            if self.latency is None:
+                self.latency, self.deviation = seconds, seconds / 2
+            else:
+                self.deviation += DEVIATION_GAIN * (abs(seconds - self.latency) - self.deviation)
+                self.latency += LATENCY_GAIN * (seconds - self.latency)
+
+    def failed(self, seconds: float, retry_after: float = None):
+        with self._lock:
+            self.requests += 1
+            self.outcomes.append(False)
+            self.failures += 1
+            backoff = retry_after or min(BACKOFF_BASE * 2 ** (self.failures - 1), BACKOFF_MAX)
+            self.backoff_until = time.monotonic() + backoff
+            # A timeout still says how slow the node is
+            if self.latency is not None:
+                self.latency += LATENCY_GAIN * (max(seconds, self.latency) - self.latency)
+
+    def status(self, now: float) -> dict:
+        return {
+            "url": self.url,
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "requests": self.requests,
+            "backoff_s": round(max(self.backoff_until - now, 0.0), 1),
+        }
+
+
+def _throttled(body) -> bool:
+    """Whether a JSON-RPC reply (or any reply in a batch) is a rate-limit error."""
+    replies = body if isinstance(body, list) else [body]
+    for reply in replies:
+        error = reply.get("error") if isinstance(reply, dict) else None
+        if error:
+            message = str(error.get("message", "")).lower() if isinstance(error, dict) else str(error).lower()
+            if (isinstance(error, dict) and error.get("code") in THROTTLE_CODES) or any(m in message for m in THROTTLE_MARKERS):
+                return True
+    return False
+
+
+def _has_error(body) -> bool:
+    replies = body if isinstance(body, list) else [body]
+    return any(isinstance(reply, dict) and "error" in reply for reply in replies)
+
+
+class RpcRouter:
+    """
+    Routes JSON-RPC payloads over a list of endpoints.
+
+    Endpoints are ranked by smoothed latency (plus deviation), weighted by
+    their recent error rate. Reads go to the best one; if it has not
+    answered within its hedge delay (smoothed latency + 4 deviations) the
+    next one is asked as well and the first answer wins. A transport error,
+    5xx or rate-limit reply backs the endpoint off exponentially (or for
+    its Retry-After) and the request fails over to the next. Raw
+    transactions go to the best `fanout` endpoints at once. With a single
+    endpoint every request is one plain POST.
+    """
+
+    def __init__(self, endpoints, session=None, timeout: float = DEFAULT_TIMEOUT, fanout: int = DEFAULT_FANOUT, pool_size: int = 16):
+        urls = parse_endpoints(endpoints)
+        if not urls:
+            raise ValueError("No RPC endpoints")
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.timeout = timeout
+        self.fanout = fanout
+        if session is None:
+            import requests
+            session = requests.Session()
+        self.session = session
+        self._sticky = None
+        self._pool = None
+        if len(self.endpoints) > 1:
+            self._pool = ThreadPoolExecutor(max_workers=pool_size * len(self.endpoints), thread_name_prefix="rpc-router")
+
+    @property
+    def url(self) -> str:
+        """The currently preferred endpoint."""
+        return self.ranked()[0].url
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def ranked(self) -> list:
+        """Healthy endpoints best first, then backed-off ones by when they recover."""
+        now = time.monotonic()
+        healthy = sorted((e for e in self.endpoints if e.healthy(now)), key=Endpoint.score)
+        waiting = sorted((e for e in self.endpoints if not e.healthy(now)), key=lambda e: e.backoff_until)
+        return healthy + waiting
+
+    def status(self) -> list:
+        now = time.monotonic()
+        return [e.status(now) for e in self.ranked()]
+
+    # --- Transport ---
+
+    def _post(self, endpoint: Endpoint, body: bytes):
+        """One attempt against one endpoint; raises RpcUnavailable when it gave no usable answer."""
+        start = time.perf_counter()
+        try:
+            response = self.session.post(
+                endpoint.url, data=body, headers={"Content-Type": "application/json"}, timeout=self.timeout
+            )
+        except Exception as exc:
+            endpoint.failed(time.perf_counter() - start)
+            raise RpcUnavailable(endpoint.url, f"{type(exc).__name__}: {exc}") from exc
+        elapsed = time.perf_counter() - start
+
+        if response.status_code == 429 or response.status_code >= 500:
+            retry_after = response.headers.get("Retry-After")
+            retry_after = float(retry_after) if retry_after and retry_after.isdigit() else None
+            endpoint.failed(elapsed, retry_after)
+            raise RpcUnavailable(endpoint.url, f"HTTP {response.status_code}", response.status_code == 429, retry_after)
+        try:
+            reply = response.json()
+        except ValueError as exc:
+            endpoint.failed(elapsed)
+            raise RpcUnavailable(endpoint.url, f"HTTP {response.status_code}, not JSON") from exc
+        if _throttled(reply):
+            endpoint.failed(elapsed)
+            raise RpcUnavailable(endpoint.url, "rate limited", throttled=True)
+        endpoint.succeeded(elapsed)
+        return reply
+
+    def request(self, body: bytes, methods) -> object:
+        """
+        Send an encoded JSON-RPC request or batch; returns the decoded reply.
+
+        `methods` names the calls in `body`, which decides how it is routed.
+        Raises the last RpcUnavailable when no endpoint answered.
+        """
+        methods = set(methods)
+        if self._pool is None:
+            return self._post(self.endpoints[0], body)
+        if methods & STICKY_METHODS:
+            return self._request_sticky(body)
+        if methods & WRITE_METHODS:
+            return self._broadcast(body)
+        return self._read(body)
+
+    def _failover(self, body: bytes, order: list):
+        error = None
+        for endpoint in order:
+            try:
+                return self._post(endpoint, body)
+            except RpcUnavailable as exc:
+                error = exc
+        raise error
+
+    def _request_sticky(self, body: bytes):
+        # Filters live on one node, so stay there until it stops answering. The
+        # next node has none of the old filters; callers recreate them on
+        # "filter not found".
+        order = self.ranked()
+        if self._sticky is not None:
+            order = [self._sticky] + [e for e in order if e is not self._sticky]
+        error = None
+        for endpoint in order:
+            try:
+                reply = self._post(endpoint, body)
+            except RpcUnavailable as exc:
+                error = exc
+                continue
+            self._sticky = endpoint
+            return reply
+        raise error
+
+    def _read(self, body: bytes):
+        order = iter(self.ranked())
+        first = next(order)
+        futures = {self._pool.submit(self._post, first, body): first}
+        hedged = False
+        error = None
+        while futures:
+            done, _ = wait(futures, timeout=None if hedged else first.hedge_delay(), return_when=FIRST_COMPLETED)
+            if not done:
+                # Primary is running slow: ask the next node too, keep whichever answers first
+                hedged = True
+                backup = next(order, None)
+                if backup is not None:
+                    futures[self._pool.submit(self._post, backup, body)] = backup
+                continue
+            for future in done:
+                futures.pop(future)
+                try:
+                    return future.result()
+                except RpcUnavailable as exc:
+                    error = exc
+                    retry = next(order, None)
+                    if retry is not None:
+                        futures[self._pool.submit(self._post, retry, body)] = retry
+        raise error
+
+    def _broadcast(self, body: bytes):
+        """
+        Send a transaction to the best `fanout` endpoints at once.
+
+        Returns the first success. Nodes that were reached later often
+        answer "already known", so an error reply is only returned when no
+        node accepted the transaction, and then the best-ranked one's.
+        """
+        targets = self.ranked()[:max(self.fanout, 1)]
+        futures = {self._pool.submit(self._post, endpoint, body): rank for rank, endpoint in enumerate(targets)}
+        rejected = {}
+        error = None
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                rank = futures.pop(future)
+                try:
+                    reply = future.result()
+                except RpcUnavailable as exc:
+                    error = exc
+                    continue
+                if not _has_error(reply):
+                    return reply
+                rejected[rank] = reply
+        if rejected:
+            return rejected[min(rejected)]
+        # Nobody answered; try whatever is left, one at a time
+        rest = [e for e in self.ranked() if e not in targets]
+        if not rest:
+            raise error
+        return self._failover(body, rest)
+
+
+_provider_class = None
+
+
+def web3_provider(router: RpcRouter):
+    """A web3 provider that sends every request through `router`."""
+    global _provider_class
+    if _provider_class is None:
+        from web3._utils.batching import sort_batch_response_by_response_ids
+        from web3.providers.base import JSONBaseProvider
+
+        class RoutedProvider(JSONBaseProvider):
+            def __init__(self, router: RpcRouter, **kwargs):
+                super().__init__(**kwargs)
+                self.router = router
+
+            def make_request(self, method, params):
+                return self.router.request(self.encode_rpc_request(method, params), [method])
+
+            def make_batch_request(self, requests):
+                reply = self.router.request(self.encode_batch_rpc_request(requests), [method for method, _ in requests])
+                if not isinstance(reply, list):
+                    # RPC errors return only one response with the error object
+                    return reply
+                return sort_batch_response_by_response_ids(reply)
+
+            def __repr__(self):
+                return f"<RoutedProvider {[e.url for e in self.router.endpoints]}>"
+
+        _provider_class = RoutedProvider
+    return _provider_class(router)
+
+
+_async_provider_class = None
+
+
+def async_web3_provider(router: RpcRouter, max_workers: int = 32):
+    """
+    An AsyncWeb3 provider that sends every request through `router`.
+
+    The router is blocking, so each request runs on one of `max_workers`
+    threads; the event loop only awaits the result. `disconnect()` stops
+    those threads and closes the router.
+    """
+    global _async_provider_class
+    if _async_provider_class is None:
+        import asyncio
+
+        from web3._utils.batching import sort_batch_response_by_response_ids
+        from web3.providers.async_base import AsyncJSONBaseProvider
+
+        class AsyncRoutedProvider(AsyncJSONBaseProvider):
+            def __init__(self, router: RpcRouter, max_workers: int, **kwargs):
+                super().__init__(**kwargs)
+                self.router = router
+                self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rpc-router-async")
+
+            async def _request(self, body: bytes, methods: list):
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._executor, self.router.request, body, methods)
+
+            async def make_request(self, method, params):
+                return await self._request(self.encode_rpc_request(method, params), [method])
+
+            async def make_batch_request(self, requests):
+                reply = await self._request(self.encode_batch_rpc_request(requests), [method for method, _ in requests])
+                if not isinstance(reply, list):
+                    return reply
+                return sort_batch_response_by_response_ids(reply)
+
+            async def disconnect(self):
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self.router.close()
+
+            def __repr__(self):
+                return f"<AsyncRoutedProvider {[e.url for e in self.router.endpoints]}>"
+
+        _async_provider_class = AsyncRoutedProvider
+    return _async_provider_class(router, max_workers)
+
+
+def routed_web3(endpoints=None, **kwargs):
+    """Web3 over a router for `endpoints`, defaulting to USDC_RPC_BASE or DEFAULT_ENDPOINTS."""
+    from web3 import Web3
+    return Web3(web3_provider(RpcRouter(endpoints or endpoints_from_env(), **kwargs)))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("endpoints", nargs="*", help="Endpoint URLs (default: USDC_RPC_BASE or the built-in list)")
+    parser.add_argument("--probes", type=int, default=5, help="eth_blockNumber calls per endpoint")
+    args = parser.parse_args()
+
+    router = RpcRouter(args.endpoints or endpoints_from_env())
+    body = json.dumps({"jsonrpc": "2.0", "id": 1, "method": "eth_blockNumber", "params": []}).encode()
+    heads = {}
+    for endpoint in router.endpoints:
+        for _ in range(args.probes):
+            try:
+                heads[endpoint.url] = int(router._post(endpoint, body)["result"], 16)
+            except (RpcUnavailable, KeyError, TypeError, ValueError):
+                pass
+    router.close()
+    print(json.dumps([dict(status, head=heads.get(status["url"])) for status in router.status()], indent=2))
+
+
+if __name__ == "__main__":
+    main()
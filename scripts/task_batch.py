@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+JudgePay - Batch task input
+Stream task specs from JSONL or CSV files for `judgepay create-batch`.
+"""
+
+import csv
+import json
+import sys
+
+# spec field -> (converter, default)
+SPEC_FIELDS = {
+    "description": (str, None),
+    "amount_usdc": (float, None),
+    "deadline_hours": (int, 24),
+}
+
+# Accepted alternative column names
+ALIASES = {
+    "amount": "amount_usdc",
+    "deadline": "deadline_hours",
+}
+
+
+def normalize_spec(raw: dict) -> dict:
+    """Map a raw JSON/CSV row onto create_task keyword arguments."""
+    spec = {}
+    for key, value in raw.items():
+        key = ALIASES.get(key, key)
+        if key not in SPEC_FIELDS:
+            continue
+        if value is None or value == "":
+            continue
+        convert, _ = SPEC_FIELDS[key]
+        spec[key] = convert(value)
+
+    for key, (_, default) in SPEC_FIELDS.items():
+        if key not in spec:
+            if default is None:
+                raise ValueError(f"Missing required field '{key}'")
+            spec[key] = default
+    return spec
+
+
+def read_task_specs(path: str):
+    """
+    Yield (line number, spec dict or exception) for every task in `path`.
+
+    `.csv` files are read with a header row; anything else is treated as
+    JSONL. Use "-" to read JSONL from stdin. Rows are read lazily, so large
+    files are never loaded whole.
+    """
+    f = sys.stdin if path == "-" else open(path, newline="")
+    try:
+        if path.endswith(".csv"):
+            rows = ((n, row) for n, row in enumerate(csv.DictReader(f), start=2))
+        else:
+            rows = ((n, line) for n, line in enumerate(f, start=1) if line.strip())
+
+        for n, row in rows:
+            try:
+                yield n, normalize_spec(row if isinstance(row, dict) else json.loads(row))
+            except (ValueError, TypeError) as exc:
+                yield n, exc
+    finally:
+        if f is not sys.stdin:
+            f.close()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+JudgePay - Event definitions
+The JudgePayLite and JudgePayEscrow events we track, their topic hashes, and a
+decoder for raw logs.
+"""
+
+from eth_hash.auto import keccak
+
+from abi_cache import checksum_address, signature
+from abi_registry import contract
+
+
+# Taken from the ABI registry so the topics always match the deployed contracts
+LITE_EVENTS_ABI = contract("JudgePayLite").events(["TaskCreated", "WorkSubmitted", "TaskCompleted", "TaskRefunded"])
+
+ESCROW_EVENTS_ABI = contract("JudgePayEscrow").events(["TaskCreated", "TaskClaimed", "WorkSubmitted", "L3_Voted", "DisputeResolved"])
+
+# topic0 -> (contract kind, event ABI). Lite and Escrow share event names but
+# not signatures, so topic0 alone tells them apart.
+EVENTS_BY_TOPIC = {}
+for _kind, _abis in (("lite", LITE_EVENTS_ABI), ("escrow", ESCROW_EVENTS_ABI)):
+    for _abi in _abis:
+        EVENTS_BY_TOPIC[keccak(signature(_abi).encode())] = (_kind, _abi)
+
+ALL_TOPICS = ["0x" + topic.hex() for topic in EVENTS_BY_TOPIC]
+
+TASK_CREATED_TOPICS = {
+    topic for topic, (_, abi) in EVENTS_BY_TOPIC.items() if abi["name"] == "TaskCreated"
+}
+
+
+# Task status once each event has been applied
+EVENT_STATUS = {
+    "TaskCreated": "Open",
+    "TaskClaimed": "Locked",
+    "WorkSubmitted": "Submitted",
+    "TaskCompleted": "Completed",
+    "TaskRefunded": "Refunded",
+    "L3_Voted": "L3_HumanJury",
+}
+
+
+def status_after(event: str, args: dict) -> str:
+    """Status a task is in after `event`."""
+    if event == "DisputeResolved":
+        # The Escrow marks every settled task "Resolved"; report who got paid
+        return "Completed" if args["workerWins"] else "Refunded"
+    return EVENT_STATUS[event]
+
+
+def _topic_bytes(topic) -> bytes:
+    if isinstance(topic, str):
+        return bytes.fromhex(topic[2:] if topic.startswith("0x") else topic)
+    return bytes(topic)
+
+
+def _decode(types: list, data: bytes) -> tuple:
+    # eth_abi is imported on first use to keep CLI start-up cheap
+    from eth_abi import decode
+    return decode(types, data)
+
+
+def decode_log(log) -> dict:
+    """
+    Decode a raw JudgePay log into a flat dict.
+
+    Returns None for logs that are not one of the known JudgePay events.
+    The first argument of every event is the task ID and is exposed as
+    `task_id` regardless of its name in the contract.
+    """
+    topics = [_topic_bytes(t) for t in log["topics"]]
+    if not topics or topics[0] not in EVENTS_BY_TOPIC:
+        return None
+    kind, abi = EVENTS_BY_TOPIC[topics[0]]
+
+    indexed = [i for i in abi["inputs"] if i["indexed"]]
+    plain = [i for i in abi["inputs"] if not i["indexed"]]
+
+    args = {}
+    for item, topic in zip(indexed, topics[1:]):
+        args[item["name"]] = _decode([item["type"]], topic)[0]
+    if plain:
+        values = _decode([i["type"] for i in plain], _topic_bytes(log["data"]))
+        args.update({item["name"]: value for item, value in zip(plain, values)})
+
+    for item in abi["inputs"]:
+        if item["type"] == "address":
+            args[item["name"]] = checksum_address(args[item["name"]])
+
+    task_id = args[abi["inputs"][0]["name"]]
+    tx_hash = log["transactionHash"]
+    block_hash = log["blockHash"]
+    return {
+        "event": abi["name"],
+        "kind": kind,
+        "address": checksum_address(log["address"]),
+        "task_id": task_id,
+        "args": args,
+        "block_number": log["blockNumber"],
+        "block_hash": "0x" + _topic_bytes(block_hash).hex(),
+        "tx_hash": "0x" + _topic_bytes(tx_hash).hex(),
+        "log_index": log["logIndex"],
+    }
+
+
+def task_ids_from_receipt(receipt, contract_address: str, events=("TaskCreated",)) -> list:
+    """Task IDs from `contract_address`'s logs of the named events in a receipt, in log order."""
+    contract_address = checksum_address(contract_address)
+    task_ids = []
+    for log in receipt["logs"]:
+        if checksum_address(log["address"]) != contract_address:
+            continue
+        topics = [_topic_bytes(t) for t in log["topics"]]
+        if len(topics) > 1 and topics[0] in EVENTS_BY_TOPIC and EVENTS_BY_TOPIC[topics[0]][1]["name"] in events:
+            task_ids.append(int.from_bytes(topics[1], "big"))
+    return task_ids
+
+
+def task_id_from_receipt(receipt, contract_address: str):
+    """Return the task ID from the TaskCreated log in a receipt, or None."""
+    task_ids = task_ids_from_receipt(receipt, contract_address)
+    return task_ids[0] if task_ids else None
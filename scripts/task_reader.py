@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+JudgePay - Bulk task reads
+Read ranges of task IDs with Multicall3 or JSON-RPC batches instead of one
+eth_call per task.
+"""
+
+from abi_cache import checksum_address
+
+# Multicall3 is deployed at the same address on Base, Base Sepolia and most EVM chains
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function",
+    },
+]
+
+DEFAULT_BATCH_SIZE = 200
+
+
+class TaskReader:
+    """
+    Bulk reader for JudgePay tasks.
+
+    Packs `tasks(id)` calls for a range of IDs into Multicall3 `aggregate3`
+    calls. On chains without Multicall3 (e.g. a fresh local node) it falls
+    back to JSON-RPC batch requests. Either way a batch of tasks costs one
+    HTTP round-trip.
+    """
+
+    def __init__(self, client, batch_size: int = DEFAULT_BATCH_SIZE, multicall_address: str = MULTICALL3_ADDRESS):
+        self.client = client
+        self.batch_size = batch_size
+        self.multicall_address = checksum_address(multicall_address)
+        self._multicall = None
+        self._use_multicall = None
+        self._tasks = client.judgepay.codec("tasks")
+
+    @property
+    def multicall(self):
+        if self._multicall is None:
+            self._multicall = self.client.w3.eth.contract(address=self.multicall_address, abi=MULTICALL3_ABI)
+        return self._multicall
+
+    @property
+    def use_multicall(self) -> bool:
+        """Whether Multicall3 is deployed on the connected chain (checked once)."""
+        if self._use_multicall is None:
+            self._use_multicall = len(self.client.w3.eth.get_code(self.multicall_address)) > 0
+        return self._use_multicall
+
+    def _read_multicall(self, task_ids: list) -> list:
+        target = checksum_address(self.client.contract_address)
+        calls = [(target, True, self._tasks.encode(task_id)) for task_id in task_ids]
+        results = self.multicall.functions.aggregate3(calls).call()
+
+        tasks = []
+        for success, data in results:
+            if success:
+                tasks.append(self._tasks.decode(data))
+            else:
+                tasks.append(None)
+        return tasks
+
+    def _read_batch(self, task_ids: list) -> list:
+        target = self.client.contract_address
+        requests = [
+            ("eth_call", [{"to": target, "data": "0x" + self._tasks.encode(task_id).hex()}, "latest"])
+            for task_id in task_ids
+        ]
+        responses = self.client.w3.provider.make_batch_request(requests)
+        if isinstance(responses, dict):
+            raise RuntimeError(f"Batch request failed: {responses.get('error')}")
+        tasks = []
+        for response in responses:
+            if response.get("error") is not None or not response.get("result"):
+                tasks.append(None)
+            else:
+                tasks.append(self._tasks.decode(bytes.fromhex(response["result"].removeprefix("0x"))))
+        return tasks
+
+    def read(self, task_ids: list) -> list:
+        """Read raw `tasks(id)` tuples for `task_ids` in one round-trip (None for failed calls)."""
+        if not task_ids:
+            return []
+        if self.use_multicall:
+            return self._read_multicall(task_ids)
+        return self._read_batch(task_ids)
+
+    def iter_raw(self, start: int, end: int, batch_size: int = None):
+        """Yield (task_id, raw task tuple) for IDs in [start, end), one batch per round-trip."""
+        batch_size = batch_size or self.batch_size
+        for batch_start in range(start, end, batch_size):
+            task_ids = list(range(batch_start, min(batch_start + batch_size, end)))
+            for task_id, task in zip(task_ids, self.read(task_ids)):
+                if task is not None:
+                    yield task_id, task
@@ -0,0 +1,45 @@
+import json
+import os
+
+from abi_registry import BUNDLED_DIR, CONTRACTS, artifact_path, drift
+
+
+def write_artifacts(root, abis: dict):
+    for name, abi in abis.items():
+        path = artifact_path(name, str(root))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"abi": abi, "bytecode": {"object": "0x"}}, f)
+
+
+def bundled() -> dict:
+    abis = {}
+    for name in CONTRACTS:
+        with open(os.path.join(BUNDLED_DIR, f"{name}.json")) as f:
+            abis[name] = json.load(f)
+    return abis
+
+
+def test_reordered_build_with_errors_and_internal_types_is_not_drift(tmp_path):
+    abis = bundled()
+    for name, abi in abis.items():
+        abi.reverse()
+        abi.append({"type": "error", "name": "ReentrancyGuardReentrantCall", "inputs": []})
+        for entry in abi:
+            for param in entry.get("inputs", []):
+                param["internalType"] = param["type"]
+    write_artifacts(tmp_path, abis)
+    assert drift(str(tmp_path)) == {}
+
+
+def test_changed_getter_is_reported(tmp_path):
+    abis = bundled()
+    escrow = abis["JudgePayEscrow"]
+    getter = next(e for e in escrow if e.get("name") == "juryResolutions")
+    getter["outputs"] = getter["outputs"][:3]
+    write_artifacts(tmp_path, abis)
+
+    changed = drift(str(tmp_path))
+    assert list(changed) == ["JudgePayEscrow"]
+    assert [e["name"] for e in changed["JudgePayEscrow"]["missing"]] == ["juryResolutions"]
+    assert [e["name"] for e in changed["JudgePayEscrow"]["extra"]] == ["juryResolutions"]
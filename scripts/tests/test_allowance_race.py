@@ -0,0 +1,89 @@
+import threading
+import time
+
+from judgepay import JudgePayClient
+
+KEY = "0x" + "11" * 32
+CONTRACT = "0x" + "22" * 20
+
+
+class FakeToken:
+    """Replays sent calls in nonce order against one owner's allowance, the way the chain would."""
+
+    def __init__(self, client):
+        self.approve = client.usdc.selectors["approve"]
+        self.create = client.judgepay.selectors["createTask"]
+        self.sent = []
+        self.lock = threading.Lock()
+
+    def send(self, to, data, account, fallback_gas, items=None):
+        time.sleep(0.01)  # widen the window between a create's approve and its spend
+        with self.lock:
+            self.sent.append(data)
+            return len(self.sent).to_bytes(32, "big")
+
+    def replay(self) -> list:
+        """Outcome of each spending call: True if the allowance covered it."""
+        allowance, outcomes = 0, []
+        for data in self.sent:
+            selector, args = data[:4], data[4:]
+            if selector == self.approve:
+                allowance = int.from_bytes(args[32:64], "big")
+            elif selector == self.create:
+                amount = int.from_bytes(args[:32], "big")
+                outcomes.append(amount <= allowance)
+                allowance -= min(amount, allowance)
+        return outcomes
+
+
+def offline_client() -> JudgePayClient:
+    client = JudgePayClient(rpc_url="http://127.0.0.1:1", contract_address=CONTRACT, private_key=KEY, blob_dir=None)
+    client._decimals = 6
+    client._view = lambda entry, name, *args, to=None: (0,)
+    return client
+
+
+def test_concurrent_creates_each_spend_their_own_approve():
+    client = offline_client()
+    token = FakeToken(client)
+    client._send = token.send
+
+    threads = [
+        threading.Thread(target=client.create_task, args=(f"task {i}", 1 + i), kwargs={"wait": False})
+        for i in range(6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert token.replay() == [True] * 6
+
+
+def test_concurrent_async_creates_each_spend_their_own_approve():
+    import asyncio
+
+    from async_client import AsyncJudgePayClient
+
+    async def run():
+        async with AsyncJudgePayClient(rpc_url="http://127.0.0.1:1", contract_address=CONTRACT, private_key=KEY, blob_dir=None) as client:
+            token = FakeToken(client)
+
+            async def send(to, data, account, fallback_gas):
+                await asyncio.sleep(0.01)
+                return token.send(to, data, account, fallback_gas)
+
+            async def view(entry, name, *args, to=None):
+                return (0,)
+
+            async def wait_for_receipt(tx_hash, timeout=None):
+                return {"logs": [], "status": 1}
+
+            client._decimals = 6
+            client._send = send
+            client._view = view
+            client.wait_for_receipt = wait_for_receipt
+            await asyncio.gather(*(client.create_task(f"task {i}", 1 + i) for i in range(6)))
+            return token.replay()
+
+    assert asyncio.run(run()) == [True] * 6
@@ -0,0 +1,82 @@
+import os
+
+from auto_eval import RuleSet
+from judgepay import JudgePayClient
+
+KEY = "0x" + "11" * 32
+CONTRACT = "0x" + "22" * 20
+TASK = ("0x" + "33" * 20, "0x" + "44" * 20, 10 ** 6, 0, 0, 1)  # Submitted
+
+
+def offline_client(tmp_path) -> JudgePayClient:
+    client = JudgePayClient(rpc_url="http://127.0.0.1:1", contract_address=CONTRACT, private_key=KEY, blob_dir=str(tmp_path / "blobs"))
+    client._send = lambda to, data, account, fallback_gas: b"\xaa" * 32
+    client._view = lambda entry, name, *args, to=None: TASK
+    return client
+
+
+def test_multi_chunk_merkle_submission_passes(tmp_path):
+    output = os.urandom(600).hex()  # 1200 bytes, 19 chunks of 64
+    path = tmp_path / "output.txt"
+    path.write_text(output)
+    client = offline_client(tmp_path)
+
+    submitted = client.submit_file(7, str(path), merkle=True, chunk_size=64, wait=False)
+    assert submitted["commitment"]["chunks"] == 19
+
+    result = client.auto_evaluate(7, output)
+    assert result["passed"], result["failures"]
+    assert result["output_hash"] == submitted["output_hash"]
+
+    tampered = client.auto_evaluate(7, output[:-1] + ("0" if output[-1] != "0" else "1"))
+    assert not tampered["passed"]
+    assert "output_hash: does not match the submitted commitment" in tampered["failures"]
+
+
+def test_flat_submission_still_checked_flat(tmp_path):
+    client = offline_client(tmp_path)
+    client.submit_work(8, "hello world", wait=False)
+    assert client.auto_evaluate(8, "hello world")["passed"]
+    assert not client.auto_evaluate(8, "hello world!")["passed"]
+
+
+def test_resubmitting_flat_after_merkle_clears_chunk_size(tmp_path):
+    path = tmp_path / "output.txt"
+    path.write_text("x" * 300)
+    client = offline_client(tmp_path)
+    client.submit_file(9, str(path), merkle=True, chunk_size=64, wait=False)
+    client.submit_work(9, "plain", wait=False)
+    assert client.auto_evaluate(9, "plain")["passed"]
+
+
+def test_rules_without_task_ignore_commitment():
+    assert RuleSet({"min_length": 3}).check("abcd")["passed"]
+
+
+def test_lengths_are_counted_in_bytes():
+    text = "é" * 60  # 60 characters, 120 bytes
+    result = RuleSet({"max_length": 100}).check(text)
+    assert not result["passed"]
+    assert result["output_length"] == 120
+    assert RuleSet({"min_length": 100}).check(text)["passed"]
+
+
+def test_missing_commitment_is_unverified_and_never_applied(tmp_path):
+    client = offline_client(tmp_path)  # no submission linked for task 10
+    sent = []
+    client.evaluate_task = lambda *args, **kwargs: sent.append(args) or {"success": True}
+
+    result = client.auto_evaluate(10, "looks fine", apply=True)
+    assert result["passed"] and not result["verified"]
+    assert "error" in result["evaluation"]
+
+    client.reader.read = lambda ids: [TASK for _ in ids]
+    rows = list(client.auto_evaluate_batch([(1, 10, "looks fine")], workers=1, apply=True))
+    assert rows[0]["skipped"] and "tx_hash" not in rows[0]
+    assert sent == []
+
+
+def test_linked_commitment_is_verified(tmp_path):
+    client = offline_client(tmp_path)
+    client.submit_work(11, "hello world", wait=False)
+    assert client.auto_evaluate(11, "hello world")["verified"]
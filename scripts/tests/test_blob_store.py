@@ -0,0 +1,101 @@
+import os
+import threading
+
+import pytest
+import requests
+from eth_hash.auto import keccak
+
+from blob_store import BlobStore, serve
+from hashing import merkle_from_chunks
+
+CHUNK = 64
+
+
+@pytest.fixture
+def peer(tmp_path):
+    store = BlobStore(str(tmp_path / "peer"))
+    server = serve(store, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield store, f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def stored_files(store: BlobStore) -> list:
+    return [name for _, _, names in os.walk(store.root) for name in names]
+
+
+def merkle_root(data: bytes) -> bytes:
+    return merkle_from_chunks((data[i:i + CHUNK] for i in range(0, len(data), CHUNK)), CHUNK)["root"]
+
+
+def test_put_with_wrong_content_is_rejected_and_deleted(peer):
+    store, url = peer
+    claimed = keccak(b"genuine output")
+    response = requests.put(f"{url}/blobs/{claimed.hex()}", data=os.urandom(4096))
+    assert response.status_code == 422
+    assert stored_files(store) == []
+
+
+def test_put_cannot_claim_a_merkle_root_with_its_own_chunk_size(peer):
+    store, url = peer
+    data = os.urandom(CHUNK * 5)
+    root = merkle_root(data)
+    response = requests.put(f"{url}/blobs/{root.hex()}", data=data, headers={"X-Merkle-Chunk-Size": str(CHUNK)})
+    assert response.status_code == 422
+    assert root not in store
+    assert stored_files(store) == []
+
+
+def test_put_of_flat_content_is_kept(peer):
+    store, url = peer
+    data = b"output " * 100
+    assert requests.put(f"{url}/blobs/{keccak(data).hex()}", data=data).status_code == 201
+    assert store.get(keccak(data)) == data
+
+
+def test_fetch_verifies_merkle_root_with_local_chunk_size(peer, tmp_path):
+    remote, url = peer
+    data = os.urandom(CHUNK * 5 + 3)
+    digest = remote.put(data)
+    root = merkle_root(data)
+    remote.alias(root, digest, CHUNK)
+
+    local = BlobStore(str(tmp_path / "local"), peers=[url])
+    # Without a chunk size of our own only flat hashes can be checked
+    assert local.get(root) is None
+    assert stored_files(local) == []
+    # With the wrong one the root doesn't match and nothing is kept
+    assert local.get(root, CHUNK * 2) is None
+    assert stored_files(local) == []
+    assert local.get(root, CHUNK) == data
+
+
+def test_push_sends_a_merkle_root_as_its_flat_blob(peer, tmp_path):
+    remote, url = peer
+    data = os.urandom(CHUNK * 3)
+    local = BlobStore(str(tmp_path / "local"))
+    digest = local.put(data)
+    root = merkle_root(data)
+    local.alias(root, digest, CHUNK)
+
+    assert local.push(url, root)
+    assert remote.get(digest) == data
+
+
+def test_get_text_does_not_inflate_past_the_limit(tmp_path, monkeypatch):
+    store = BlobStore(str(tmp_path / "blobs"))
+    big = store.put(b"a" * (4 << 20))  # compresses well, stored as zlib
+    small = store.put(b"b" * 1000)
+    monkeypatch.setattr("blob_store.zlib.decompress", lambda *args: pytest.fail("whole blob inflated"))
+
+    assert store.get_text(big, limit=1 << 20) is None
+    assert store.get_text(small, limit=1 << 20) == "b" * 1000
+    assert store.get_text(small, limit=999) is None
+
+
+def test_get_text_checks_raw_size_before_reading(tmp_path, monkeypatch):
+    store = BlobStore(str(tmp_path / "blobs"))
+    raw = store.put(os.urandom(4096))  # incompressible, stored raw
+    monkeypatch.setattr("blob_store._mapped_read", lambda path: pytest.fail("oversized blob read"))
+    assert store.get_text(raw, limit=1024) is None
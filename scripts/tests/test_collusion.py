@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from collusion import find_rings, load_votes
+from indexer import TaskStore
+
+ESCROW = "0x" + "33" * 20
+RING = ["0x" + c * 40 for c in ("1", "2", "3")]
+NOISE = "0x" + "9" * 40
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TaskStore(str(tmp_path / "tasks.db"))
+    yield store
+    store.close()
+
+
+def event(block: int, name: str, task_id: int, **args) -> dict:
+    return {
+        "block_number": block,
+        "log_index": 0,
+        "block_hash": "0x" + "%064x" % block,
+        "tx_hash": "0x" + "%064x" % (block * 1000 + task_id),
+        "address": ESCROW,
+        "kind": "escrow",
+        "event": name,
+        "task_id": task_id,
+        "args": args,
+    }
+
+
+def vote(store, block: int, task_id: int, juror: str, approve: bool):
+    store.add_events([event(block, "L3_Voted", task_id, juror=juror, approve=approve, votingPower=100)])
+
+
+def test_three_juror_ring_is_found_and_noise_juror_is_not(store):
+    rng = random.Random(7)
+    # Every event gets its own block, so (block_number, log_index) stays unique
+    block = 1
+    for task_id in range(1, 13):
+        ring_vote = task_id % 3 != 0
+        for juror in RING:
+            vote(store, block, task_id, juror, ring_vote)
+            block += 1
+        # The noise juror votes at random or against the ring, never as a bloc
+        vote(store, block, task_id, NOISE, rng.random() < 0.5 if task_id % 2 else not ring_vote)
+        block += 1
+        store.add_events([event(block, "DisputeResolved", task_id, workerWins=not ring_vote)])
+        block += 1
+
+    report = find_rings(load_votes(store))
+
+    assert report["jurors"] == 4
+    assert report["tasks"] == report["resolved"] == 12
+    ring = report["rings"][0]
+    assert ring["jurors"] == RING
+    assert NOISE not in ring["jurors"]
+    assert ring["size"] == 3 and ring["edges"] == 3
+    assert ring["mean_agreement"] == 1.0
+    assert ring["lost_together"] == 3 * 12
+    assert len(report["rings"]) == 1
+    assert all(NOISE not in pair["jurors"] for pair in report["top_pairs"])
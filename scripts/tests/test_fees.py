@@ -0,0 +1,102 @@
+from concurrent.futures import Future
+
+import pytest
+from eth_account import Account
+
+from fees import GasEstimator
+from judgepay import JudgePayClient
+from nonce_manager import NonceManager
+
+KEY = "0x" + "11" * 32
+CONTRACT = "0x" + "22" * 20
+BASE_GAS = 30_000
+ITEM_GAS = 35_000
+
+
+def batch_size(tx: dict) -> int:
+    # approveMany(uint256[]): selector, offset word, then the array length
+    data = bytes.fromhex(tx["data"][2:])
+    return int.from_bytes(data[36:68], "big")
+
+
+class FakeEth:
+    def __init__(self):
+        self.processed = None  # items the node would actually settle, None = all
+
+    def estimate_gas(self, tx):
+        if self.processed == "fail":
+            raise ValueError("execution reverted")
+        items = batch_size(tx) if self.processed is None else self.processed
+        return BASE_GAS + ITEM_GAS * items
+
+
+class FakeWeb3:
+    def __init__(self):
+        self.eth = FakeEth()
+
+
+class FakeFees:
+    def fees(self, speed):
+        return {"maxFeePerGas": 2, "maxPriorityFeePerGas": 1}
+
+
+class FakeReceipts:
+    def track(self, tx_hash):
+        future = Future()
+        future.set_result({"status": 1, "logs": [], "gasUsed": 0})
+        return future
+
+
+@pytest.fixture
+def client():
+    client = JudgePayClient(rpc_url="http://127.0.0.1:1", contract_address=CONTRACT, private_key=KEY, blob_dir="")
+    client._w3 = FakeWeb3()
+    client._chain_id = 84532
+    client._fees = FakeFees()
+    client._receipts = FakeReceipts()
+    client._nonces = NonceManager()
+    client._nonces.sync(Account.from_key(KEY).address, 0)
+    client.signed = []
+    client._sign = lambda account, tx: client.signed.append(tx) or b"raw"
+    client._broadcast = lambda raw: b"\xaa" * 32
+    return client
+
+
+def test_small_batch_limit_is_not_reused_for_a_large_one(client):
+    client.settle_many("approve-many", [1, 2])
+    client.settle_many("approve-many", list(range(1, 201)), chunk=200)
+    small, large = client.signed
+    assert small["gas"] >= BASE_GAS + ITEM_GAS * 2
+    assert large["gas"] >= BASE_GAS + ITEM_GAS * 200
+
+
+def test_estimate_with_most_items_skipped_still_covers_the_batch(client):
+    client.settle_many("approve-many", [1, 2])
+    # Estimated while 190 of the 200 tasks would still be skipped
+    client._w3.eth.processed = 10
+    client.settle_many("approve-many", list(range(1, 201)), chunk=200)
+    assert client.signed[-1]["gas"] >= BASE_GAS + ITEM_GAS * 200
+
+
+def test_failed_estimate_scales_the_per_item_cost(client):
+    client.settle_many("approve-many", [1, 2])
+    client._w3.eth.processed = "fail"
+    client.settle_many("approve-many", list(range(1, 201)), chunk=200)
+    assert client.signed[-1]["gas"] >= BASE_GAS + ITEM_GAS * 200
+
+
+def test_scalar_functions_keep_their_learned_limit():
+    gas = GasEstimator(FakeWeb3())
+    tx = {"to": CONTRACT, "data": "0x12345678" + "00" * 64}
+    first = gas.gas_limit(tx, 1)
+    gas.w3.eth.processed = "fail"
+    assert gas.gas_limit(tx, 1) == first
+
+
+def test_unestimable_batch_without_history_uses_the_fallback():
+    gas = GasEstimator(FakeWeb3())
+    gas.w3.eth.processed = "fail"
+    tx = {"to": CONTRACT, "data": "0x12345678"}
+    assert gas.gas_limit(tx, 500_000, items=5) == 500_000
+    with pytest.raises(ValueError):
+        gas.gas_limit(tx, None, items=5)
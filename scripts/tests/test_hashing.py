@@ -0,0 +1,80 @@
+import os
+import sys
+
+import pytest
+from eth_hash.auto import keccak
+
+from hashing import leaf_count, merkle_commitment, merkle_from_chunks, merkle_proof, verify_chunk
+
+CHUNK = 64
+
+
+def commit(data: bytes, chunk_size: int = CHUNK) -> dict:
+    return merkle_from_chunks((data[i:i + chunk_size] for i in range(0, len(data), chunk_size)), chunk_size)
+
+
+def test_every_chunk_verifies(tmp_path):
+    data = os.urandom(CHUNK * 6 + 17)
+    path = tmp_path / "output.bin"
+    path.write_bytes(data)
+    commitment = merkle_commitment(str(path), CHUNK)
+    assert commitment == commit(data)
+    assert len(commitment["leaves"]) == leaf_count(len(data), CHUNK) == 7
+
+    for index in range(7):
+        chunk = data[index * CHUNK:(index + 1) * CHUNK]
+        proof = merkle_proof(commitment["leaves"], index)
+        assert verify_chunk(chunk, index, proof, commitment["root"], CHUNK, len(data))
+
+
+def test_root_is_not_the_flat_digest():
+    data = b"x" * CHUNK
+    assert commit(data)["root"] != keccak(data)
+
+
+def test_inner_node_preimage_is_rejected():
+    # Second preimage: present two leaf hashes, concatenated, as a single chunk
+    data = os.urandom(CHUNK * 4)
+    commitment = commit(data)
+    leaves = commitment["leaves"]
+    forged = leaves[0] + leaves[1]
+    assert len(forged) == CHUNK
+    proof = merkle_proof(leaves, 0)[1:]
+
+    assert not verify_chunk(forged, 0, proof, commitment["root"], CHUNK, len(data))
+    # Nor under a chunking that would make the forged chunk the right size for a shorter tree
+    for length in (CHUNK * 2, len(data)):
+        assert not verify_chunk(forged, 0, proof, commitment["root"], CHUNK, length)
+
+
+def test_chunk_size_and_length_are_bound():
+    data = os.urandom(CHUNK * 4)
+    commitment = commit(data)
+    chunk = data[:CHUNK]
+    proof = merkle_proof(commitment["leaves"], 0)
+
+    assert verify_chunk(chunk, 0, proof, commitment["root"], CHUNK, len(data))
+    assert not verify_chunk(chunk, 0, proof, commitment["root"], CHUNK, len(data) + 1)
+    assert not verify_chunk(chunk, 0, proof, commitment["root"], CHUNK * 2, len(data))
+    assert commit(data, CHUNK * 2)["root"] != commitment["root"]
+
+
+def test_carried_up_node_cannot_stand_in_for_a_pair():
+    data = os.urandom(CHUNK * 3)
+    commitment = commit(data)
+    last = data[2 * CHUNK:]
+    proof = merkle_proof(commitment["leaves"], 2)
+    assert proof[0] is None
+    assert verify_chunk(last, 2, proof, commitment["root"], CHUNK, len(data))
+    # Claiming a sibling where the tree has none fails
+    assert not verify_chunk(last, 2, [commitment["leaves"][0]] + proof[1:], commitment["root"], CHUNK, len(data))
+
+
+def test_submit_rejects_merkle_for_inline_output(monkeypatch, capsys):
+    import judgepay
+
+    monkeypatch.setattr(sys, "argv", ["judgepay.py", "submit", "1", "--output", "done", "--merkle"])
+    with pytest.raises(SystemExit) as exit_info:
+        judgepay.main()
+    assert exit_info.value.code == 2
+    assert "--merkle needs --file" in capsys.readouterr().err
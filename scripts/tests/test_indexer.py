@@ -0,0 +1,165 @@
+import pytest
+from eth_abi import encode
+from eth_hash.auto import keccak
+
+from abi_cache import checksum_address, signature
+from indexer import Indexer, TaskStore
+from task_events import LITE_EVENTS_ABI
+
+LITE = "0x" + "22" * 20
+ALICE = "0x" + "a1" * 20
+BOB = "0x" + "b0" * 20
+CAROL = "0x" + "c0" * 20
+EVENTS = {abi["name"]: abi for abi in LITE_EVENTS_ABI}
+
+
+class RangeTooLarge(Exception):
+    pass
+
+
+class FakeEth:
+    """A chain of block hashes plus logs; forks replace everything from a height up."""
+
+    def __init__(self, head: int, max_range: int = None):
+        self.block_number = head
+        self.max_range = max_range
+        self.hashes = {n: keccak(b"main%d" % n) for n in range(head + 1)}
+        self.logs = []
+        self.queries = []
+
+    def log(self, block: int, name: str, task_id: int, **args):
+        abi = EVENTS[name]
+        topics = [keccak(signature(abi).encode())]
+        plain_types, plain_values = [], []
+        for item in abi["inputs"]:
+            value = task_id if item is abi["inputs"][0] else args[item["name"]]
+            if item["indexed"]:
+                topics.append(encode([item["type"]], [value]))
+            else:
+                plain_types.append(item["type"])
+                plain_values.append(value)
+        self.logs.append({
+            "address": LITE,
+            "topics": topics,
+            "data": encode(plain_types, plain_values),
+            "blockNumber": block,
+            "blockHash": self.hashes[block],
+            "transactionHash": keccak(b"tx%d-%d" % (block, len(self.logs))),
+            "logIndex": sum(1 for log in self.logs if log["blockNumber"] == block),
+        })
+
+    def fork(self, from_block: int):
+        for n in range(from_block, self.block_number + 1):
+            self.hashes[n] = keccak(b"fork%d" % n)
+        self.logs = [log for log in self.logs if log["blockNumber"] < from_block]
+
+    def get_logs(self, params):
+        lo, hi = params["fromBlock"], params["toBlock"]
+        self.queries.append((lo, hi))
+        if self.max_range and hi - lo + 1 > self.max_range:
+            raise RangeTooLarge({"code": -32005, "message": "query returned more than 10000 results"})
+        return [log for log in self.logs if lo <= log["blockNumber"] <= hi]
+
+    def get_block(self, number):
+        return {"hash": self.hashes[number]}
+
+
+class FakeWeb3:
+    def __init__(self, head: int, max_range: int = None):
+        self.eth = FakeEth(head, max_range)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TaskStore(str(tmp_path / "tasks.db"))
+    yield store
+    store.close()
+
+
+def indexer_for(w3, store, **kwargs) -> Indexer:
+    return Indexer(w3, store, [LITE], confirmations=0, **kwargs)
+
+
+def statuses(store) -> dict:
+    return {row["task_id"]: row["status"] for row in store.find_tasks()}
+
+
+def test_reorg_rolls_back_and_replays_the_canonical_chain(store):
+    w3 = FakeWeb3(head=30)
+    w3.eth.log(5, "TaskCreated", 1, requester=ALICE, amount=10)
+    w3.eth.log(12, "WorkSubmitted", 1, worker=BOB)
+    w3.eth.log(21, "TaskCompleted", 1, amount=10)
+    w3.eth.log(22, "TaskCreated", 2, requester=ALICE, amount=20)
+    indexer = indexer_for(w3, store, chunk_size=10, workers=2)
+
+    assert indexer.sync() == 4
+    assert statuses(store) == {1: "Completed", 2: "Open"}
+
+    # Blocks 20+ are replaced: task 1 is refunded instead, task 2 never existed
+    w3.eth.fork(20)
+    w3.eth.log(25, "TaskRefunded", 1, amount=10)
+    assert indexer.sync() == 1
+
+    assert statuses(store) == {1: "Refunded"}
+    assert store.find_tasks()[0]["worker"] == checksum_address(BOB)
+    assert [ev["event"] for ev in store.task_events(LITE, 1)] == ["TaskCreated", "WorkSubmitted", "TaskRefunded"]
+    assert store.checkpoint() == 30
+    assert dict(store.recent_blocks())[30] == "0x" + w3.eth.hashes[30].hex()
+
+
+def test_reorg_past_every_checkpoint_reindexes_from_start(store):
+    w3 = FakeWeb3(head=9)
+    w3.eth.log(3, "TaskCreated", 1, requester=ALICE, amount=10)
+    indexer = indexer_for(w3, store, chunk_size=5)
+    indexer.sync()
+
+    w3.eth.fork(0)
+    w3.eth.log(4, "TaskCreated", 7, requester=CAROL, amount=5)
+    indexer.sync()
+    assert statuses(store) == {7: "Open"}
+
+
+def test_fetch_logs_splits_ranges_the_node_refuses(store):
+    w3 = FakeWeb3(head=100, max_range=16)
+    for block in (1, 40, 63, 64, 99):
+        w3.eth.log(block, "TaskCreated", block, requester=ALICE, amount=1)
+    indexer = indexer_for(w3, store)
+
+    logs = indexer.fetch_logs(0, 99)
+    assert [log["blockNumber"] for log in logs] == [1, 40, 63, 64, 99]
+    answered = [(lo, hi) for lo, hi in w3.eth.queries if hi - lo + 1 <= 16]
+    # The answered ranges tile 0..99 exactly, in order
+    assert answered[0][0] == 0 and answered[-1][1] == 99
+    assert all(a[1] + 1 == b[0] for a, b in zip(answered, answered[1:]))
+
+
+def test_fetch_logs_reraises_other_errors(store):
+    w3 = FakeWeb3(head=10)
+
+    def broken(params):
+        raise ValueError("execution aborted (timeout = 5s)")
+
+    w3.eth.get_logs = broken
+    with pytest.raises(ValueError):
+        indexer_for(w3, store).fetch_logs(0, 10)
+
+
+def test_find_tasks_filters(store):
+    w3 = FakeWeb3(head=10)
+    w3.eth.log(1, "TaskCreated", 1, requester=ALICE, amount=10)
+    w3.eth.log(1, "TaskCreated", 2, requester=ALICE, amount=20)
+    w3.eth.log(2, "TaskCreated", 3, requester=CAROL, amount=30)
+    w3.eth.log(3, "WorkSubmitted", 1, worker=BOB)
+    w3.eth.log(4, "WorkSubmitted", 3, worker=BOB)
+    w3.eth.log(5, "TaskCompleted", 3, amount=30)
+    indexer_for(w3, store).sync()
+
+    ids = lambda rows: [row["task_id"] for row in rows]
+    assert ids(store.find_tasks()) == [1, 2, 3]
+    assert ids(store.find_tasks(requester=ALICE)) == [1, 2]
+    assert ids(store.find_tasks(requester=ALICE.upper().replace("0X", "0x"))) == [1, 2]
+    assert ids(store.find_tasks(worker=BOB)) == [1, 3]
+    assert ids(store.find_tasks(status="submitted")) == [1]
+    assert ids(store.find_tasks(worker=BOB, status="Completed")) == [3]
+    assert ids(store.find_tasks(requester=CAROL, worker=BOB, status="Open")) == []
+    assert ids(store.find_tasks(limit=2)) == [1, 2]
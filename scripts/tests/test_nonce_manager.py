@@ -0,0 +1,93 @@
+from eth_hash.auto import keccak
+
+from judgepay import JudgePayClient
+from nonce_manager import NonceManager, is_already_known, is_nonce_error
+
+
+class FakeEth:
+    def __init__(self, error):
+        self.error = error
+        self.sent = []
+
+    def send_raw_transaction(self, raw):
+        self.sent.append(raw)
+        raise ValueError({"code": -32000, "message": self.error})
+
+
+class FakeWeb3:
+    def __init__(self, error, pending=7):
+        self.eth = FakeEth(error)
+        self.pending = pending
+        self.eth.get_transaction_count = lambda address, block: self.pending
+
+
+def client_with(w3):
+    client = JudgePayClient(rpc_url="http://127.0.0.1:1", blob_dir="")
+    client._w3 = w3
+    return client
+
+
+def test_already_known_is_not_a_nonce_error():
+    assert is_already_known(ValueError("already known"))
+    assert is_already_known(ValueError("known transaction: 0xabc"))
+    assert not is_nonce_error(ValueError("already known"))
+    assert is_nonce_error(ValueError("nonce too low"))
+
+
+def test_already_known_broadcast_returns_payload_hash_without_resending():
+    w3 = FakeWeb3("already known")
+    client = client_with(w3)
+    nonces = NonceManager(w3)
+    raw = b"\x02signed-payload"
+
+    tx_hash = nonces.send("0xabc", lambda nonce: client._broadcast(raw))
+
+    assert tx_hash == keccak(raw)
+    assert w3.eth.sent == [raw]
+    # The nonce stays spent: the next send gets the following one
+    assert nonces.reserve("0xabc") == 8
+
+
+def test_nonce_error_still_resyncs_and_retries():
+    w3 = FakeWeb3("nonce too low")
+    client = client_with(w3)
+    nonces = NonceManager(w3)
+    tried = []
+
+    def send(nonce):
+        tried.append(nonce)
+        return client._broadcast(b"payload")
+
+    try:
+        nonces.send("0xabc", send, retries=1)
+    except ValueError:
+        pass
+    assert tried == [7, 7]
+
+
+def test_send_async_seeds_once_and_resyncs_on_nonce_errors():
+    import asyncio
+
+    nonces = NonceManager()
+    used = {3}  # taken by another process after our view of the chain was read
+    fetches = []
+
+    async def chain_nonce():
+        fetches.append(1)
+        await asyncio.sleep(0)
+        return 3 if len(fetches) <= 4 else max(used) + 1
+
+    async def send(nonce):
+        await asyncio.sleep(0)
+        if nonce in used:
+            raise ValueError("nonce too low")
+        used.add(nonce)
+        return nonce
+
+    async def run():
+        return await asyncio.gather(*(nonces.send_async("0xabc", send, chain_nonce) for _ in range(4)))
+
+    sent = asyncio.run(run())
+    # Four first sends fetch at once but seed once; the stale nonce 3 is resynced past
+    assert sorted(sent) == [4, 5, 6, 7]
+    assert len(fetches) == 5
@@ -0,0 +1,129 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from rpc_router import RpcRouter, _throttled
+
+
+class FakeNode:
+    """A local JSON-RPC node answering every call with `reply(request)`."""
+
+    def __init__(self, reply):
+        self.calls = []
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                node.calls.append(request)
+                status, payload = reply(request)
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def result(value):
+    return lambda request: (200, {"jsonrpc": "2.0", "id": request["id"], "result": value})
+
+
+def error(code, message, status=200):
+    return lambda request: (status, {"jsonrpc": "2.0", "id": request["id"], "error": {"code": code, "message": message}})
+
+
+@pytest.fixture
+def nodes():
+    started = []
+
+    def start(reply):
+        node = FakeNode(reply)
+        started.append(node)
+        return node
+
+    yield start
+    for node in started:
+        node.close()
+
+
+def call(method, *params):
+    return json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": list(params)}).encode()
+
+
+def test_only_explicit_rate_limit_errors_count_as_throttling():
+    assert _throttled({"error": {"code": -32005, "message": "limit"}})
+    assert _throttled({"error": {"code": -32000, "message": "Rate limit reached"}})
+    assert _throttled({"error": {"code": -32000, "message": "Too Many Requests"}})
+    assert not _throttled({"error": {"code": 3, "message": "execution reverted: allowance exceeded"}})
+    assert not _throttled({"error": {"code": -32000, "message": "gas required exceeds allowance (30000000)"}})
+    assert not _throttled({"error": {"code": -32000, "message": "insufficient capacity in pool"}})
+
+
+def test_revert_mentioning_exceeded_is_returned_not_failed_over(nodes):
+    reverting = nodes(error(3, "execution reverted: ERC20: transfer amount exceeded"))
+    other = nodes(result("0x"))
+    router = RpcRouter([reverting.url, other.url])
+    router.endpoints[1].latency = 1.0  # rank the reverting node first
+
+    reply = router.request(call("eth_call", {}, "latest"), ["eth_call"])
+
+    assert reply["error"]["message"].endswith("transfer amount exceeded")
+    assert other.calls == []
+    assert router.endpoints[0].backoff_until == 0.0
+    router.close()
+
+
+def test_rate_limited_node_is_backed_off_and_read_fails_over(nodes):
+    limited = nodes(error(-32000, "rate limit exceeded"))
+    healthy = nodes(result("0x10"))
+    router = RpcRouter([limited.url, healthy.url])
+    router.endpoints[1].latency = 1.0
+
+    assert router.request(call("eth_blockNumber"), ["eth_blockNumber"])["result"] == "0x10"
+    assert router.ranked()[0].url == healthy.url
+    router.close()
+
+    too_many = nodes(error(-32000, "busy", status=429))
+    router = RpcRouter([too_many.url, healthy.url])
+    router.endpoints[1].latency = 1.0
+    assert router.request(call("eth_blockNumber"), ["eth_blockNumber"])["result"] == "0x10"
+    assert router.ranked()[0].url == healthy.url
+    router.close()
+
+
+def test_async_client_reads_through_the_router(nodes):
+    import asyncio
+
+    from async_client import AsyncJudgePayClient
+
+    down = nodes(lambda request: (503, {}))
+    chain = {"eth_chainId": "0x14a34", "eth_blockNumber": "0x2a"}
+    up = nodes(lambda request: (200, {"jsonrpc": "2.0", "id": request["id"], "result": chain[request["method"]]}))
+
+    async def run():
+        async with AsyncJudgePayClient(rpc_url=f"{down.url},{up.url}", blob_dir=None) as client:
+            # Unmeasured endpoints rank first, so the broken node is tried before being backed off
+            client.router.endpoints[1].latency = 1.0
+            chain_ids = await asyncio.gather(*(client.w3.eth.chain_id for _ in range(8)))
+            block = await client.w3.eth.block_number
+            return chain_ids, block, client.rpc_url
+
+    chain_ids, block, preferred = asyncio.run(run())
+    assert chain_ids == [84532] * 8
+    assert block == 42
+    assert preferred == up.url
+    assert down.calls and len(up.calls) >= 9
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+JudgePay - Task status streaming
+Push decoded task status transitions as they happen, over eth_subscribe when
+a WebSocket endpoint is configured and an eth_getFilterChanges loop otherwise.
+"""
+
+import os
+import time
+
+from abi_cache import checksum_address
+from task_events import ALL_TOPICS, decode_log, status_after
+
+WS_RPC = os.getenv("USDC_WS_RPC_BASE", "")
+DEFAULT_POLL_INTERVAL = 2.0
+
+
+class TaskWatcher:
+    """
+    Select JudgePay events by task ID, requester or worker.
+
+    With only task IDs the selection is pushed to the node as a topic
+    filter. Requesters and workers only appear on some events, so for those
+    every JudgePay log is fetched and filtered here. Tasks seen being created
+    by a watched requester (or taken by a watched worker) are followed from
+    then on; `seed_tasks` adds tasks known from elsewhere, e.g. the indexer.
+    With no criteria at all every transition is emitted.
+    """
+
+    def __init__(self, addresses: list, task_ids=None, requesters=None, workers=None):
+        self.addresses = [checksum_address(a) for a in addresses]
+        self.task_ids = set(task_ids or [])
+        self.requesters = {checksum_address(a) for a in requesters or []}
+        self.workers = {checksum_address(a) for a in workers or []}
+        self._followed = set()
+
+    def seed_tasks(self, keys):
+        """Follow (contract address, task ID) pairs found elsewhere."""
+        self._followed.update((checksum_address(a), t) for a, t in keys)
+
+    @property
+    def watch_all(self) -> bool:
+        return not (self.task_ids or self.requesters or self.workers)
+
+    def log_filter(self) -> dict:
+        """eth_getLogs-style filter covering everything this watcher needs."""
+        topics = [ALL_TOPICS]
+        if self.task_ids and not (self.requesters or self.workers):
+            topics.append(["0x" + t.to_bytes(32, "big").hex() for t in sorted(self.task_ids)])
+        return {"address": self.addresses, "topics": topics}
+
+    def transition(self, log):
+        """Decode a log into a status transition, or None if it isn't watched."""
+        ev = decode_log(log)
+        if ev is None:
+            return None
+
+        key = (ev["address"], ev["task_id"])
+        args = ev["args"]
+        if args.get("requester") in self.requesters or args.get("worker") in self.workers:
+            self._followed.add(key)
+
+        if not (self.watch_all or ev["task_id"] in self.task_ids or key in self._followed):
+            return None
+
+        transition = {
+            "task_id": ev["task_id"],
+            "contract": ev["address"],
+            "event": ev["event"],
+            "status": status_after(ev["event"], args),
+            "block_number": ev["block_number"],
+            "tx_hash": ev["tx_hash"],
+        }
+        transition.update({k: v for k, v in args.items() if k not in ("id", "taskId")})
+        return transition
+
+    def poll(self, w3, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        Yield transitions from an eth_newFilter / eth_getFilterChanges loop.
+
+        One request per interval covers every watched task; the filter is
+        recreated if the node drops it.
+        """
+        log_filter = w3.eth.filter(dict(self.log_filter(), fromBlock="latest"))
+        while True:
+            try:
+                logs = log_filter.get_new_entries()
+            except Exception as exc:
+                if "filter not found" not in str(exc).lower():
+                    raise
+                log_filter = w3.eth.filter(dict(self.log_filter(), fromBlock="latest"))
+                continue
+            for log in logs:
+                transition = self.transition(log)
+                if transition is not None:
+                    yield transition
+            time.sleep(poll_interval)
+
+    async def subscribe(self, ws_url: str):
+        """Async-yield transitions pushed over an eth_subscribe("logs") WebSocket."""
+        from web3 import AsyncWeb3, WebSocketProvider
+
+        async with AsyncWeb3(WebSocketProvider(ws_url)) as w3:
+            await w3.eth.subscribe("logs", self.log_filter())
+            async for payload in w3.socket.process_subscriptions():
+                log = payload.get("result")
+                if log is None or log.get("removed"):
+                    continue
+                transition = self.transition(log)
+                if transition is not None:
+                    yield transition
@@ -0,0 +1,116 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+import "./utils/EscrowFixture.sol";
+
+contract JudgePayEscrowJuryPoolTest is EscrowFixture {
+    function setUp() public {
+        _deployEscrow();
+    }
+
+    function _poolSize() internal view returns (uint256 size) {
+        while (true) {
+            try escrow.activeJurorPool(size) {
+                ++size;
+            } catch {
+                return size;
+            }
+        }
+    }
+
+    function test_JurorsActivateOnlyAfterMaturity() public {
+        address juror = address(0x1234);
+        vm.prank(juror);
+        escrow.registerAsJuror();
+        assertEq(escrow.poolIndex(juror), 0);
+
+        vm.warp(block.timestamp + escrow.JUROR_MATURITY() - 1);
+        assertEq(escrow.promoteMatureJurors(10), 0);
+
+        vm.warp(block.timestamp + 1);
+        assertEq(escrow.promoteMatureJurors(10), 1);
+        assertEq(escrow.poolIndex(juror), 1);
+        assertEq(escrow.activeJurorPool(0), juror);
+    }
+
+    function test_RegistrationsAdvanceTheQueue() public {
+        address early = address(0x1111);
+        vm.prank(early);
+        escrow.registerAsJuror();
+        vm.warp(block.timestamp + escrow.JUROR_MATURITY());
+
+        // The next registration promotes the matured one on its way in
+        vm.prank(address(0x2222));
+        escrow.registerAsJuror();
+        assertEq(escrow.poolIndex(early), 1);
+        assertEq(escrow.poolIndex(address(0x2222)), 0);
+    }
+
+    function test_UnregisterSwapsAndPops() public {
+        _registerJurors(4);
+        vm.prank(pool[1]);
+        escrow.unregisterAsJuror();
+
+        assertEq(_poolSize(), 3);
+        assertEq(escrow.poolIndex(pool[1]), 0);
+        assertEq(escrow.activeJurorPool(1), pool[3]);
+        assertEq(escrow.poolIndex(pool[3]), 2);
+        assertFalse(escrow.isJurorInPool(pool[1]));
+
+        vm.prank(pool[1]);
+        vm.expectRevert("Not registered");
+        escrow.unregisterAsJuror();
+    }
+
+    function test_UnregisteredPendingJurorIsSkipped() public {
+        address juror = address(0x1234);
+        vm.startPrank(juror);
+        escrow.registerAsJuror();
+        escrow.unregisterAsJuror();
+        vm.stopPrank();
+
+        vm.warp(block.timestamp + escrow.JUROR_MATURITY());
+        assertEq(escrow.promoteMatureJurors(10), 0);
+        assertEq(escrow.pendingHead(), 1);
+        assertEq(_poolSize(), 0);
+    }
+
+    function test_SelectionFillsJuryAndSkipsParties() public {
+        _registerJurors(10);
+        for (uint256 i; i < 2; ++i) {
+            address party = i == 0 ? requester : worker;
+            vm.prank(party);
+            escrow.registerAsJuror();
+        }
+        vm.warp(block.timestamp + escrow.JUROR_MATURITY());
+        escrow.promoteMatureJurors(2);
+        assertEq(_poolSize(), 12);
+
+        // Every non-party juror is needed, so any wasted draw would leave a seat empty
+        uint256 taskId = _disputedTask(10, 99);
+        assertEq(_selectedJurors(taskId).length, 10);
+        assertFalse(escrow.isSelectedJuror(taskId, requester));
+        assertFalse(escrow.isSelectedJuror(taskId, worker));
+    }
+
+    function _selectionGas(uint256 jurySize, uint256 seed) internal returns (uint256 used) {
+        _openDispute(jurySize);
+        uint256 requestId = vrf.nextRequestId() - 1;
+        vm.cool(address(escrow));
+        uint256 before = gasleft();
+        vrf.fulfill(requestId, seed);
+        used = before - gasleft();
+    }
+
+    function test_SelectionGasIsFlatInPoolSize() public {
+        _registerJurors(100);
+        uint256 small = _selectionGas(20, 5);
+        _registerJurors(1900);
+        uint256 large = _selectionGas(20, 6);
+
+        emit log_named_uint("selection gas, pool of 100", small);
+        emit log_named_uint("selection gas, pool of 2000", large);
+        assertApproxEqRel(large, small, 0.05e18, "selection gas grows with pool size");
+        assertLt(large, escrow.vrfCallbackGasLimit());
+    }
+}
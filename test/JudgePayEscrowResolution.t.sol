@@ -0,0 +1,89 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+import "./utils/EscrowFixture.sol";
+
+contract JudgePayEscrowResolutionTest is EscrowFixture {
+    function setUp() public {
+        _deployEscrow();
+        _registerJurors(300);
+    }
+
+    /// @dev All but the last juror vote `approve`; returns the gas of the final vote
+    function _voteAll(uint256 taskId, bool approve) internal returns (uint256 lastVoteGas) {
+        address[] memory selected = _selectedJurors(taskId);
+        for (uint256 i; i + 1 < selected.length; ++i) {
+            vm.prank(selected[i]);
+            escrow.castVote(taskId, approve);
+        }
+        vm.cool(address(escrow));
+        vm.prank(selected[selected.length - 1]);
+        uint256 before = gasleft();
+        escrow.castVote(taskId, approve);
+        lastVoteGas = before - gasleft();
+    }
+
+    function _pending(uint256 taskId) internal view returns (bool pending) {
+        (,,, pending) = escrow.juryResolutions(taskId);
+    }
+
+    function test_SmallJuryResolvesInline() public {
+        uint256 taskId = _disputedTask(5, 1);
+        _voteAll(taskId, true);
+
+        assertFalse(_pending(taskId));
+        assertEq(escrow.resolutionStepsLeft(taskId), 0);
+        assertEq(token.balanceOf(worker), AMOUNT);
+
+        address[] memory selected = _selectedJurors(taskId);
+        for (uint256 i; i < selected.length; ++i) {
+            (uint256 correctVotes, uint256 totalVotes,,,,,) = escrow.jurors(selected[i]);
+            assertEq(totalVotes, 1);
+            assertEq(correctVotes, 1);
+        }
+        assertEq(escrow.votingCorrelation(selected[0], selected[4]), 1);
+        assertEq(escrow.votingCorrelation(selected[4], selected[0]), 1);
+
+        vm.expectRevert("Nothing pending");
+        escrow.processResolution(taskId, 10);
+    }
+
+    function test_FinalVoteGasIsBoundedInJurySize() public {
+        uint256 small = _voteAll(_disputedTask(20, 2), true);
+        uint256 large = _voteAll(_disputedTask(150, 3), true);
+        emit log_named_uint("final vote gas, jury of 20", small);
+        emit log_named_uint("final vote gas, jury of 150", large);
+
+        // Jurors shared with the first task make some correlation writes cheaper, never dearer
+        assertLe(large, small * 105 / 100, "final vote gas grows with jury size");
+        assertLt(large, 2_000_000);
+    }
+
+    function test_LargeJuryPaysOutThenProcessesInChunks() public {
+        uint256 taskId = _disputedTask(100, 4);
+        _voteAll(taskId, false);
+
+        // Funds move with the final vote, bookkeeping is still outstanding
+        assertEq(escrow.totalLockedEscrow(), 0);
+        assertTrue(_pending(taskId));
+        uint256 left = escrow.resolutionStepsLeft(taskId);
+        assertEq(left, 100 * 99 / 2 + 100 - escrow.INLINE_RESOLUTION_STEPS());
+
+        uint256 calls;
+        while (!escrow.processResolution(taskId, 700)) {
+            ++calls;
+            assertEq(escrow.resolutionStepsLeft(taskId), left - 700 * calls);
+        }
+        assertEq(escrow.resolutionStepsLeft(taskId), 0);
+        assertFalse(_pending(taskId));
+
+        address[] memory selected = _selectedJurors(taskId);
+        for (uint256 i; i < selected.length; ++i) {
+            (uint256 correctVotes, uint256 totalVotes,,,,,) = escrow.jurors(selected[i]);
+            assertEq(totalVotes, 1);
+            assertEq(correctVotes, 0); // no voting power on either side, so the tie went to the worker
+        }
+        assertEq(escrow.votingCorrelation(selected[0], selected[99]), 1);
+        assertEq(escrow.votingCorrelation(selected[42], selected[17]), 1);
+    }
+}
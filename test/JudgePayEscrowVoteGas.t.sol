@@ -0,0 +1,101 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+import "./utils/EscrowFixture.sol";
+
+contract JudgePayEscrowVoteGasTest is EscrowFixture {
+    mapping(address => bool) internal hasVotedBefore;
+
+    function setUp() public {
+        _deployEscrow();
+        _registerJurors(300);
+    }
+
+    /// @dev Gas of one (non-final) vote by a juror voting for the first time, with cold storage
+    function _voteGas(uint256 taskId) internal returns (uint256 used) {
+        address[] memory selected = _selectedJurors(taskId);
+        address juror;
+        for (uint256 i; i < selected.length; ++i) {
+            if (!hasVotedBefore[selected[i]]) {
+                juror = selected[i];
+                break;
+            }
+        }
+        require(juror != address(0), "No fresh juror");
+        hasVotedBefore[juror] = true;
+
+        vm.cool(address(escrow));
+        vm.prank(juror);
+        uint256 before = gasleft();
+        escrow.castVote(taskId, true);
+        used = before - gasleft();
+    }
+
+    function test_CastVoteGasIsFlatInJurySize() public {
+        uint256[5] memory sizes = [uint256(3), 10, 50, 100, 150];
+        uint256 baseline;
+        for (uint256 i; i < sizes.length; ++i) {
+            uint256 taskId = _disputedTask(sizes[i], uint256(keccak256(abi.encode(i))));
+            assertEq(_selectedJurors(taskId).length, sizes[i], "jury not filled");
+
+            uint256 used = _voteGas(taskId);
+            emit log_named_uint(string.concat("castVote gas, jury of ", vm.toString(sizes[i])), used);
+            if (i == 0) baseline = used;
+            assertApproxEqRel(used, baseline, 0.01e18, "castVote gas grows with jury size");
+        }
+    }
+
+    function test_JurorsAreSelectedOnce() public {
+        uint256 taskId = _disputedTask(50, 42);
+        // 50 distinct flagged jurors and exactly 50 seats means no juror holds two
+        assertEq(_selectedJurors(taskId).length, 50);
+        for (uint256 i; i < 50; ++i) {
+            assertTrue(escrow.isSelectedJuror(taskId, escrow.taskJurors(taskId, i)));
+        }
+        vm.expectRevert();
+        escrow.taskJurors(taskId, 50);
+    }
+
+    function test_WholePoolJuryResolves() public {
+        // Every pool juror is drawn; a juror seated twice would leave votesCast short forever
+        uint256 taskId = _disputedTask(pool.length, 13);
+        address[] memory selected = _selectedJurors(taskId);
+        assertEq(selected.length, pool.length);
+        for (uint256 i; i < selected.length; ++i) {
+            vm.prank(selected[i]);
+            escrow.castVote(taskId, true);
+        }
+        assertEq(escrow.votesCast(taskId), pool.length);
+        assertEq(escrow.totalLockedEscrow(), 0);
+        assertEq(token.balanceOf(worker), AMOUNT);
+    }
+
+    function test_CastVoteRejectsOutsidersAndRepeats() public {
+        uint256 taskId = _disputedTask(3, 7);
+        address[] memory selected = _selectedJurors(taskId);
+
+        vm.prank(requester);
+        vm.expectRevert("Not selected");
+        escrow.castVote(taskId, true);
+
+        vm.prank(selected[0]);
+        escrow.castVote(taskId, true);
+        vm.prank(selected[0]);
+        vm.expectRevert("Already voted");
+        escrow.castVote(taskId, false);
+        assertEq(escrow.votesCast(taskId), 1);
+    }
+
+    function test_LastVoteResolves() public {
+        uint256 taskId = _disputedTask(3, 11);
+        address[] memory selected = _selectedJurors(taskId);
+        for (uint256 i; i < selected.length; ++i) {
+            vm.prank(selected[i]);
+            escrow.castVote(taskId, true);
+        }
+        assertEq(escrow.votesCast(taskId), 3);
+        // No juror has voting power yet, so the tie goes to the worker
+        assertEq(token.balanceOf(worker), AMOUNT);
+        assertEq(escrow.totalLockedEscrow(), 0);
+    }
+}
@@ -0,0 +1,134 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+import "forge-std/Test.sol";
+import "../contracts/JudgePayLite.sol";
+import "../contracts/MockUSDC.sol";
+
+contract JudgePayLiteBatchTest is Test {
+    JudgePayLite public judgePay;
+    MockUSDC public token;
+    address public requester = address(1);
+    address public workerA = address(2);
+    address public workerB = address(3);
+    uint96 public constant AMOUNT = 10 * 10 ** 6; // 10 USDC
+
+    function setUp() public {
+        token = new MockUSDC();
+        judgePay = new JudgePayLite(address(token));
+        token.mint(requester, 1_000 * 10 ** 6);
+        vm.prank(requester);
+        token.approve(address(judgePay), type(uint256).max);
+    }
+
+    function _create(uint256 n) internal returns (uint256[] memory ids) {
+        uint96[] memory amounts = new uint96[](n);
+        uint40[] memory hoursList = new uint40[](n);
+        for (uint256 i; i < n; ++i) {
+            amounts[i] = AMOUNT;
+            hoursList[i] = 24;
+        }
+        vm.prank(requester);
+        (uint256 firstId, uint256 created) = judgePay.createTasks(amounts, hoursList);
+        ids = new uint256[](created);
+        for (uint256 i; i < created; ++i) {
+            ids[i] = firstId + i;
+        }
+    }
+
+    function _submit(uint256 id, address worker) internal {
+        vm.prank(worker);
+        judgePay.submitWork(id);
+    }
+
+    function test_CreateTasksPullsTotalOnce() public {
+        uint96[] memory amounts = new uint96[](3);
+        uint40[] memory hoursList = new uint40[](3);
+        amounts[0] = AMOUNT;
+        amounts[1] = 0; // skipped
+        amounts[2] = 2 * AMOUNT;
+        hoursList[0] = 1;
+        hoursList[2] = 48;
+
+        vm.prank(requester);
+        (uint256 firstId, uint256 created) = judgePay.createTasks(amounts, hoursList);
+
+        assertEq(firstId, 0);
+        assertEq(created, 2);
+        assertEq(judgePay.taskCount(), 2);
+        assertEq(token.balanceOf(address(judgePay)), 3 * AMOUNT);
+
+        (address taskRequester,, uint96 amount, uint40 deadline,,) = judgePay.tasks(1);
+        assertEq(taskRequester, requester);
+        assertEq(amount, 2 * AMOUNT);
+        assertEq(deadline, block.timestamp + 48 hours);
+    }
+
+    function test_CreateTasksLengthMismatchReverts() public {
+        uint96[] memory amounts = new uint96[](2);
+        uint40[] memory hoursList = new uint40[](1);
+        vm.prank(requester);
+        vm.expectRevert("Length mismatch");
+        judgePay.createTasks(amounts, hoursList);
+    }
+
+    function test_ApproveManyPaysWorkersAndSkipsOthers() public {
+        uint256[] memory ids = _create(4);
+        _submit(ids[0], workerA);
+        _submit(ids[1], workerA);
+        _submit(ids[2], workerB);
+        // ids[3] stays Open and must be skipped
+
+        vm.prank(requester);
+        uint256 approved = judgePay.approveMany(ids);
+
+        assertEq(approved, 3);
+        assertEq(token.balanceOf(workerA), 2 * AMOUNT);
+        assertEq(token.balanceOf(workerB), AMOUNT);
+        assertEq(token.balanceOf(address(judgePay)), AMOUNT);
+
+        // A second pass finds nothing left to approve
+        vm.prank(requester);
+        assertEq(judgePay.approveMany(ids), 0);
+    }
+
+    function test_ApproveManyIgnoresOtherRequesters() public {
+        uint256[] memory ids = _create(1);
+        _submit(ids[0], workerA);
+
+        vm.prank(workerB);
+        assertEq(judgePay.approveMany(ids), 0);
+        assertEq(token.balanceOf(workerA), 0);
+    }
+
+    function test_RejectManyRespectsReviewPeriod() public {
+        uint256[] memory ids = _create(2);
+        _submit(ids[0], workerA);
+        vm.warp(block.timestamp + 12 hours);
+        _submit(ids[1], workerB);
+        vm.warp(block.timestamp + 13 hours); // only ids[0] is past its 24h review
+
+        uint256 before = token.balanceOf(requester);
+        vm.prank(requester);
+        uint256 rejected = judgePay.rejectMany(ids);
+
+        assertEq(rejected, 1);
+        assertEq(token.balanceOf(requester), before + AMOUNT);
+        (,,,,, JudgePayLite.Status status) = judgePay.tasks(ids[1]);
+        assertEq(uint8(status), uint8(JudgePayLite.Status.Submitted));
+    }
+
+    function test_ClaimTimeoutsRefundsExpiredOnly() public {
+        uint256[] memory ids = _create(3);
+        _submit(ids[1], workerA);
+        vm.warp(block.timestamp + 25 hours);
+
+        uint256 before = token.balanceOf(requester);
+        vm.prank(requester);
+        uint256 claimed = judgePay.claimTimeouts(ids);
+
+        assertEq(claimed, 2);
+        assertEq(token.balanceOf(requester), before + 2 * AMOUNT);
+        assertEq(token.balanceOf(address(judgePay)), AMOUNT);
+    }
+}
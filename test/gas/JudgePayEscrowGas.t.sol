@@ -0,0 +1,120 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+import "../utils/EscrowFixture.sol";
+
+/// @notice Gas baselines for the JudgePayEscrow dispute pipeline across jury and pool sizes.
+///         Results go to snapshots/JudgePayEscrow.json; refresh with `forge snapshot`.
+contract JudgePayEscrowGasTest is EscrowFixture {
+    string internal constant GROUP = "JudgePayEscrow";
+
+    address[3] internal oracles = [address(0x0A1), address(0x0A2), address(0x0A3)];
+
+    function setUp() public {
+        _deployEscrow();
+        bytes32 oracleRole = escrow.ORACLE_ROLE();
+        vm.startPrank(admin);
+        for (uint256 i; i < oracles.length; ++i) {
+            escrow.grantRole(oracleRole, oracles[i]);
+        }
+        vm.stopPrank();
+    }
+
+    function _name(string memory op, string memory dimension, uint256 value) internal pure returns (string memory) {
+        return string.concat(op, "_", dimension, vm.toString(value));
+    }
+
+    function _name(string memory op, uint256 poolSize, uint256 jury) internal pure returns (string memory) {
+        return string.concat(op, "_pool", vm.toString(poolSize), "_jury", vm.toString(jury));
+    }
+
+    /// @dev Task submitted with `requiredOracles` oracles, waiting in L2 review
+    function _oracleTask() internal returns (uint256 taskId) {
+        vm.prank(requester);
+        taskId = escrow.createTask(bytes32(0), AMOUNT, 24, uint8(oracles.length), 3);
+        vm.startPrank(worker);
+        escrow.claimTask(taskId);
+        escrow.submitWork(taskId, bytes32(0), "ipfs://output");
+        vm.stopPrank();
+    }
+
+    function test_Gas_TaskLifecycle() public {
+        vm.prank(requester);
+        uint256 taskId = escrow.createTask(bytes32(0), AMOUNT, 24, 0, 3);
+        vm.snapshotGasLastCall(GROUP, "createTask");
+
+        vm.prank(worker);
+        escrow.claimTask(taskId);
+        vm.snapshotGasLastCall(GROUP, "claimTask");
+
+        vm.prank(worker);
+        escrow.submitWork(taskId, bytes32(0), "ipfs://output");
+        vm.snapshotGasLastCall(GROUP, "submitWork");
+
+        vm.prank(requester);
+        escrow.acceptWork(taskId);
+        vm.snapshotGasLastCall(GROUP, "acceptWork");
+    }
+
+    function test_Gas_OracleScoring() public {
+        // Non-final score, then the final score for each outcome of _processConfidenceMatrix
+        uint256[3] memory scores = [uint256(95), 20, 60];
+        string[3] memory outcomes = ["release", "refund", "escalate"];
+
+        for (uint256 k; k < scores.length; ++k) {
+            uint256 taskId = _oracleTask();
+            for (uint256 i; i < oracles.length; ++i) {
+                vm.prank(oracles[i]);
+                escrow.submitOracleScore(taskId, scores[k], keccak256("prompt"), "model-v1");
+                if (k == 0 && i == 0) vm.snapshotGasLastCall(GROUP, "submitOracleScore");
+            }
+            vm.snapshotGasLastCall(GROUP, string.concat("submitOracleScore_final_", outcomes[k]));
+        }
+    }
+
+    function test_Gas_Dispute() public {
+        _openDispute(3);
+        vm.snapshotGasLastCall(GROUP, "dispute");
+    }
+
+    function test_Gas_FulfillRandomWords() public {
+        uint256[3] memory pools = [uint256(50), 500, 2000];
+        uint256[3] memory juries = [uint256(3), 15, 50];
+        for (uint256 p; p < pools.length; ++p) {
+            _registerJurors(pools[p] - pool.length);
+            for (uint256 j; j < juries.length; ++j) {
+                _openDispute(juries[j]);
+                // Measured through the mock coordinator, which adds a small constant
+                vrf.fulfill(vrf.nextRequestId() - 1, uint256(keccak256(abi.encode(p, j))));
+                vm.snapshotGasLastCall(GROUP, _name("fulfillRandomWords", pools[p], juries[j]));
+            }
+        }
+    }
+
+    function test_Gas_CastVote() public {
+        uint256[4] memory juries = [uint256(3), 15, 50, 150];
+        _registerJurors(300);
+        for (uint256 j; j < juries.length; ++j) {
+            uint256 taskId = _disputedTask(juries[j], j);
+            address[] memory selected = _selectedJurors(taskId);
+
+            vm.prank(selected[0]);
+            escrow.castVote(taskId, true);
+            vm.snapshotGasLastCall(GROUP, _name("castVote", "jury", juries[j]));
+
+            for (uint256 i = 1; i + 1 < selected.length; ++i) {
+                vm.prank(selected[i]);
+                escrow.castVote(taskId, i % 3 != 0);
+            }
+            // The final vote pays out and runs the inline share of _resolveJury
+            vm.prank(selected[selected.length - 1]);
+            escrow.castVote(taskId, false);
+            vm.snapshotGasLastCall(GROUP, _name("castVote_final", "jury", juries[j]));
+
+            if (escrow.resolutionStepsLeft(taskId) > 0) {
+                escrow.processResolution(taskId, 500);
+                vm.snapshotGasLastCall(GROUP, _name("processResolution_500steps", "jury", juries[j]));
+            }
+        }
+    }
+}
@@ -0,0 +1,126 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+import "forge-std/Test.sol";
+import "../../contracts/JudgePayLite.sol";
+import "../../contracts/MockUSDC.sol";
+
+/// @notice Gas baselines for the JudgePayLite lifecycle. Each measured call is recorded with
+///         snapshotGasLastCall under snapshots/JudgePayLite.json; refresh with `forge snapshot`.
+contract JudgePayLiteGasTest is Test {
+    JudgePayLite public judgePay;
+    MockUSDC public token;
+    address public requester = address(1);
+    address public worker = address(2);
+    uint96 public constant AMOUNT = 10 * 10 ** 6; // 10 USDC
+    string internal constant GROUP = "JudgePayLite";
+
+    uint256 internal openId;
+    uint256 internal submittedId;
+
+    function setUp() public {
+        token = new MockUSDC();
+        judgePay = new JudgePayLite(address(token));
+        token.mint(requester, 1_000_000 * 10 ** 6);
+        vm.prank(requester);
+        token.approve(address(judgePay), type(uint256).max);
+
+        // Steady state: the task counter and both balances are already non-zero
+        openId = _create();
+        submittedId = _create();
+        vm.prank(worker);
+        judgePay.submitWork(submittedId);
+    }
+
+    function _create() internal returns (uint256 id) {
+        vm.prank(requester);
+        id = judgePay.createTask(AMOUNT, 24);
+    }
+
+    function _createBatch(uint256 n) internal returns (uint256[] memory ids) {
+        uint96[] memory amounts = new uint96[](n);
+        uint40[] memory hoursList = new uint40[](n);
+        for (uint256 i; i < n; ++i) {
+            amounts[i] = AMOUNT;
+            hoursList[i] = 24;
+        }
+        vm.prank(requester);
+        (uint256 firstId,) = judgePay.createTasks(amounts, hoursList);
+        ids = new uint256[](n);
+        for (uint256 i; i < n; ++i) {
+            ids[i] = firstId + i;
+        }
+    }
+
+    function _submitAll(uint256[] memory ids) internal {
+        for (uint256 i; i < ids.length; ++i) {
+            vm.prank(worker);
+            judgePay.submitWork(ids[i]);
+        }
+    }
+
+    function test_Gas_CreateTask() public {
+        vm.prank(requester);
+        judgePay.createTask(AMOUNT, 24);
+        vm.snapshotGasLastCall(GROUP, "createTask");
+    }
+
+    function test_Gas_SubmitWork() public {
+        vm.prank(worker);
+        judgePay.submitWork(openId);
+        vm.snapshotGasLastCall(GROUP, "submitWork");
+    }
+
+    function test_Gas_Approve() public {
+        vm.prank(requester);
+        judgePay.approve(submittedId);
+        vm.snapshotGasLastCall(GROUP, "approve");
+    }
+
+    function test_Gas_Reject() public {
+        vm.warp(block.timestamp + 24 hours + 1);
+        vm.prank(requester);
+        judgePay.reject(submittedId);
+        vm.snapshotGasLastCall(GROUP, "reject");
+    }
+
+    function test_Gas_ClaimTimeout() public {
+        vm.warp(block.timestamp + 24 hours + 1);
+        vm.prank(requester);
+        judgePay.claimTimeout(openId);
+        vm.snapshotGasLastCall(GROUP, "claimTimeout");
+    }
+
+    function test_Gas_ClaimTimeoutAfterSubmit() public {
+        vm.warp(block.timestamp + 72 hours + 1);
+        judgePay.claimTimeoutAfterSubmit(submittedId);
+        vm.snapshotGasLastCall(GROUP, "claimTimeoutAfterSubmit");
+    }
+
+    function test_Gas_Batches() public {
+        uint256[3] memory sizes = [uint256(1), 10, 100];
+        for (uint256 s; s < sizes.length; ++s) {
+            uint256 n = sizes[s];
+            string memory suffix = string.concat("_", vm.toString(n));
+
+            uint256[] memory approved = _createBatch(n);
+            vm.snapshotGasLastCall(GROUP, string.concat("createTasks", suffix));
+            _submitAll(approved);
+            vm.prank(requester);
+            judgePay.approveMany(approved);
+            vm.snapshotGasLastCall(GROUP, string.concat("approveMany", suffix));
+
+            uint256[] memory rejected = _createBatch(n);
+            _submitAll(rejected);
+            uint256[] memory expired = _createBatch(n);
+            vm.warp(block.timestamp + 24 hours + 1);
+
+            vm.prank(requester);
+            judgePay.rejectMany(rejected);
+            vm.snapshotGasLastCall(GROUP, string.concat("rejectMany", suffix));
+            vm.prank(requester);
+            judgePay.claimTimeouts(expired);
+            vm.snapshotGasLastCall(GROUP, string.concat("claimTimeouts", suffix));
+        }
+    }
+}
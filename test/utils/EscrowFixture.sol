@@ -0,0 +1,73 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+import "forge-std/Test.sol";
+import "../../contracts/JudgePayEscrow.sol";
+import "../../contracts/MockUSDC.sol";
+import "../../contracts/MockVRFCoordinator.sol";
+
+/// @notice Shared set-up for JudgePayEscrow tests: token, VRF mock, juror pool and disputed tasks
+abstract contract EscrowFixture is Test {
+    JudgePayEscrow public escrow;
+    MockUSDC public token;
+    MockVRFCoordinator public vrf;
+
+    address public admin = address(0xA11CE);
+    address public requester = address(0xBEEF);
+    address public worker = address(0xCAFE);
+    uint256 public constant AMOUNT = 1_000 * 10 ** 6; // 1,000 USDC
+
+    address[] public pool;
+
+    function _deployEscrow() internal {
+        token = new MockUSDC();
+        vrf = new MockVRFCoordinator();
+        escrow = new JudgePayEscrow(address(token), address(vrf), 1, bytes32(0), admin);
+
+        token.mint(requester, 1_000_000 * 10 ** 6);
+        vm.prank(requester);
+        token.approve(address(escrow), type(uint256).max);
+    }
+
+    /// @dev Registers `n` more jurors, lets them mature past the waiting period and activates them
+    function _registerJurors(uint256 n) internal {
+        for (uint256 i; i < n; ++i) {
+            address juror = address(uint160(0x10000 + pool.length));
+            vm.prank(juror);
+            escrow.registerAsJuror();
+            pool.push(juror);
+        }
+        vm.warp(block.timestamp + escrow.JUROR_MATURITY());
+        escrow.promoteMatureJurors(n);
+    }
+
+    /// @dev Creates a task, takes it through submit and dispute, and fulfils the VRF request
+    function _disputedTask(uint256 jurySize, uint256 seed) internal returns (uint256 taskId) {
+        taskId = _openDispute(jurySize);
+        vrf.fulfill(vrf.nextRequestId() - 1, seed);
+    }
+
+    /// @dev Like _disputedTask, but leaves the VRF request pending
+    function _openDispute(uint256 jurySize) internal returns (uint256 taskId) {
+        vm.prank(requester);
+        taskId = escrow.createTask(bytes32(0), AMOUNT, 24, 0, jurySize);
+        vm.startPrank(worker);
+        escrow.claimTask(taskId);
+        escrow.submitWork(taskId, bytes32(0), "");
+        vm.stopPrank();
+        vm.prank(requester);
+        escrow.dispute(taskId);
+    }
+
+    function _selectedJurors(uint256 taskId) internal view returns (address[] memory selected) {
+        uint256 count;
+        for (uint256 i; i < pool.length; ++i) {
+            if (escrow.isSelectedJuror(taskId, pool[i])) ++count;
+        }
+        selected = new address[](count);
+        count = 0;
+        for (uint256 i; i < pool.length; ++i) {
+            if (escrow.isSelectedJuror(taskId, pool[i])) selected[count++] = pool[i];
+        }
+    }
+}